@@ -2,95 +2,81 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
 
+from homeassistant.components import bluetooth
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
     DOMAIN,
-    SERVICE_SET_HEAD_POSITION,
-    SERVICE_SET_FEET_POSITION,
-    SERVICE_CALIBRATE,
-    SERVICE_DIAGNOSTICS,
-    ATTR_POSITION,
-    ATTR_CALIBRATION_MODE,
+    CONF_MAC_ADDRESS,
+    DATA_COORDINATORS,
+    DATA_KEEPALIVE,
+    DATA_CONNECTIONS,
 )
+from .coordinator import BedManagerCoordinator
 from .device import BedManagerDevice
-from .services import (
-    async_set_head_position,
-    async_set_feet_position,
-    async_calibrate,
-    async_diagnostics,
-)
+from .services import async_setup_services, async_unload_services
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [
     Platform.COVER,
-    Platform.SWITCH,
     Platform.SELECT,
     Platform.BUTTON,
+    Platform.SENSOR,
 ]
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Bed Manager from a config entry."""
     device = BedManagerDevice(hass, entry)
-    await device.async_setup()
-    
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = device
+    await device.async_load()
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-
-    # Register services
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_SET_HEAD_POSITION,
-        async_set_head_position,
-        schema={
-            "entity_id": str,
-            ATTR_POSITION: float,
-        },
+    # An advertisement from a bed that dropped out triggers an immediate reconnect.
+    entry.async_on_unload(
+        bluetooth.async_register_callback(
+            hass,
+            # Looked up per call so profiling can swap the method.
+            lambda service_info, change: device.async_handle_advertisement(
+                service_info, change
+            ),
+            bluetooth.BluetoothCallbackMatcher(
+                address=entry.data[CONF_MAC_ADDRESS], connectable=True
+            ),
+            bluetooth.BluetoothScanningMode.PASSIVE,
+        )
     )
 
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_SET_FEET_POSITION,
-        async_set_feet_position,
-        schema={
-            "entity_id": str,
-            ATTR_POSITION: float,
-        },
+    # Connect in the background; entities stay unavailable until the link is
+    # up and the first command connects lazily if this has not finished yet.
+    entry.async_create_background_task(
+        hass, device.async_setup(), f"{DOMAIN} connect {entry.title}"
     )
 
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_CALIBRATE,
-        async_calibrate,
-        schema={
-            "entity_id": str,
-            ATTR_CALIBRATION_MODE: int,
-        },
-    )
+    # One coordinator per bed; every entity of the bed shares its subscription.
+    coordinator = BedManagerCoordinator(hass, device)
+    await coordinator.async_config_entry_first_refresh()
+    coordinator.async_start()
 
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_DIAGNOSTICS,
-        async_diagnostics,
-        schema={
-            "entity_id": str,
-        },
-    )
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = device
+    hass.data.setdefault(DATA_COORDINATORS, {})[entry.entry_id] = coordinator
+    async_setup_services(hass)
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        hass.data[DATA_COORDINATORS].pop(entry.entry_id).async_stop()
         device = hass.data[DOMAIN].pop(entry.entry_id)
         await device.async_unload()
+        if not hass.data[DOMAIN]:
+            hass.data.pop(DATA_COORDINATORS)
+            hass.data.pop(DATA_KEEPALIVE, None)
+            hass.data.pop(DATA_CONNECTIONS, None)
+            async_unload_services(hass)
 
-    return unload_ok 
\ No newline at end of file
+    return unload_ok
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""Button platform for the Bed Manager integration."""
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from homeassistant.components.button import ButtonEntity, ButtonEntityDescription
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DATA_COORDINATORS
+from .coordinator import BedManagerCoordinator
+from .device import BedManagerDevice
+from .entity import BedManagerEntity
+
+
+@dataclass(frozen=True)
+class BedButtonEntityDescription(ButtonEntityDescription):
+    """Describes a bed button."""
+
+    press_fn: Callable[[BedManagerDevice], Awaitable[None]] | None = None
+
+
+BUTTONS: tuple[BedButtonEntityDescription, ...] = (
+    BedButtonEntityDescription(
+        key="stop",
+        name="Stop",
+        icon="mdi:stop",
+        press_fn=lambda device: device.async_stop(),
+    ),
+    BedButtonEntityDescription(
+        key="calibrate_head",
+        name="Calibrate head",
+        icon="mdi:tune-vertical",
+        entity_category=EntityCategory.CONFIG,
+        press_fn=lambda device: device.async_calibrate(1),
+    ),
+    BedButtonEntityDescription(
+        key="calibrate_feet",
+        name="Calibrate feet",
+        icon="mdi:tune-vertical",
+        entity_category=EntityCategory.CONFIG,
+        press_fn=lambda device: device.async_calibrate(2),
+    ),
+    BedButtonEntityDescription(
+        key="calibration_mark",
+        name="Mark calibration end",
+        icon="mdi:map-marker-check",
+        entity_category=EntityCategory.CONFIG,
+        press_fn=lambda device: device.async_calibrate(0),
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up the stop and calibration buttons of a bed."""
+    coordinator: BedManagerCoordinator = hass.data[DATA_COORDINATORS][entry.entry_id]
+    async_add_entities(BedButton(coordinator, description) for description in BUTTONS)
+
+
+class BedButton(BedManagerEntity, ButtonEntity):
+    """A one-shot bed action."""
+
+    entity_description: BedButtonEntityDescription
+    _state_fields = frozenset()
+
+    def __init__(
+        self, coordinator: BedManagerCoordinator, description: BedButtonEntityDescription
+    ) -> None:
+        """Initialize the button."""
+        super().__init__(coordinator, description.key)
+        self.entity_description = description
+
+    async def async_press(self) -> None:
+        """Run the action."""
+        await self.entity_description.press_fn(self.device)
@@ -0,0 +1,104 @@
+"""Travel time calibration for the Bed Manager integration."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    AXIS_FEET,
+    AXIS_HEAD,
+    CALIBRATION_EWMA_ALPHA,
+    CALIBRATION_MIN_DISTANCE,
+    CALIBRATION_SAVE_DELAY,
+    CALIBRATION_STORAGE_VERSION,
+    DEFAULT_FEET_DURATION,
+    DEFAULT_HEAD_DURATION,
+    DOMAIN,
+)
+from .history import MovementRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _key(axis: str, moving_up: bool) -> str:
+    return f"{axis}_{'up' if moving_up else 'down'}"
+
+
+class TravelCalibration:
+    """Learned full-travel times for each axis and direction of one bed.
+
+    The first measurement replaces the 30 s default outright; later ones are
+    blended in with an exponentially weighted moving average so a single bad
+    sample cannot throw the estimate off. Results are persisted per entry.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the calibration with the default travel times."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, CALIBRATION_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.calibration"
+        )
+        self._travel: dict[str, float] = {}
+        self._samples: dict[str, int] = {}
+        for axis, duration in (
+            (AXIS_HEAD, DEFAULT_HEAD_DURATION),
+            (AXIS_FEET, DEFAULT_FEET_DURATION),
+        ):
+            for moving_up in (True, False):
+                self._travel[_key(axis, moving_up)] = duration / 1000
+                self._samples[_key(axis, moving_up)] = 0
+
+    async def async_load(self) -> None:
+        """Load persisted travel times."""
+        if (data := await self._store.async_load()) is None:
+            return
+        for key, travel in data.get("travel", {}).items():
+            if key in self._travel:
+                self._travel[key] = float(travel)
+        for key, samples in data.get("samples", {}).items():
+            if key in self._samples:
+                self._samples[key] = int(samples)
+
+    def travel_time(self, axis: str, moving_up: bool) -> float:
+        """Return the full-travel time of an axis in one direction, in seconds."""
+        return self._travel[_key(axis, moving_up)]
+
+    def record(self, axis: str, moving_up: bool, seconds: float) -> float:
+        """Blend in a measured full-travel time and return the new estimate."""
+        key = _key(axis, moving_up)
+        if self._samples[key]:
+            self._travel[key] += CALIBRATION_EWMA_ALPHA * (seconds - self._travel[key])
+        else:
+            self._travel[key] = seconds
+        self._samples[key] += 1
+        self._store.async_delay_save(self._data_to_save, CALIBRATION_SAVE_DELAY)
+        _LOGGER.debug("Travel time %s is now %.2f s", key, self._travel[key])
+        return self._travel[key]
+
+    def observe(self, axis: str, moving_up: bool, distance: float, seconds: float) -> None:
+        """Refine from a move whose travelled distance (in %) is known.
+
+        Short moves are dominated by latency, so they are ignored.
+        """
+        if distance < CALIBRATION_MIN_DISTANCE:
+            return
+        self.record(axis, moving_up, seconds * 100 / distance)
+
+    def observe_movement(self, movement: MovementRecord) -> None:
+        """Refine from a movement in the history once the bed confirmed its end."""
+        if movement.confirmed:
+            self.observe(
+                movement.axis,
+                movement.moving_up,
+                abs(movement.end_position - movement.start_position),
+                movement.duration,
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the calibration for diagnostics."""
+        return self._data_to_save()
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"travel": dict(self._travel), "samples": dict(self._samples)}
@@ -0,0 +1,74 @@
+"""Position command coalescing for the Bed Manager integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from functools import partial
+
+
+class TargetCoalescer:
+    """Collapse a burst of position targets for one axis into a single move.
+
+    Every target submitted within the debounce window replaces the previous
+    one, so only the latest reaches the radio. All callers in the burst share
+    the outcome of the one move that is finally dispatched.
+    """
+
+    def __init__(
+        self, delay: float, dispatch: Callable[[float], Awaitable[None]]
+    ) -> None:
+        """Initialize the coalescer."""
+        self._delay = delay
+        self._dispatch = dispatch
+        self._target: float | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._waiters: list[asyncio.Future[None]] = []
+        self.coalesced = 0
+
+    async def async_submit(self, target: float) -> None:
+        """Submit a target and wait for the move that carries it out."""
+        loop = asyncio.get_running_loop()
+        if self._timer is not None:
+            self._timer.cancel()
+            self.coalesced += 1
+        self._target = target
+        self._timer = loop.call_later(self._delay, self._flush)
+        waiter: asyncio.Future[None] = loop.create_future()
+        self._waiters.append(waiter)
+        await waiter
+
+    def cancel(self) -> None:
+        """Drop the pending target without dispatching it."""
+        if self._timer is not None:
+            self._timer.cancel()
+        for waiter in self._reset():
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _reset(self) -> list[asyncio.Future[None]]:
+        waiters = self._waiters
+        self._target = None
+        self._timer = None
+        self._waiters = []
+        return waiters
+
+    def _flush(self) -> None:
+        """Dispatch the latest target once the burst has settled."""
+        target = self._target
+        waiters = self._reset()
+        task = asyncio.ensure_future(self._dispatch(target))
+        task.add_done_callback(partial(_resolve_waiters, waiters))
+
+
+def _resolve_waiters(waiters: list[asyncio.Future[None]], task: asyncio.Future) -> None:
+    """Hand the outcome of a dispatched move to everyone who asked for it."""
+    error = None if task.cancelled() else task.exception()
+    for waiter in waiters:
+        if waiter.done():
+            continue
+        if task.cancelled():
+            waiter.cancel()
+        elif error is not None:
+            waiter.set_exception(error)
+        else:
+            waiter.set_result(None)
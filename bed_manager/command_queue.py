@@ -0,0 +1,191 @@
+"""Command scheduling for the Bed Manager integration."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+_LOGGER = logging.getLogger(__name__)
+
+PRIORITY_STOP = 0
+PRIORITY_MOVE = 1
+
+
+class CommandQueueFullError(RuntimeError):
+    """Raised when a bed already has too much work queued."""
+
+
+@dataclass(order=True)
+class _QueuedCommand:
+    """A unit of work waiting for the link."""
+
+    priority: int
+    sequence: int
+    run: Callable[[], Awaitable[None]] = field(compare=False)
+    keys: frozenset[str] = field(compare=False)
+    waiters: list[asyncio.Future[None]] = field(compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+class CommandQueue:
+    """Bounded, prioritised scheduler that runs one command at a time.
+
+    Commands carry the set of keys (axes) they drive. Submitting a command
+    supersedes every queued command sharing a key, whose callers then wait on
+    the replacement instead. A stop preempts the running command and drops
+    everything that is queued.
+    """
+
+    def __init__(
+        self, maxsize: int, on_idle: Callable[[], None] | None = None
+    ) -> None:
+        """Initialize the queue; ``on_idle`` runs whenever it drains."""
+        self._maxsize = maxsize
+        self._on_idle = on_idle
+        self._heap: list[_QueuedCommand] = []
+        self._sequence = itertools.count()
+        self._pending = 0
+        self._worker: asyncio.Task | None = None
+        self._current: _QueuedCommand | None = None
+        self._current_task: asyncio.Task | None = None
+        self.superseded = 0
+        self.dropped = 0
+
+    @property
+    def depth(self) -> int:
+        """Return the number of commands waiting to run."""
+        return self._pending
+
+    @property
+    def idle(self) -> bool:
+        """Return True if nothing is running or waiting to run."""
+        return self._current is None and not self._pending
+
+    def overlapping_keys(self, keys: frozenset[str]) -> frozenset[str]:
+        """Return the keys of queued commands that share any of these keys."""
+        return frozenset().union(
+            *(
+                command.keys
+                for command in self._heap
+                if not command.cancelled and command.keys & keys
+            )
+        )
+
+    async def async_submit(
+        self,
+        run: Callable[[], Awaitable[None]],
+        *,
+        priority: int = PRIORITY_MOVE,
+        keys: frozenset[str] = frozenset(),
+    ) -> None:
+        """Queue a command and wait until it has run."""
+        superseded = [
+            command
+            for command in self._heap
+            if keys and not command.cancelled and command.keys & keys
+        ]
+        if self._pending - len(superseded) >= self._maxsize:
+            self.dropped += 1
+            raise CommandQueueFullError("Command queue is full")
+
+        waiters: list[asyncio.Future[None]] = []
+        for command in superseded:
+            self._cancel(command)
+            waiters.extend(command.waiters)
+            self.superseded += 1
+        if len(self._heap) > 2 * self._maxsize:
+            self._heap = [command for command in self._heap if not command.cancelled]
+            heapq.heapify(self._heap)
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        heapq.heappush(
+            self._heap,
+            _QueuedCommand(priority, next(self._sequence), run, keys, waiters),
+        )
+        self._pending += 1
+        self._ensure_worker()
+        await waiter
+
+    async def async_preempt(self, run: Callable[[], Awaitable[None]]) -> None:
+        """Drop all queued work, abort the running command and run this next."""
+        for command in self._heap:
+            if not command.cancelled:
+                self._cancel(command)
+                self.dropped += 1
+                _resolve(command.waiters, None)
+        if self._current_task is not None and self._current is not None:
+            if self._current.priority != PRIORITY_STOP:
+                self._current_task.cancel()
+        await self.async_submit(run, priority=PRIORITY_STOP)
+
+    async def async_shutdown(self) -> None:
+        """Cancel everything and wait for it to end; used on device unload.
+
+        The running command is awaited after it is cancelled, so whatever it
+        does on the way out has finished before the caller goes on.
+        """
+        for command in self._heap:
+            if not command.cancelled:
+                self._cancel(command)
+                _cancel_waiters(command.waiters)
+        if self._current is not None:
+            _cancel_waiters(self._current.waiters)
+        tasks = {task for task in (self._worker, self._current_task) if task is not None}
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+
+    def _cancel(self, command: _QueuedCommand) -> None:
+        command.cancelled = True
+        self._pending -= 1
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._async_work())
+
+    async def _async_work(self) -> None:
+        """Run queued commands in priority order."""
+        while self._heap:
+            command = heapq.heappop(self._heap)
+            if command.cancelled:
+                continue
+            self._pending -= 1
+            self._current = command
+            self._current_task = task = asyncio.create_task(command.run())
+            try:
+                await asyncio.wait({task})
+            finally:
+                self._current = None
+                self._current_task = None
+
+            if task.cancelled():
+                _LOGGER.debug("Command preempted")
+                _resolve(command.waiters, None)
+            else:
+                _resolve(command.waiters, task.exception())
+
+        if self._on_idle is not None:
+            self._on_idle()
+
+
+def _resolve(
+    waiters: list[asyncio.Future[None]], error: BaseException | None
+) -> None:
+    for waiter in waiters:
+        if waiter.done():
+            continue
+        if error is not None:
+            waiter.set_exception(error)
+        else:
+            waiter.set_result(None)
+
+
+def _cancel_waiters(waiters: list[asyncio.Future[None]]) -> None:
+    for waiter in waiters:
+        if not waiter.done():
+            waiter.cancel()
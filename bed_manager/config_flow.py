@@ -20,10 +20,21 @@ from .const import (
     CONF_BED_TYPE,
     CONF_MAC_ADDRESS,
     BED_TYPES,
+    CONF_ESPHOME_NODE,
+    CONF_MQTT_PREFIX,
+    CONF_TRANSPORT,
+    DEFAULT_MQTT_PREFIX,
+    PROBE_TIMEOUT,
+    TRANSPORT_BLUETOOTH,
+    TRANSPORT_ESPHOME,
+    TRANSPORTS,
 )
+from .discovery import async_confirm_candidates, rank_candidates
 
 _LOGGER = logging.getLogger(__name__)
 
+MANUAL_ENTRY = "manual"
+
 class BedManagerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Bed Manager."""
 
@@ -74,20 +85,86 @@ class BedManagerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        """Handle the initial step."""
+        """Let the user pick one of the beds in range, strongest signal first."""
         if user_input is not None:
+            address = user_input[CONF_MAC_ADDRESS]
+            if address == MANUAL_ENTRY:
+                return await self.async_step_manual()
+            discovery_info = self._discovered_devices[address]
+            await self.async_set_unique_id(address, raise_on_progress=False)
+            self._abort_if_unique_id_configured()
+            return self.async_create_entry(
+                title=discovery_info.name,
+                data={
+                    CONF_MAC_ADDRESS: address,
+                    CONF_NAME: discovery_info.name,
+                    CONF_BED_TYPE: user_input[CONF_BED_TYPE],
+                },
+            )
+
+        if not self._discovered_devices:
+            candidates = rank_candidates(
+                async_discovered_service_info(self.hass, connectable=True),
+                self._async_current_ids(),
+            )
+            self._discovered_devices = await async_confirm_candidates(
+                self.hass, candidates, PROBE_TIMEOUT
+            )
+        if not self._discovered_devices:
+            return await self.async_step_manual()
+
+        choices = {
+            address: f"{info.name} ({address}, {info.rssi} dBm)"
+            for address, info in self._discovered_devices.items()
+        }
+        choices[MANUAL_ENTRY] = "Enter the address manually"
+        return self.async_show_form(
+            step_id="user",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_MAC_ADDRESS): vol.In(choices),
+                    vol.Required(CONF_BED_TYPE): vol.In(BED_TYPES),
+                }
+            ),
+        )
+
+    async def async_step_manual(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle a bed entered by address.
+
+        Beds out of reach of a Bluetooth proxy can be driven through an
+        ESPHome node or an MQTT bridge instead.
+        """
+        errors: dict[str, str] = {}
+        if user_input is not None and (
+            user_input.get(CONF_TRANSPORT) == TRANSPORT_ESPHOME
+            and not user_input.get(CONF_ESPHOME_NODE)
+        ):
+            errors[CONF_ESPHOME_NODE] = "esphome_node_required"
+        elif user_input is not None:
+            await self.async_set_unique_id(
+                user_input[CONF_MAC_ADDRESS].upper(), raise_on_progress=False
+            )
+            self._abort_if_unique_id_configured()
             return self.async_create_entry(
                 title=user_input[CONF_NAME],
                 data=user_input,
             )
 
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
             data_schema=vol.Schema(
                 {
                     vol.Required(CONF_NAME): str,
                     vol.Required(CONF_MAC_ADDRESS): str,
                     vol.Required(CONF_BED_TYPE): vol.In(BED_TYPES),
+                    vol.Optional(CONF_TRANSPORT, default=TRANSPORT_BLUETOOTH): vol.In(
+                        TRANSPORTS
+                    ),
+                    vol.Optional(CONF_ESPHOME_NODE): str,
+                    vol.Optional(CONF_MQTT_PREFIX, default=DEFAULT_MQTT_PREFIX): str,
                 }
             ),
-        ) 
\ No newline at end of file
+            errors=errors,
+        )
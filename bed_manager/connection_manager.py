@@ -0,0 +1,128 @@
+"""Bluetooth connection slot sharing for the Bed Manager integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict, defaultdict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import CONNECTION_SLOTS, DATA_CONNECTIONS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class SlotHolder:
+    """A bed that can hold a connection slot."""
+
+    key: str
+    is_idle: Callable[[], bool]
+    async_evict: Callable[[], Awaitable[None]]
+
+
+class ConnectionSlotManager:
+    """Share the connection slots of each adapter or proxy between all beds.
+
+    A bluetooth proxy only keeps a few connections open at once. Beds queue
+    for a slot on their adapter in arrival order. When every slot is taken,
+    the least recently used bed that is not moving is disconnected so that
+    the bed being commanded gets its slot straight away; if all holders are
+    busy the request waits until one of them goes idle or disconnects.
+    """
+
+    def __init__(self, hass: HomeAssistant, slots: int) -> None:
+        """Initialize the manager."""
+        self.hass = hass
+        self._slots = slots
+        # source -> holders, least recently used first
+        self._holders: defaultdict[str, OrderedDict[str, SlotHolder]] = defaultdict(OrderedDict)
+        self._waiters: defaultdict[
+            str, deque[tuple[SlotHolder, asyncio.Future[None]]]
+        ] = defaultdict(deque)
+        self._source_of: dict[str, str] = {}
+        self._evicting: set[str] = set()
+        self.evictions = 0
+
+    def in_use(self, source: str) -> int:
+        """Return the number of slots held on an adapter or proxy."""
+        return len(self._holders[source])
+
+    async def async_acquire(self, source: str, holder: SlotHolder) -> None:
+        """Wait for a slot on an adapter or proxy."""
+        holders = self._holders[source]
+        if holder.key in holders:
+            holders.move_to_end(holder.key)
+            return
+        # The bed is now reached through another adapter or proxy.
+        self.release(holder.key)
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters[source].append((holder, waiter))
+        self._grant(source)
+        if not waiter.done():
+            _LOGGER.debug("All %d slots on %s in use, %s waits", self._slots, source, holder.key)
+            await self._async_evict_idle(source)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release(holder.key)
+            raise
+
+    @callback
+    def touch(self, key: str) -> None:
+        """Mark a bed as just used."""
+        if (source := self._source_of.get(key)) is not None:
+            self._holders[source].move_to_end(key)
+
+    @callback
+    def release(self, key: str) -> None:
+        """Give up the slot held by a bed, if any."""
+        if (source := self._source_of.pop(key, None)) is None:
+            return
+        del self._holders[source][key]
+        self._grant(source)
+
+    @callback
+    def async_idle(self, key: str) -> None:
+        """Hand the slot of a bed that went idle to a bed waiting for it."""
+        if (source := self._source_of.get(key)) is not None and self._waiters[source]:
+            self.hass.async_create_task(self._async_evict_idle(source))
+
+    def _grant(self, source: str) -> None:
+        """Give free slots to waiting beds in arrival order."""
+        holders = self._holders[source]
+        waiters = self._waiters[source]
+        while waiters and len(holders) < self._slots:
+            holder, waiter = waiters.popleft()
+            if waiter.done():
+                continue
+            holders[holder.key] = holder
+            self._source_of[holder.key] = source
+            waiter.set_result(None)
+
+    async def _async_evict_idle(self, source: str) -> None:
+        """Disconnect the least recently used idle bed on an adapter or proxy."""
+        for holder in list(self._holders[source].values()):
+            if holder.key in self._evicting or not holder.is_idle():
+                continue
+            _LOGGER.debug("Disconnecting idle bed %s to free a slot on %s", holder.key, source)
+            self._evicting.add(holder.key)
+            self.evictions += 1
+            try:
+                await holder.async_evict()
+            finally:
+                self._evicting.discard(holder.key)
+                self.release(holder.key)
+            return
+
+
+@callback
+def async_get_connection_manager(hass: HomeAssistant) -> ConnectionSlotManager:
+    """Return the connection slot manager shared by all beds."""
+    if (manager := hass.data.get(DATA_CONNECTIONS)) is None:
+        manager = hass.data[DATA_CONNECTIONS] = ConnectionSlotManager(hass, CONNECTION_SLOTS)
+    return manager
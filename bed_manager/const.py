@@ -2,6 +2,11 @@
 from typing import Final
 
 DOMAIN: Final = "bed_manager"
+DATA_ENTITY_INDEX: Final = f"{DOMAIN}_entity_index"
+DATA_COORDINATORS: Final = f"{DOMAIN}_coordinators"
+DATA_KEEPALIVE: Final = f"{DOMAIN}_keepalive"
+DATA_CONNECTIONS: Final = f"{DOMAIN}_connections"
+DATA_GROUPS: Final = f"{DOMAIN}_groups"
 
 # Configuration
 CONF_BED_TYPE: Final = "bed_type"
@@ -10,6 +15,18 @@ CONF_NAME: Final = "name"
 CONF_DEVICE_NAME: Final = "device_name"
 CONF_TARGET_MAC: Final = "target_mac"
 CONF_STORED_PIN: Final = "stored_pin"
+CONF_TRANSPORT: Final = "transport"
+CONF_ESPHOME_NODE: Final = "esphome_node"
+CONF_MQTT_PREFIX: Final = "mqtt_prefix"
+
+# Transports
+TRANSPORT_BLUETOOTH: Final = "bluetooth"
+TRANSPORT_ESPHOME: Final = "esphome"
+TRANSPORT_MQTT: Final = "mqtt"
+TRANSPORTS: Final = [TRANSPORT_BLUETOOTH, TRANSPORT_ESPHOME, TRANSPORT_MQTT]
+ESPHOME_WRITE_SERVICE: Final = "bed_manager_write"  # API service the node exposes
+ESPHOME_NOTIFICATION_EVENT: Final = "esphome.bed_manager_notification"
+DEFAULT_MQTT_PREFIX: Final = "bed_manager"
 
 # Bed Types
 BED_TYPES: Final = ["octo_bed"]
@@ -17,8 +34,17 @@ BED_TYPES: Final = ["octo_bed"]
 # Services
 SERVICE_SET_HEAD_POSITION: Final = "set_bed_head_position"
 SERVICE_SET_FEET_POSITION: Final = "set_bed_feet_position"
+SERVICE_SET_BED_POSITION: Final = "set_bed_position"
+SERVICE_SAVE_PRESET: Final = "save_preset"
+SERVICE_DELETE_PRESET: Final = "delete_preset"
 SERVICE_CALIBRATE: Final = "calibrate"
 SERVICE_DIAGNOSTICS: Final = "diagnostics"
+SERVICE_SAVE_GROUP: Final = "save_group"
+SERVICE_DELETE_GROUP: Final = "delete_group"
+SERVICE_SET_GROUP_POSITION: Final = "set_group_position"
+SERVICE_LOAD_GROUP_PRESET: Final = "load_group_preset"
+SERVICE_STOP_GROUP: Final = "stop_group"
+SERVICE_PROFILE: Final = "profile"
 
 # Attributes
 ATTR_POSITION: Final = "position"
@@ -26,6 +52,12 @@ ATTR_HEAD_POSITION: Final = "head_position"
 ATTR_FEET_POSITION: Final = "feet_position"
 ATTR_CALIBRATION_MODE: Final = "calibration_mode"
 ATTR_MOVEMENT_TYPE: Final = "movement_type"
+ATTR_MASSAGE_LEVEL: Final = "massage_level"
+ATTR_MASSAGE_ZONE: Final = "massage_zone"
+ATTR_GROUP: Final = "group"
+ATTR_PRESET: Final = "preset"
+ATTR_STAGGER: Final = "stagger"
+ATTR_ENABLED: Final = "enabled"
 
 # Movement Types
 MOVEMENT_TYPES: Final = {
@@ -38,10 +70,67 @@ MOVEMENT_TYPES: Final = {
     6: "both_down"
 }
 
+# Massage
+MASSAGE_ZONES: Final = ["none", "head", "feet", "both"]
+
+# Axes
+AXIS_HEAD: Final = "head"
+AXIS_FEET: Final = "feet"
+
+# Octo RC2 protocol
+RC2_SERVICE_UUID: Final = "0000ffe0-0000-1000-8000-00805f9b34fb"
+RC2_CHARACTERISTIC_UUID: Final = "0000ffe1-0000-1000-8000-00805f9b34fb"
+RC2_LOCAL_NAME_PREFIX: Final = "RC2"
+RC2_FRAME_DELIMITER: Final = 0x40
+RC2_CMD_MOVE_UP: Final = (0x02, 0x70)
+RC2_CMD_MOVE_DOWN: Final = (0x02, 0x71)
+RC2_CMD_STOP: Final = (0x02, 0x73)
+RC2_CMD_PIN: Final = (0x20, 0x43)
+RC2_CMD_STATUS: Final = (0x21, 0x71)  # notification: head %, feet %, movement type
+RC2_MOTOR_HEAD: Final = 0x02
+RC2_MOTOR_FEET: Final = 0x04
+RC2_MOTOR_BOTH: Final = 0x06
+
 # Default Values
 DEFAULT_HEAD_DURATION: Final = 30000  # 30 seconds in ms
 DEFAULT_FEET_DURATION: Final = 30000  # 30 seconds in ms
 DEFAULT_DEVICE_NAME: Final = "RC2"
+DEFAULT_START_LATENCY: Final = 150  # ms from movement command to motor turning
+DEFAULT_STOP_LATENCY: Final = 100  # ms a motor coasts after the stop command
+POSITION_TOLERANCE: Final = 1.0  # % within which an axis counts as on target
+COALESCE_DELAY: Final = 0.15  # seconds a position target waits for a newer one
+COMMAND_QUEUE_SIZE: Final = 16
+STATE_UPDATE_INTERVAL: Final = 0.25  # seconds between entity writes while moving
+STATE_POSITION_DIGITS: Final = 1  # decimals positions are reported to; finer is estimation noise
+KEEPALIVE_INTERVAL: Final = 30  # seconds between PIN keep-alives
+KEEPALIVE_TICK: Final = 1.0  # seconds between slots of the shared keep-alive wheel
+CONNECTION_SLOTS: Final = 3  # connections an ESPHome bluetooth proxy holds at once
+RECONNECT_BASE_DELAY: Final = 2.0  # seconds before the first reconnect attempt
+RECONNECT_MAX_DELAY: Final = 300.0  # seconds the reconnect backoff is capped at
+CIRCUIT_BREAKER_THRESHOLD: Final = 2  # failed connects before commands fail fast
+HISTORY_SIZE: Final = 512  # movements kept in the movement history
+MQTT_BATCH_WINDOW: Final = 0.02  # seconds frames are gathered into one publish
+PROBE_TIMEOUT: Final = 10.0  # seconds a discovery probe may take to reach a bed
+
+# Calibration
+CALIBRATION_STORAGE_VERSION: Final = 1
+CALIBRATION_SAVE_DELAY: Final = 10  # seconds
+CALIBRATION_EWMA_ALPHA: Final = 0.3
+CALIBRATION_MIN_DISTANCE: Final = 20.0  # % of travel a move must cover to be learned from
+CALIBRATION_TIMEOUT_FACTOR: Final = 3  # x the current travel time before a pass is abandoned
+
+# Presets
+PRESET_STORAGE_VERSION: Final = 1
+PRESET_SAVE_DELAY: Final = 5  # seconds
+
+# Groups
+GROUP_STORAGE_VERSION: Final = 1
+GROUP_SAVE_DELAY: Final = 5  # seconds
+GROUP_MAX_STAGGER: Final = 10.0  # seconds between the motor starts of two beds
+
+# Profiling
+PROFILE_SLOW_STEP: Final = 0.01  # seconds a loop segment may run before it is flagged
+NOTIFICATION_LOG_SAMPLE: Final = 50  # notifications per debug record on the hot path
 
 # Logging
 LOG_LEVEL: Final = "DEBUG"
@@ -0,0 +1,51 @@
+"""Update coordinator for the Bed Manager integration."""
+from __future__ import annotations
+
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .device import BedManagerDevice
+from .state import STATE_FIELDS, BedState
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BedManagerCoordinator(DataUpdateCoordinator[BedState]):
+    """Share one subscription to a bed between all of its entities.
+
+    The bed pushes its state, so there is no polling interval; the device
+    already throttles its updates while a motor runs. ``changes`` names the
+    fields of the snapshot the last update changed.
+    """
+
+    def __init__(self, hass: HomeAssistant, device: BedManagerDevice) -> None:
+        """Initialize the coordinator."""
+        super().__init__(hass, _LOGGER, name=device.name)
+        self.device = device
+        self._unsub: CALLBACK_TYPE | None = None
+        self.changes: frozenset[str] = STATE_FIELDS
+
+    async def _async_update_data(self) -> BedState:
+        """Return the current state of the bed."""
+        self.changes = STATE_FIELDS
+        return self.device.state
+
+    @callback
+    def async_start(self) -> None:
+        """Start following the state pushed by the bed."""
+        if self._unsub is None:
+            self._unsub = self.device.async_add_listener(self._async_device_updated)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following the bed."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_device_updated(self) -> None:
+        self.changes = self.device.state_changes
+        self.async_set_updated_data(self.device.state)
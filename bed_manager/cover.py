@@ -0,0 +1,106 @@
+"""Cover platform for the Bed Manager integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.cover import (
+    ATTR_POSITION,
+    CoverEntity,
+    CoverEntityFeature,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import (
+    DATA_COORDINATORS,
+    AXIS_HEAD,
+    AXIS_FEET,
+    ATTR_HEAD_POSITION,
+    ATTR_FEET_POSITION,
+    ATTR_MOVEMENT_TYPE,
+)
+from .coordinator import BedManagerCoordinator
+from .device import MOVEMENT_TYPE_BOTH, MOVEMENT_TYPE_BY_AXIS
+from .entity import BedManagerEntity
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up the head and feet covers of a bed."""
+    coordinator: BedManagerCoordinator = hass.data[DATA_COORDINATORS][entry.entry_id]
+    async_add_entities(
+        [
+            BedSectionCover(coordinator, AXIS_HEAD, "Head", ATTR_HEAD_POSITION),
+            BedSectionCover(coordinator, AXIS_FEET, "Feet", ATTR_FEET_POSITION),
+        ]
+    )
+
+
+class BedSectionCover(BedManagerEntity, CoverEntity):
+    """One adjustable section of a bed, 0% flat to 100% fully raised."""
+
+    _attr_supported_features = (
+        CoverEntityFeature.OPEN
+        | CoverEntityFeature.CLOSE
+        | CoverEntityFeature.STOP
+        | CoverEntityFeature.SET_POSITION
+    )
+
+    def __init__(
+        self, coordinator: BedManagerCoordinator, axis: str, name: str, attribute: str
+    ) -> None:
+        """Initialize the cover."""
+        super().__init__(coordinator, axis)
+        self._attr_name = name
+        self._axis = axis
+        self._attribute = attribute
+        self._state_fields = frozenset({attribute, ATTR_MOVEMENT_TYPE})
+
+    @property
+    def current_cover_position(self) -> int:
+        """Return the section position."""
+        return round(getattr(self.coordinator.data, self._attribute))
+
+    @property
+    def is_closed(self) -> bool:
+        """Return True if the section is flat."""
+        return self.current_cover_position == 0
+
+    @property
+    def is_opening(self) -> bool:
+        """Return True if the section is being raised."""
+        return self.coordinator.data.movement_type in (
+            MOVEMENT_TYPE_BY_AXIS[(self._axis, True)],
+            MOVEMENT_TYPE_BOTH[True],
+        )
+
+    @property
+    def is_closing(self) -> bool:
+        """Return True if the section is being lowered."""
+        return self.coordinator.data.movement_type in (
+            MOVEMENT_TYPE_BY_AXIS[(self._axis, False)],
+            MOVEMENT_TYPE_BOTH[False],
+        )
+
+    async def async_open_cover(self, **kwargs: Any) -> None:
+        """Raise the section fully."""
+        await self._async_set_position(100.0)
+
+    async def async_close_cover(self, **kwargs: Any) -> None:
+        """Lower the section flat."""
+        await self._async_set_position(0.0)
+
+    async def async_set_cover_position(self, **kwargs: Any) -> None:
+        """Move the section to a position."""
+        await self._async_set_position(float(kwargs[ATTR_POSITION]))
+
+    async def async_stop_cover(self, **kwargs: Any) -> None:
+        """Stop the bed."""
+        await self.device.async_stop()
+
+    async def _async_set_position(self, position: float) -> None:
+        if self._axis == AXIS_HEAD:
+            await self.device.async_set_head_position(position)
+        else:
+            await self.device.async_set_feet_position(position)
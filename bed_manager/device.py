@@ -1,14 +1,21 @@
 """Device class for Bed Manager integration."""
 from __future__ import annotations
 
+import asyncio
+import inspect
 import logging
-from typing import Any, Dict, Optional
+import time
+from collections.abc import Awaitable, Callable
+from functools import partial
+from typing import Any, Dict, List, Optional
 
+from homeassistant.components.bluetooth import (
+    BluetoothChange,
+    BluetoothServiceInfoBleak,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import device_registry as dr
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
     DOMAIN,
@@ -18,17 +25,99 @@ from .const import (
     CONF_DEVICE_NAME,
     CONF_TARGET_MAC,
     CONF_STORED_PIN,
+    CONF_TRANSPORT,
+    CONF_ESPHOME_NODE,
+    CONF_MQTT_PREFIX,
+    TRANSPORT_BLUETOOTH,
+    TRANSPORT_ESPHOME,
+    TRANSPORT_MQTT,
+    DEFAULT_MQTT_PREFIX,
     DEFAULT_DEVICE_NAME,
-    DEFAULT_HEAD_DURATION,
-    DEFAULT_FEET_DURATION,
+    AXIS_HEAD,
+    AXIS_FEET,
+    DEFAULT_START_LATENCY,
+    DEFAULT_STOP_LATENCY,
+    POSITION_TOLERANCE,
+    COALESCE_DELAY,
+    COMMAND_QUEUE_SIZE,
+    STATE_UPDATE_INTERVAL,
+    RECONNECT_BASE_DELAY,
+    RECONNECT_MAX_DELAY,
+    CIRCUIT_BREAKER_THRESHOLD,
+    HISTORY_SIZE,
+    CALIBRATION_TIMEOUT_FACTOR,
+    ATTR_HEAD_POSITION,
+    ATTR_FEET_POSITION,
+    ATTR_MASSAGE_LEVEL,
+    ATTR_MASSAGE_ZONE,
+    MASSAGE_ZONES,
+    NOTIFICATION_LOG_SAMPLE,
+    PROFILE_SLOW_STEP,
+    STATE_POSITION_DIGITS,
 )
+from .calibration import TravelCalibration
+from .coalescer import TargetCoalescer
+from .command_queue import CommandQueue
+from .connection_manager import SlotHolder, async_get_connection_manager
+from .esphome_transport import EsphomeBedTransport
+from .history import MovementHistory
+from .metrics import BedMetrics
+from .mqtt_transport import MqttBedTransport
+from .position import AxisEstimator
+from .presets import PresetStore
+from .profiler import LazyHex, LoopProfiler, SampledLogger
+from .protocol import decode_status, movement_frame, stop_frame
+from .reconnect import ReconnectEngine
+from .session import PinSession, async_get_keepalive_wheel
+from .state import BedState
+from .transport import BedConnectionError, BedTransport, BleakBedTransport
 
 _LOGGER = logging.getLogger(__name__)
 
+# (axis, moving up) -> MOVEMENT_TYPES key
+MOVEMENT_TYPE_BY_AXIS: Dict[tuple[str, bool], int] = {
+    (AXIS_HEAD, True): 1,
+    (AXIS_HEAD, False): 2,
+    (AXIS_FEET, True): 3,
+    (AXIS_FEET, False): 4,
+}
+# moving up -> MOVEMENT_TYPES key of the dual-motor move
+MOVEMENT_TYPE_BOTH: Dict[bool, int] = {True: 5, False: 6}
+# Callbacks timed alongside the coroutines while profiling
+PROFILED_CALLBACKS = (
+    "_handle_notification",
+    "_handle_disconnected",
+    "_async_state_changed",
+    "_async_update_listeners",
+    "async_handle_advertisement",
+)
+
+def _create_transport(hass: HomeAssistant, entry: ConfigEntry) -> BedTransport:
+    """Return the transport a bed is configured to be reached through."""
+    address = entry.data[CONF_MAC_ADDRESS]
+    kind = entry.data.get(CONF_TRANSPORT, TRANSPORT_BLUETOOTH)
+    if kind == TRANSPORT_ESPHOME:
+        return EsphomeBedTransport(hass, address, entry.data[CONF_ESPHOME_NODE])
+    if kind == TRANSPORT_MQTT:
+        return MqttBedTransport(
+            hass, address, entry.data.get(CONF_MQTT_PREFIX, DEFAULT_MQTT_PREFIX)
+        )
+    return BleakBedTransport(hass, address, entry.data[CONF_NAME])
+
+def _wake(future: asyncio.Future[None]) -> None:
+    """Resolve a wakeup future unless something already did."""
+    if not future.done():
+        future.set_result(None)
+
 class BedManagerDevice:
     """Device class for Bed Manager."""
 
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        transport: Optional[BedTransport] = None,
+    ) -> None:
         """Initialize the device."""
         self.hass = hass
         self.entry = entry
@@ -39,19 +128,83 @@ class BedManagerDevice:
         self._target_mac = entry.data.get(CONF_TARGET_MAC, "")
         self._stored_pin = entry.data.get(CONF_STORED_PIN, "0000")
         self._device_info: Optional[DeviceInfo] = None
-        self._presets: Dict[str, Dict[str, Any]] = {}
+        self._presets = PresetStore(hass, entry.entry_id)
         self._connected = False
+        self._parked = False
+        self._connect_lock = asyncio.Lock()
+        # Callbacks handed out here look the method up when called, so they
+        # reach the timed replacements while profiling is on.
+        self._slot = SlotHolder(
+            self._mac_address, self._is_idle, lambda: self._async_park()
+        )
+        self._reconnect = ReconnectEngine(
+            hass,
+            self._name,
+            lambda: self._async_reconnect(),
+            base_delay=RECONNECT_BASE_DELAY,
+            max_delay=RECONNECT_MAX_DELAY,
+            threshold=CIRCUIT_BREAKER_THRESHOLD,
+        )
+        self._transport = transport or _create_transport(hass, entry)
+        self._transport.set_notification_callback(self._handle_notification)
+        self._transport.set_disconnected_callback(self._handle_disconnected)
+        self._session = PinSession(self._stored_pin, self._transport.async_write)
         
         # Position tracking
-        self._head_position = 0.0
-        self._feet_position = 0.0
+        self._calibration = TravelCalibration(hass, entry.entry_id)
+        self._estimators = {
+            axis: AxisEstimator(
+                self._calibration.travel_time(axis, True),
+                self._calibration.travel_time(axis, False),
+                DEFAULT_START_LATENCY / 1000,
+                DEFAULT_STOP_LATENCY / 1000,
+            )
+            for axis in (AXIS_HEAD, AXIS_FEET)
+        }
         self._target_head_position = 0.0
         self._target_feet_position = 0.0
-        
+        # axis -> position in the last status the bed pushed
+        self._reported_positions: Dict[str, int] = {}
+        self._history = MovementHistory(HISTORY_SIZE)
+        # axis -> history slot of a move whose end the bed has not reported yet
+        self._unconfirmed_moves: Dict[str, int] = {}
+
         # Movement state
         self._movement_in_progress = False
         self._current_movement_type = 0
         self._calibration_mode = 0
+        self._calibration_marker: Optional[asyncio.Future[float]] = None
+        self._calibration_task: Optional[asyncio.Task] = None
+        self._massage_level = 0
+        self._massage_zone = MASSAGE_ZONES[0]
+
+        # Command coalescing
+        self._coalescers = {
+            axis: TargetCoalescer(
+                COALESCE_DELAY,
+                lambda target, axis=axis: self._async_dispatch_move(axis, target),
+            )
+            for axis in (AXIS_HEAD, AXIS_FEET)
+        }
+        self._active_moves: Dict[str, tuple[bool, asyncio.Task]] = {}
+        self._retargeted_commands = 0
+        self._queue = CommandQueue(COMMAND_QUEUE_SIZE, on_idle=self._async_queue_idle)
+        self._wakeup: Optional[asyncio.Future[None]] = None
+
+        # Instrumentation
+        self._metrics = BedMetrics()
+        self._enqueued_at: Optional[float] = None
+        self._ack_pending_since: Optional[float] = None
+        self._notification_log = SampledLogger(_LOGGER, NOTIFICATION_LOG_SAMPLE)
+        self._profiler: Optional[LoopProfiler] = None
+        self._profiled: List[str] = []
+
+        # State listeners
+        self._listeners: List[Callable[[], None]] = []
+        self._update_handle: Optional[asyncio.TimerHandle] = None
+        self._last_update = 0.0
+        self._state = BedState()
+        self._state_changes: frozenset[str] = frozenset()
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -66,116 +219,875 @@ class BedManagerDevice:
             )
         return self._device_info
 
+    @property
+    def available(self) -> bool:
+        """Return True if the bed can be commanded.
+
+        A bed parked to free its connection slot stays available; the next
+        command connects it again.
+        """
+        return self._link_up or self._parked
+
+    @property
+    def _link_up(self) -> bool:
+        """Return True if the link to the bed is up."""
+        return self._connected and self._transport.is_connected
+
+    @property
+    def name(self) -> str:
+        """Return the name of the bed."""
+        return self._name
+
+    @property
+    def mac_address(self) -> str:
+        """Return the Bluetooth address of the bed."""
+        return self._mac_address
+
+    @property
+    def state(self) -> BedState:
+        """Return the state shown by the entities, as of the last update."""
+        return self._state
+
+    @property
+    def state_changes(self) -> frozenset[str]:
+        """Return the fields the last update changed."""
+        return self._state_changes
+
+    @property
+    def metrics(self) -> BedMetrics:
+        """Return the latency and link-health metrics."""
+        return self._metrics
+
+    @property
+    def reconnect_attempts(self) -> int:
+        """Return how many background reconnects were tried."""
+        return self._reconnect.attempts
+
+    @property
+    def rssi(self) -> Optional[int]:
+        """Return the last signal strength heard from the bed."""
+        return self._transport.rssi
+
+    @property
+    def history(self) -> MovementHistory:
+        """Return the recent movement history."""
+        return self._history
+
+    @property
+    def presets(self) -> list[str]:
+        """Return the names of the saved presets."""
+        return self._presets.names
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Register a callback run when the bed state changes."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    async def async_load(self) -> None:
+        """Load persisted calibration and presets."""
+        await asyncio.gather(self._calibration.async_load(), self._presets.async_load())
+        self._apply_calibration()
+        self._state = self._snapshot()
+
     async def async_setup(self) -> None:
-        """Set up the device."""
+        """Set up the device.
+
+        This is run as a background task, so a slow or absent bed never holds
+        up Home Assistant startup. If it fails, the bed keeps being retried in
+        the background and commands also connect lazily.
+        """
         try:
-            # Initialize ESPHome connection
-            await self._async_connect()
-            self._connected = True
-            _LOGGER.info("Successfully connected to bed %s", self._name)
-        except Exception as err:
+            await self._async_ensure_connected()
+        except BedConnectionError as err:
             _LOGGER.error("Failed to connect to bed %s: %s", self._name, err)
-            self._connected = False
+
+    async def async_connect(self) -> None:
+        """Connect and authenticate now rather than on the next command."""
+        await self._async_ensure_connected()
 
     async def async_unload(self) -> None:
         """Unload the device."""
+        self._reconnect.cancel()
+        for coalescer in self._coalescers.values():
+            coalescer.cancel()
+        await self._queue.async_shutdown()
+        if self._calibration_task is not None:
+            self._calibration_task.cancel()
+            await asyncio.wait({self._calibration_task})
+        if self._update_handle is not None:
+            self._update_handle.cancel()
+            self._update_handle = None
+        self._async_end_session()
+        async_get_connection_manager(self.hass).release(self._mac_address)
         if self._connected:
             await self._async_disconnect()
             self._connected = False
 
+    async def _async_ensure_connected(self) -> None:
+        """Connect on first use and reuse the link afterwards.
+
+        The connection slot on the bed's adapter or proxy is taken first, so
+        beds behind the same proxy do not fight over its few connections.
+        """
+        if self._link_up:
+            return
+        self._reconnect.check()
+
+        async with self._connect_lock:
+            if self._link_up:
+                return
+            # A background retry may have failed while this waited for the lock.
+            self._reconnect.check()
+            connections = async_get_connection_manager(self.hass)
+            await connections.async_acquire(self._transport.source, self._slot)
+            started = asyncio.get_running_loop().time()
+            try:
+                await self._async_connect()
+            except Exception as err:
+                self._connected = False
+                connections.release(self._mac_address)
+                self._reconnect.record_failure()
+                if isinstance(err, BedConnectionError):
+                    raise
+                raise BedConnectionError(f"Device not connected: {err}") from err
+            self._connected = True
+            self._parked = False
+            self._reconnect.record_success()
+            self._metrics.connect.record(asyncio.get_running_loop().time() - started)
+            _LOGGER.info("Successfully connected to bed %s", self._name)
+            await self._async_authenticate()
+        self._async_state_changed()
+
+    async def _async_reconnect(self) -> None:
+        """Reconnect in the background and show the attempt either way."""
+        try:
+            await self._async_ensure_connected()
+        finally:
+            self._async_state_changed()
+
     async def _async_connect(self) -> None:
-        """Connect to the bed via ESPHome."""
-        # Implement ESPHome connection logic here
-        pass
+        """Open the long-lived session to the bed."""
+        await self._transport.async_connect()
 
     async def _async_disconnect(self) -> None:
         """Disconnect from the bed."""
-        # Implement ESPHome disconnection logic here
-        pass
+        await self._transport.async_disconnect()
+
+    async def _async_authenticate(self) -> None:
+        """Send the PIN once for this connection and start keeping it alive."""
+        if self._session.authenticated:
+            return
+        try:
+            await self._session.async_ensure_authenticated()
+        except BedConnectionError:
+            self._async_end_session()
+            raise
+        async_get_keepalive_wheel(self.hass).async_add(
+            self._mac_address, self._async_keep_alive_due
+        )
+        _LOGGER.debug("Authenticated with bed %s", self._name)
+
+    @callback
+    def _async_end_session(self) -> None:
+        """Forget the session so the next command authenticates again."""
+        self._session.invalidate()
+        async_get_keepalive_wheel(self.hass).async_remove(self._mac_address)
+
+    @callback
+    def _async_keep_alive_due(self) -> None:
+        """Send the keep-alive when the shared wheel comes round to this bed."""
+        if self._link_up and self._session.authenticated:
+            self.hass.async_create_task(self._async_keep_alive())
+
+    async def _async_keep_alive(self) -> None:
+        try:
+            await self._session.async_keep_alive()
+        except BedConnectionError as err:
+            _LOGGER.debug("Keep-alive to bed %s failed: %s", self._name, err)
+            self._async_end_session()
+
+    async def _async_send(self, frame: bytes) -> None:
+        """Write a frame over the shared, authenticated session."""
+        await self._async_ensure_connected()
+        await self._async_authenticate()
+        async_get_connection_manager(self.hass).touch(self._mac_address)
+        now = asyncio.get_running_loop().time()
+        if self._enqueued_at is not None:
+            self._metrics.queue_to_write.record(now - self._enqueued_at)
+            self._enqueued_at = None
+        self._ack_pending_since = now
+        try:
+            await self._transport.async_write(frame)
+        except BedConnectionError:
+            self._async_end_session()
+            raise
+
+    def _get_position(self, axis: str) -> float:
+        """Return the current estimated position of an axis."""
+        return self._estimators[axis].position_at(asyncio.get_running_loop().time())
+
+    def _set_position(self, axis: str, position: float) -> None:
+        """Record the position of an axis that is not moving."""
+        self._estimators[axis].position = position
+
+    def _get_target(self, axis: str) -> float:
+        """Return the requested position of an axis."""
+        return self._target_head_position if axis == AXIS_HEAD else self._target_feet_position
+
+    def _set_target(self, axis: str, position: float) -> None:
+        """Record the requested position of an axis.
+
+        A running move is woken so it can reschedule its stop deadline.
+        """
+        if axis == AXIS_HEAD:
+            self._target_head_position = position
+        else:
+            self._target_feet_position = position
+        self._wake_drive()
+
+    def _wake_drive(self) -> None:
+        """Wake a running move so it recomputes its stop deadlines."""
+        if self._wakeup is not None:
+            _wake(self._wakeup)
+
+    @callback
+    def _async_state_changed(self) -> None:
+        """Tell listeners the state changed, at most every STATE_UPDATE_INTERVAL.
+
+        While a motor runs the position changes continuously, so listeners are
+        refreshed on a fixed cadence instead of on every event. Once the bed is
+        idle the next change is written straight away, which delivers the exact
+        final position as soon as a move ends.
+        """
+        if self._update_handle is not None:
+            if self._movement_in_progress:
+                return
+            self._update_handle.cancel()
+            self._update_handle = None
+
+        loop = asyncio.get_running_loop()
+        next_update = self._last_update + STATE_UPDATE_INTERVAL
+        if self._movement_in_progress and loop.time() < next_update:
+            self._update_handle = loop.call_at(next_update, self._async_update_listeners)
+            return
+        self._async_update_listeners()
+
+    @callback
+    def _async_update_listeners(self) -> None:
+        """Take a new snapshot and, if anything in it changed, run the listeners.
+
+        While a motor runs the listeners keep being refreshed on a fixed
+        cadence.
+        """
+        loop = asyncio.get_running_loop()
+        self._update_handle = None
+        self._last_update = loop.time()
+        state = self._snapshot()
+        self._state_changes = state.diff(self._state)
+        self._state = state
+        if self._state_changes:
+            for update_callback in list(self._listeners):
+                update_callback()
+        if self._movement_in_progress:
+            self._update_handle = loop.call_at(
+                self._last_update + STATE_UPDATE_INTERVAL, self._async_update_listeners
+            )
+
+    def _snapshot(self) -> BedState:
+        """Return the current state as a new snapshot."""
+        return BedState(
+            available=self.available,
+            head_position=round(self._get_position(AXIS_HEAD), STATE_POSITION_DIGITS),
+            feet_position=round(self._get_position(AXIS_FEET), STATE_POSITION_DIGITS),
+            movement_type=self._current_movement_type,
+            massage_level=self._massage_level,
+            massage_zone=self._massage_zone,
+            calibration_mode=self._calibration_mode,
+            presets=tuple(self._presets.names),
+            rssi=self.rssi,
+            connect_time=self._metrics.connect.percentile(0.5),
+            command_latency=self._metrics.queue_to_write.percentile(0.95),
+            response_latency=self._metrics.write_to_ack.percentile(0.95),
+            reconnects=self._reconnect.attempts,
+        )
+
+    @callback
+    def _handle_notification(self, data: bytes) -> None:
+        """Update the state in place from a frame pushed by the bed."""
+        if (status := decode_status(data)) is None:
+            self._notification_log.debug(
+                "Ignoring notification %s from bed %s", LazyHex(data), self._name
+            )
+            return
+        self._notification_log.debug("Status from bed %s: %s", self._name, status)
+
+        now = asyncio.get_running_loop().time()
+        if self._ack_pending_since is not None:
+            # The first status after a write shows the controller acted on it.
+            self._metrics.write_to_ack.record(now - self._ack_pending_since)
+            self._ack_pending_since = None
+        for axis, position in (
+            (AXIS_HEAD, status.head_position),
+            (AXIS_FEET, status.feet_position),
+        ):
+            self._estimators[axis].correct(position, now)
+            self._reported_positions[axis] = position
+            if status.movement_type == 0 and axis in self._unconfirmed_moves:
+                movement = self._history.confirm(self._unconfirmed_moves.pop(axis), position)
+                self._calibration.observe_movement(movement)
+        if not self._movement_in_progress:
+            # The bed is being moved from its own remote.
+            self._current_movement_type = status.movement_type
+            if status.movement_type:
+                self._unconfirmed_moves.clear()
+        self._wake_drive()
+        self._async_state_changed()
+
+    @callback
+    def _handle_disconnected(self) -> None:
+        """Mark the bed unavailable when the link drops."""
+        _LOGGER.warning("Lost connection to bed %s", self._name)
+        self._connected = False
+        self._metrics.disconnects += 1
+        self._ack_pending_since = None
+        self._unconfirmed_moves.clear()
+        self._async_end_session()
+        async_get_connection_manager(self.hass).release(self._mac_address)
+        self._reconnect.async_schedule()
+        self._async_state_changed()
+
+    @callback
+    def async_handle_advertisement(
+        self, service_info: BluetoothServiceInfoBleak, change: BluetoothChange
+    ) -> None:
+        """Refresh the signal strength, and reconnect a bed that dropped out."""
+        if not self._link_up and not self._parked:
+            self._reconnect.async_advertised()
+        self._async_state_changed()
+
+    def _is_idle(self) -> bool:
+        """Return True if nothing is moving or waiting to move."""
+        return (
+            self._queue.idle
+            and not self._movement_in_progress
+            and not self._calibration_mode
+        )
+
+    @callback
+    def _async_queue_idle(self) -> None:
+        """Offer the connection slot to a waiting bed once the work is done."""
+        async_get_connection_manager(self.hass).async_idle(self._mac_address)
+
+    async def _async_park(self) -> None:
+        """Disconnect an idle bed so another one can use its slot."""
+        _LOGGER.info("Disconnecting idle bed %s to free a connection slot", self._name)
+        self._connected = False
+        self._parked = True
+        self._async_end_session()
+        await self._async_disconnect()
+        self._async_state_changed()
+
+    def _apply_calibration(self) -> None:
+        """Use the learned travel times for position estimates."""
+        for axis, estimator in self._estimators.items():
+            estimator.travel_up = self._calibration.travel_time(axis, True)
+            estimator.travel_down = self._calibration.travel_time(axis, False)
+
+    async def _async_request_move(self, axis: str, target: float) -> None:
+        """Move an axis, folding the target into a move already underway.
+
+        A move heading the right way is retargeted in place. Anything else is
+        debounced so a slider drag becomes one move to its final value.
+        """
+        self._set_target(axis, target)
+        active = self._active_moves.get(axis)
+        if active is not None:
+            moving_up, task = active
+            position = self._get_position(axis)
+            if (target > position) if moving_up else (target < position):
+                self._retargeted_commands += 1
+                # Wait without cancelling the move, and return quietly if a
+                # stop cancels it, as a caller whose move was queued would.
+                await asyncio.wait((task,))
+                if not task.cancelled():
+                    task.result()
+                return
+        await self._coalescers[axis].async_submit(target)
+
+    async def _async_dispatch_move(self, axis: str, target: float) -> None:
+        """Queue the move for the last target of a burst.
+
+        A queued move for the same axis is superseded and its other axes are
+        carried over. A move running in the other direction sees the new
+        target and stops, letting this one start.
+        """
+        axes = frozenset({axis})
+        axes |= self._queue.overlapping_keys(axes)
+        await self._async_submit(partial(self._async_run_move, axes), keys=axes)
+
+    async def _async_submit(
+        self, run: Callable[[], Awaitable[None]], *, keys: frozenset[str]
+    ) -> None:
+        """Queue a command, timing how long it waits for its first write."""
+        enqueued = asyncio.get_running_loop().time()
+
+        async def timed_run() -> None:
+            self._enqueued_at = enqueued
+            try:
+                await run()
+            finally:
+                self._enqueued_at = None
+
+        await self._queue.async_submit(timed_run, keys=keys)
+
+    async def _async_run_move(self, axes: frozenset[str]) -> None:
+        """Drive the given axes to their latest targets once the link is ours.
+
+        Axes travelling the same way share one dual-motor move; an axis going
+        the other way follows on its own.
+        """
+        groups: Dict[bool, set[str]] = {True: set(), False: set()}
+        for axis in sorted(axes):
+            position = self._get_position(axis)
+            target = self._get_target(axis)
+            if abs(target - position) > POSITION_TOLERANCE:
+                groups[target > position].add(axis)
+
+        for moving_up, group in groups.items():
+            if group:
+                await self._async_drive(group, moving_up)
+
+    @staticmethod
+    def _movement_type(axes: set[str], moving_up: bool) -> int:
+        """Return the MOVEMENT_TYPES key for driving some axes one way."""
+        if len(axes) == 2:
+            return MOVEMENT_TYPE_BOTH[moving_up]
+        (axis,) = axes
+        return MOVEMENT_TYPE_BY_AXIS[(axis, moving_up)]
+
+    async def _async_drive(self, axes: set[str], moving_up: bool) -> None:
+        """Run the motors of some axes one way until each reaches its target.
+
+        Instead of polling, the loop sleeps until the earliest stop deadline
+        with ``loop.call_at``. A retarget wakes it early to reschedule, so a
+        later target further along is followed without restarting the motor.
+        When one axis of a dual move arrives, the other carries on alone.
+        """
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        estimators = {axis: self._estimators[axis] for axis in axes}
+        origins = {axis: estimator.position for axis, estimator in estimators.items()}
+        remaining = set(axes)
+        stopped: Dict[str, float] = {}
+        started: Optional[float] = None
+        first_movement_type = self._movement_type(remaining, moving_up)
+
+        for axis in axes:
+            self._active_moves[axis] = (moving_up, task)
+        self._movement_in_progress = True
+        try:
+            while remaining:
+                movement_type = self._movement_type(remaining, moving_up)
+                await self._async_send(movement_frame(movement_type))
+                now = loop.time()
+                self._current_movement_type = movement_type
+                if started is None:
+                    for estimator in estimators.values():
+                        estimator.start(moving_up, now)
+                    started = now
+                for axis in axes - remaining - stopped.keys():
+                    estimators[axis].stop(now)
+                    stopped[axis] = now
+                self._async_state_changed()
+
+                phase = set(remaining)
+                while remaining == phase:
+                    deadlines = {
+                        axis: estimators[axis].stop_deadline(self._get_target(axis))
+                        for axis in phase
+                    }
+                    now = loop.time()
+                    for axis, deadline in deadlines.items():
+                        if deadline <= now:
+                            remaining.discard(axis)
+                            del self._active_moves[axis]
+                    if remaining == phase:
+                        await self._async_sleep_until(min(deadlines.values()))
+        finally:
+            for axis in remaining:
+                del self._active_moves[axis]
+            now = loop.time()
+            for axis, estimator in estimators.items():
+                if estimator.moving:
+                    estimator.stop(now)
+                    stopped[axis] = now
+                if started is not None:
+                    self._unconfirmed_moves[axis] = self._history.append(
+                        time.time(),
+                        axis,
+                        first_movement_type,
+                        origins[axis],
+                        estimator.position,
+                        stopped[axis] - started + estimator.stop_latency - estimator.start_latency,
+                    )
+            self._movement_in_progress = False
+            self._current_movement_type = 0
+            self._async_state_changed()
+            await self._async_send_final_stop()
+
+    async def _async_sleep_until(self, when: float) -> None:
+        """Sleep until a loop time, or until a retarget wakes the move."""
+        loop = asyncio.get_running_loop()
+        self._wakeup = wakeup = loop.create_future()
+        handle = loop.call_at(when, _wake, wakeup)
+        try:
+            await wakeup
+        finally:
+            handle.cancel()
+            self._wakeup = None
+
+    async def _async_send_stop(self) -> None:
+        """Stop all motors."""
+        await self._async_send(stop_frame())
+
+    async def _async_send_final_stop(self) -> None:
+        """Stop the motors at the end of a move if the link is still up.
+
+        This never connects: a move that ends because the link dropped or the
+        bed is being unloaded has no running motor to stop, and connecting
+        here would bring back a link that was just torn down.
+        """
+        if self._link_up:
+            await self._async_send(stop_frame())
+
+    async def _async_home_axis(self, axis: str) -> None:
+        """Drive an axis against its lower end stop.
+
+        Before calibration the travel time is only a guess, so the axis is
+        driven until the bed reports it at the bottom, or for several times
+        the guess if it never does.
+        """
+        loop = asyncio.get_running_loop()
+        estimator = self._estimators[axis]
+        movement_type = MOVEMENT_TYPE_BY_AXIS[(axis, False)]
+        start_position = estimator.position
+        started: Optional[float] = None
+        self._movement_in_progress = True
+        self._current_movement_type = movement_type
+        self._reported_positions.pop(axis, None)
+        try:
+            await self._async_send(movement_frame(movement_type))
+            started = loop.time()
+            estimator.start(False, started)
+            self._async_state_changed()
+            deadline = (
+                started
+                + estimator.start_latency
+                + CALIBRATION_TIMEOUT_FACTOR * estimator.travel_down
+            )
+            # Each status from the bed re-anchors the estimate and wakes us.
+            while loop.time() < deadline:
+                await self._async_sleep_until(deadline)
+                if self._reported_positions.get(axis) == 0:
+                    break
+        finally:
+            estimator.stop(loop.time())
+            estimator.position = 0.0
+            if started is not None:
+                self._history.append(
+                    time.time(),
+                    axis,
+                    movement_type,
+                    start_position,
+                    0.0,
+                    loop.time() - started,
+                    confirmed=True,
+                )
+            self._movement_in_progress = False
+            self._current_movement_type = 0
+            self._async_state_changed()
+            await self._async_send_final_stop()
 
     async def async_save_preset(self, preset_name: str, position: Dict[str, Any], 
                               massage_level: int, massage_zone: str) -> None:
         """Save a preset position."""
-        if not self._connected:
-            raise RuntimeError("Device not connected")
-
         preset_data = {
             "position": position,
             "massage_level": massage_level,
             "massage_zone": massage_zone,
         }
-        self._presets[preset_name] = preset_data
+        self._presets.set(preset_name, preset_data)
         _LOGGER.info("Saved preset %s for bed %s", preset_name, self._name)
+        self._async_state_changed()
+
+    async def async_delete_preset(self, preset_name: str) -> None:
+        """Delete a preset; a bed without it is left as it is."""
+        self._presets.remove(preset_name)
+        _LOGGER.info("Deleted preset %s for bed %s", preset_name, self._name)
+        self._async_state_changed()
 
     async def async_load_preset(self, preset_name: str) -> None:
-        """Load a preset position."""
-        if not self._connected:
-            raise RuntimeError("Device not connected")
+        """Load a preset position.
 
-        if preset_name not in self._presets:
-            raise ValueError(f"Preset {preset_name} not found")
+        Axes already within tolerance of the preset are left alone; the rest
+        are planned as one move from the current estimated position, sharing
+        motor time where both sections travel the same way.
+        """
+        await self._async_ensure_connected()
+
+        preset = self._presets.get(preset_name)
+        position = preset["position"]
+        targets = {
+            AXIS_HEAD: position.get(ATTR_HEAD_POSITION),
+            AXIS_FEET: position.get(ATTR_FEET_POSITION),
+        }
+        for axis, target in targets.items():
+            if target is not None and abs(target - self._get_position(axis)) <= POSITION_TOLERANCE:
+                targets[axis] = None
 
-        preset_data = self._presets[preset_name]
-        # Implement bed-specific preset loading logic here
         _LOGGER.info("Loaded preset %s for bed %s", preset_name, self._name)
+        self._massage_level = preset.get(ATTR_MASSAGE_LEVEL, 0)
+        self._massage_zone = preset.get(ATTR_MASSAGE_ZONE, MASSAGE_ZONES[0])
+        self._async_state_changed()
+        if targets[AXIS_HEAD] is None and targets[AXIS_FEET] is None:
+            return
+        await self.async_set_bed_position(targets[AXIS_HEAD], targets[AXIS_FEET])
 
     async def async_set_head_position(self, position: float) -> None:
         """Set the head position (0-100%)."""
-        if not self._connected:
-            raise RuntimeError("Device not connected")
+        await self._async_ensure_connected()
 
         if not 0 <= position <= 100:
             raise ValueError("Position must be between 0 and 100")
 
-        self._target_head_position = position
-        # Implement ESPHome command to move head
         _LOGGER.info("Setting head position to %.1f%% for bed %s", position, self._name)
+        await self._async_request_move(AXIS_HEAD, position)
 
     async def async_set_feet_position(self, position: float) -> None:
         """Set the feet position (0-100%)."""
-        if not self._connected:
-            raise RuntimeError("Device not connected")
+        await self._async_ensure_connected()
 
         if not 0 <= position <= 100:
             raise ValueError("Position must be between 0 and 100")
 
-        self._target_feet_position = position
-        # Implement ESPHome command to move feet
         _LOGGER.info("Setting feet position to %.1f%% for bed %s", position, self._name)
+        await self._async_request_move(AXIS_FEET, position)
+
+    async def async_set_bed_position(
+        self,
+        head_position: Optional[float] = None,
+        feet_position: Optional[float] = None,
+    ) -> None:
+        """Move head and feet (0-100%) together as one planned move."""
+        await self._async_ensure_connected()
+
+        targets = {AXIS_HEAD: head_position, AXIS_FEET: feet_position}
+        targets = {axis: target for axis, target in targets.items() if target is not None}
+        if not targets:
+            raise ValueError("At least one of head or feet position is required")
+        if not all(0 <= target <= 100 for target in targets.values()):
+            raise ValueError("Position must be between 0 and 100")
+
+        for axis, target in targets.items():
+            self._coalescers[axis].cancel()
+            self._set_target(axis, target)
+        _LOGGER.info(
+            "Setting bed position to head %s, feet %s for bed %s",
+            head_position,
+            feet_position,
+            self._name,
+        )
+        axes = frozenset(targets)
+        axes |= self._queue.overlapping_keys(axes)
+        await self._async_submit(partial(self._async_run_move, axes), keys=axes)
 
     async def async_calibrate(self, mode: int = 0) -> None:
         """Calibrate the bed.
+
+        Mode 1 or 2 homes the head or feet and then runs it up. Calling with
+        mode 0 marks the top, after which the section runs down until mode 0
+        marks the bottom. Both travel times are measured and persisted.
         
         Args:
             mode: 0=none, 1=head calibrating, 2=feet calibrating
         """
-        if not self._connected:
-            raise RuntimeError("Device not connected")
+        await self._async_ensure_connected()
 
         if not 0 <= mode <= 2:
             raise ValueError("Calibration mode must be 0, 1, or 2")
 
+        if mode == 0:
+            marker = self._calibration_marker
+            if marker is not None and not marker.done():
+                marker.set_result(asyncio.get_running_loop().time())
+                _LOGGER.info("Marked end of travel for bed %s", self._name)
+            return
+
+        if self._calibration_mode:
+            raise RuntimeError("Calibration already in progress")
+
         self._calibration_mode = mode
-        # Implement ESPHome calibration command
+        self._async_state_changed()
         _LOGGER.info("Starting calibration mode %d for bed %s", mode, self._name)
+        axis = AXIS_HEAD if mode == 1 else AXIS_FEET
+        self._calibration_task = self.hass.async_create_task(
+            self._async_queue_calibration(axis)
+        )
+
+    async def _async_queue_calibration(self, axis: str) -> None:
+        """Queue a calibration run and report how it ended.
+
+        The run carries no keys, so a later move waits for it instead of
+        superseding it. A stop can still drop it before it starts, in which
+        case the calibration mode is cleared here rather than by the run.
+        """
+        try:
+            await self._async_submit(
+                partial(self._async_run_calibration, axis), keys=frozenset()
+            )
+        except Exception as err:
+            _LOGGER.error(
+                "Calibration of %s on bed %s failed: %s", axis, self._name, err
+            )
+        finally:
+            if self._calibration_mode:
+                self._calibration_mode = 0
+                self._async_state_changed()
+
+    async def _async_run_calibration(self, axis: str) -> None:
+        """Measure the full-travel time of an axis in both directions."""
+        loop = asyncio.get_running_loop()
+        estimator = self._estimators[axis]
+        try:
+            await self._async_home_axis(axis)
+            for moving_up in (True, False):
+                self._calibration_marker = marker = loop.create_future()
+                movement_type = MOVEMENT_TYPE_BY_AXIS[(axis, moving_up)]
+                timeout = CALIBRATION_TIMEOUT_FACTOR * self._calibration.travel_time(
+                    axis, moving_up
+                )
+                self._movement_in_progress = True
+                self._current_movement_type = movement_type
+                try:
+                    await self._async_send(movement_frame(movement_type))
+                    started = loop.time()
+                    estimator.start(moving_up, started)
+                    self._async_state_changed()
+                    marked = await asyncio.wait_for(marker, timeout)
+                except asyncio.TimeoutError:
+                    _LOGGER.warning(
+                        "Calibration of %s on bed %s was not marked in time",
+                        axis,
+                        self._name,
+                    )
+                    return
+                finally:
+                    estimator.stop(loop.time())
+                    self._movement_in_progress = False
+                    self._current_movement_type = 0
+                    self._async_state_changed()
+                    await self._async_send_final_stop()
+
+                # The section stalled at its end stop before the mark.
+                seconds = marked - started - estimator.start_latency
+                self._calibration.record(axis, moving_up, seconds)
+                estimator.position = 100.0 if moving_up else 0.0
+                self._history.append(
+                    time.time(),
+                    axis,
+                    movement_type,
+                    100.0 - estimator.position,
+                    estimator.position,
+                    seconds,
+                    confirmed=True,
+                )
+                self._async_state_changed()
+        finally:
+            self._calibration_marker = None
+            self._calibration_mode = 0
+            self._apply_calibration()
+            self._async_state_changed()
+
+    async def async_stop(self) -> None:
+        """Stop all motors ahead of any queued work."""
+        await self._async_ensure_connected()
+
+        for axis, coalescer in self._coalescers.items():
+            coalescer.cancel()
+            self._set_target(axis, self._get_position(axis))
+        _LOGGER.info("Stopping bed %s", self._name)
+        await self._queue.async_preempt(self._async_send_stop)
+
+    @callback
+    def async_set_profiling(self, enabled: bool) -> None:
+        """Switch timing of the device's event loop segments on or off.
+
+        While on, every coroutine method is replaced on the instance by one
+        timing each of its steps, and the callbacks by ones timing each call;
+        switching off restores the plain methods but keeps the results for
+        the diagnostics until profiling starts again. The transport is handed
+        the current callbacks here; everything else given a method at setup
+        (the coalescers, the reconnect engine, the connection slot and the
+        Bluetooth callback) looks it up on each call.
+        """
+        if enabled == bool(self._profiled):
+            return
+        if enabled:
+            self._profiler = LoopProfiler(self._name, PROFILE_SLOW_STEP)
+            for name, member in inspect.getmembers(type(self)):
+                if name in PROFILED_CALLBACKS:
+                    wrapped = self._profiler.wrap_function(name, getattr(self, name))
+                elif inspect.iscoroutinefunction(member) and (
+                    name.startswith(("async_", "_async_"))
+                ):
+                    wrapped = self._profiler.wrap_coroutine_function(name, getattr(self, name))
+                else:
+                    continue
+                setattr(self, name, wrapped)
+                self._profiled.append(name)
+        else:
+            for name in self._profiled:
+                delattr(self, name)
+            self._profiled.clear()
+        # The transport holds the callbacks it was given, so hand it the current ones.
+        self._transport.set_notification_callback(self._handle_notification)
+        self._transport.set_disconnected_callback(self._handle_disconnected)
+        _LOGGER.info(
+            "Profiling of bed %s %s", self._name, "started" if enabled else "stopped"
+        )
 
     async def async_diagnostics(self) -> Dict[str, Any]:
         """Get diagnostic information."""
-        if not self._connected:
-            raise RuntimeError("Device not connected")
-
         return {
             "name": self._name,
             "type": self._bed_type,
             "mac_address": self._mac_address,
             "device_name": self._device_name,
-            "connected": self._connected,
-            "head_position": self._head_position,
-            "feet_position": self._feet_position,
+            "connected": self._link_up,
+            "parked": self._parked,
+            "circuit_open": self._reconnect.is_open,
+            "reconnect_attempts": self._reconnect.attempts,
+            "rssi": self._transport.rssi,
+            "source": self._transport.source,
+            "authenticated": self._session.authenticated,
+            "authentications": self._session.authentications,
+            **self._state.as_dict(),
             "target_head_position": self._target_head_position,
             "target_feet_position": self._target_feet_position,
             "movement_in_progress": self._movement_in_progress,
-            "current_movement_type": self._current_movement_type,
-            "calibration_mode": self._calibration_mode,
-            "presets": list(self._presets.keys()),
+            "calibration": self._calibration.as_dict(),
+            "coalesced_commands": self._retargeted_commands
+            + sum(coalescer.coalesced for coalescer in self._coalescers.values())
+            + self._queue.superseded,
+            "queue_depth": self._queue.depth,
+            "dropped_commands": self._queue.dropped,
+            "metrics": self._metrics.as_dict(),
+            "movements_recorded": self._history.total,
+            "profile": self._profiler.as_dict() if self._profiler is not None else None,
         } 
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""Diagnostics support for the Bed Manager integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_STORED_PIN
+
+TO_REDACT = {CONF_STORED_PIN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics, including link metrics, for a config entry."""
+    device = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "device": await device.async_diagnostics(),
+        "movement_history": device.history.as_list(),
+    }
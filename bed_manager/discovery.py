@@ -0,0 +1,106 @@
+"""Bluetooth discovery of RC2 controllers for the Bed Manager integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Iterable
+
+from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
+from homeassistant.core import HomeAssistant
+
+from .connection_manager import SlotHolder, async_get_connection_manager
+from .const import RC2_LOCAL_NAME_PREFIX, RC2_SERVICE_UUID
+from .transport import BedConnectionError, BleakBedTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def advertises_rc2(service_info: BluetoothServiceInfoBleak) -> bool:
+    """Return True if the advertisement names the RC2 service."""
+    return RC2_SERVICE_UUID in service_info.service_uuids
+
+
+def is_rc2_candidate(service_info: BluetoothServiceInfoBleak) -> bool:
+    """Return True if an advertisement may come from an RC2 controller."""
+    return advertises_rc2(service_info) or (service_info.name or "").startswith(
+        RC2_LOCAL_NAME_PREFIX
+    )
+
+
+def rank_candidates(
+    service_infos: Iterable[BluetoothServiceInfoBleak], exclude: Iterable[str] = ()
+) -> dict[str, BluetoothServiceInfoBleak]:
+    """Return the RC2 candidates by address, strongest signal first.
+
+    When several adapters or proxies heard the same bed, the strongest
+    advertisement is kept.
+    """
+    excluded = set(exclude)
+    best: dict[str, BluetoothServiceInfoBleak] = {}
+    for service_info in service_infos:
+        if service_info.address in excluded or not is_rc2_candidate(service_info):
+            continue
+        current = best.get(service_info.address)
+        if current is None or service_info.rssi > current.rssi:
+            best[service_info.address] = service_info
+    return dict(
+        sorted(best.items(), key=lambda item: item[1].rssi, reverse=True)
+    )
+
+
+async def async_probe(
+    hass: HomeAssistant, service_info: BluetoothServiceInfoBleak, timeout: float
+) -> bool:
+    """Connect briefly to confirm that a device exposes the RC2 service.
+
+    The probe takes a connection slot on the device's adapter like any bed
+    does, and gives up after ``timeout`` seconds.
+    """
+    address = service_info.address
+    manager = async_get_connection_manager(hass)
+    transport = BleakBedTransport(hass, address, service_info.name or address)
+    holder = SlotHolder(f"probe_{address}", lambda: True, transport.async_disconnect)
+    try:
+        async with asyncio.timeout(timeout):
+            await manager.async_acquire(service_info.source, holder)
+            await transport.async_connect()
+    except (BedConnectionError, TimeoutError) as err:
+        _LOGGER.debug("%s is not a reachable RC2 controller: %s", address, err)
+        return False
+    finally:
+        manager.release(holder.key)
+        await transport.async_disconnect()
+    return True
+
+
+async def async_confirm_candidates(
+    hass: HomeAssistant,
+    candidates: dict[str, BluetoothServiceInfoBleak],
+    timeout: float,
+) -> dict[str, BluetoothServiceInfoBleak]:
+    """Drop the candidates that turn out not to be RC2 controllers.
+
+    Devices advertising the RC2 service are taken at their word; those only
+    matched by name are probed, all at once, so a room full of beds is
+    confirmed in a single timeout.
+    """
+    unconfirmed = [
+        service_info
+        for service_info in candidates.values()
+        if not advertises_rc2(service_info)
+    ]
+    if not unconfirmed:
+        return candidates
+    results = await asyncio.gather(
+        *(async_probe(hass, service_info, timeout) for service_info in unconfirmed)
+    )
+    rejected = {
+        service_info.address
+        for service_info, confirmed in zip(unconfirmed, results)
+        if not confirmed
+    }
+    return {
+        address: service_info
+        for address, service_info in candidates.items()
+        if address not in rejected
+    }
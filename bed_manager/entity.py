@@ -0,0 +1,39 @@
+"""Base entity for the Bed Manager integration."""
+from __future__ import annotations
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import BedManagerCoordinator
+
+
+class BedManagerEntity(CoordinatorEntity[BedManagerCoordinator]):
+    """An entity of a bed, updated through the bed's shared coordinator.
+
+    ``_state_fields`` names the fields of the bed state an entity shows; it
+    only writes its state when one of them or the availability changed.
+    None means the entity shows something else and writes on every update.
+    """
+
+    _attr_has_entity_name = True
+    _state_fields: frozenset[str] | None = None
+
+    def __init__(self, coordinator: BedManagerCoordinator, key: str) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator)
+        self.device = coordinator.device
+        self._attr_unique_id = f"{self.device.mac_address}_{key}"
+        self._attr_device_info = self.device.device_info
+
+    @property
+    def available(self) -> bool:
+        """Return True if the bed is reachable."""
+        return super().available and self.device.available
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state if the update touched what this entity shows."""
+        fields = self._state_fields
+        changes = self.coordinator.changes
+        if fields is None or "available" in changes or not fields.isdisjoint(changes):
+            super()._handle_coordinator_update()
@@ -0,0 +1,95 @@
+"""ESPHome native API transport for the Bed Manager integration."""
+from __future__ import annotations
+
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import ESPHOME_NOTIFICATION_EVENT, ESPHOME_WRITE_SERVICE
+from .transport import BedConnectionError, BedTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+ESPHOME_DOMAIN = "esphome"
+
+
+class EsphomeBedTransport(BedTransport):
+    """Link to a bed through an ESPHome node that relays RC2 frames.
+
+    The node exposes a ``bed_manager_write`` API service taking the bed
+    address and a hex frame, and fires ``esphome.bed_manager_notification``
+    events carrying the frames the bed pushes. Both travel over the API
+    connection Home Assistant already holds to the node, so the bed costs no
+    second API connection. The node still reaches the bed over its own
+    Bluetooth radio, which holds as few connections as a proxy, so beds
+    relayed by one node share its connection slots through ``source``.
+    """
+
+    def __init__(self, hass: HomeAssistant, address: str, node: str) -> None:
+        """Initialize the transport."""
+        self.hass = hass
+        self._address = address.upper()
+        self._node = node
+        # ESPHome prefixes the services of a node with its name.
+        self._service = f"{node.replace('-', '_')}_{ESPHOME_WRITE_SERVICE}"
+        self._unsub_events: CALLBACK_TYPE | None = None
+
+    @property
+    def is_connected(self) -> bool:
+        """Return True while the node's relay service is registered."""
+        return self._unsub_events is not None and self.hass.services.has_service(
+            ESPHOME_DOMAIN, self._service
+        )
+
+    @property
+    def source(self) -> str:
+        """Return the ESPHome node the bed is reached through."""
+        return f"esphome:{self._node}"
+
+    async def async_connect(self) -> None:
+        """Start listening to the node's notifications."""
+        if not self.hass.services.has_service(ESPHOME_DOMAIN, self._service):
+            raise BedConnectionError(
+                f"ESPHome node {self._node} is not connected or has no "
+                f"{ESPHOME_WRITE_SERVICE} service"
+            )
+        if self._unsub_events is None:
+            self._unsub_events = self.hass.bus.async_listen(
+                ESPHOME_NOTIFICATION_EVENT, self._on_event
+            )
+
+    async def async_disconnect(self) -> None:
+        """Stop listening to the node's notifications."""
+        if self._unsub_events is not None:
+            self._unsub_events()
+            self._unsub_events = None
+
+    async def async_write(self, data: bytes) -> None:
+        """Have the node write a frame to the bed."""
+        if not self.is_connected:
+            raise BedConnectionError(f"{self._node} is not relaying for {self._address}")
+        try:
+            await self.hass.services.async_call(
+                ESPHOME_DOMAIN,
+                self._service,
+                {"address": self._address, "frame": bytes(data).hex()},
+                blocking=True,
+            )
+        except HomeAssistantError as err:
+            raise BedConnectionError(
+                f"Write to {self._address} through {self._node} failed: {err}"
+            ) from err
+
+    @callback
+    def _on_event(self, event: Event) -> None:
+        """Hand a notification relayed for this bed to the device."""
+        if str(event.data.get("address", "")).upper() != self._address:
+            return
+        try:
+            frame = bytes.fromhex(event.data["frame"])
+        except (KeyError, TypeError, ValueError):
+            _LOGGER.debug("Malformed notification from %s: %s", self._node, event.data)
+            return
+        if self._notification_callback is not None:
+            self._notification_callback(frame)
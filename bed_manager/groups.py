@@ -0,0 +1,127 @@
+"""Bed groups for the Bed Manager integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, GROUP_SAVE_DELAY, GROUP_STORAGE_VERSION
+
+if TYPE_CHECKING:
+    from .device import BedManagerDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BedGroupStore:
+    """Named groups of beds, persisted once for the whole integration.
+
+    A group lists the config entries of its beds, so it survives entity and
+    device renames. Groups are read from disk on first use.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the group store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, GROUP_STORAGE_VERSION, f"{DOMAIN}.groups"
+        )
+        self._groups: dict[str, list[str]] | None = None
+        self._load_lock = asyncio.Lock()
+
+    async def async_load(self) -> None:
+        """Load the groups from disk unless they are loaded already."""
+        async with self._load_lock:
+            if self._groups is None:
+                data = await self._store.async_load()
+                self._groups = data.get("groups", {}) if data is not None else {}
+
+    @property
+    def names(self) -> list[str]:
+        """Return the group names."""
+        return list(self._groups or {})
+
+    def get(self, name: str) -> list[str]:
+        """Return the config entry ids of a group's beds."""
+        try:
+            return self._groups[name]
+        except (KeyError, TypeError) as err:
+            raise ValueError(f"Bed group {name} not found") from err
+
+    def set(self, name: str, entry_ids: list[str]) -> None:
+        """Add or replace a group."""
+        self._groups[name] = entry_ids
+        self._store.async_delay_save(self._data_to_save, GROUP_SAVE_DELAY)
+
+    def remove(self, name: str) -> None:
+        """Remove a group."""
+        if self._groups.pop(name, None) is None:
+            raise ValueError(f"Bed group {name} not found")
+        self._store.async_delay_save(self._data_to_save, GROUP_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"groups": self._groups}
+
+
+class StaggerGate:
+    """Space out the motor starts of beds on a shared circuit.
+
+    Each bed passes the gate once it is connected and ready to move. The
+    gate lets one bed through per ``interval`` seconds in the order they
+    arrive, so a bed that connects late never starts right on top of
+    another one.
+    """
+
+    def __init__(self, interval: float) -> None:
+        """Initialize the gate."""
+        self._interval = interval
+        self._next = 0.0
+
+    async def async_pass(self) -> None:
+        """Wait for this bed's turn to start."""
+        if self._interval <= 0:
+            return
+        now = asyncio.get_running_loop().time()
+        turn = max(now, self._next)
+        self._next = turn + self._interval
+        if turn > now:
+            await asyncio.sleep(turn - now)
+
+
+async def async_run_group(
+    devices: list[BedManagerDevice],
+    command: Callable[[BedManagerDevice], Awaitable[None]],
+    stagger: float = 0.0,
+) -> list[dict[str, Any]]:
+    """Run a command on every bed of a group at once and report per bed.
+
+    All beds connect concurrently, so connection setup over separate radio
+    links overlaps; only the commands themselves pass the stagger gate.
+    A failing bed does not stop the others. ``started`` is when a bed passed
+    the gate, relative to the call, and ``duration`` how long it took from
+    there, or from the call if it never got that far.
+    """
+    loop = asyncio.get_running_loop()
+    gate = StaggerGate(stagger)
+    started = loop.time()
+
+    async def run(device: BedManagerDevice) -> dict[str, Any]:
+        result: dict[str, Any] = {"bed": device.name, "success": True}
+        began = started
+        try:
+            await device.async_connect()
+            await gate.async_pass()
+            began = loop.time()
+            result["started"] = round(began - started, 3)
+            await command(device)
+        except Exception as err:
+            _LOGGER.warning("Group command failed for bed %s: %s", device.name, err)
+            result["success"] = False
+            result["error"] = str(err)
+        result["duration"] = round(loop.time() - began, 3)
+        return result
+
+    return list(await asyncio.gather(*(run(device) for device in devices)))
@@ -0,0 +1,107 @@
+"""Movement history for the Bed Manager integration."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+from typing import Any, NamedTuple
+
+from .const import AXIS_FEET, AXIS_HEAD
+
+_AXES = (AXIS_HEAD, AXIS_FEET)
+_AXIS_CODES = {axis: code for code, axis in enumerate(_AXES)}
+
+
+class MovementRecord(NamedTuple):
+    """One completed movement of one axis."""
+
+    timestamp: float
+    axis: str
+    movement_type: int
+    start_position: float
+    end_position: float
+    duration: float
+    confirmed: bool
+
+    @property
+    def moving_up(self) -> bool:
+        """Return True if the axis was raised; odd MOVEMENT_TYPES go up."""
+        return self.movement_type % 2 == 1
+
+
+class MovementHistory:
+    """Ring buffer of the most recent movements.
+
+    Each field lives in its own preallocated ``array`` column, so appending
+    overwrites a slot in place without allocating and the memory use is
+    fixed by the capacity. Records are only materialised when read.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize the history."""
+        self._capacity = capacity
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._axes = array("B", bytes(capacity))
+        self._movement_types = array("B", bytes(capacity))
+        self._start_positions = array("f", bytes(4 * capacity))
+        self._end_positions = array("f", bytes(4 * capacity))
+        self._durations = array("f", bytes(4 * capacity))
+        self._confirmed = array("B", bytes(capacity))
+        self._next = 0
+        self._size = 0
+        self.total = 0
+
+    def __len__(self) -> int:
+        """Return the number of movements held."""
+        return self._size
+
+    def append(
+        self,
+        timestamp: float,
+        axis: str,
+        movement_type: int,
+        start_position: float,
+        end_position: float,
+        duration: float,
+        confirmed: bool = False,
+    ) -> int:
+        """Record a movement, overwriting the oldest when full, and return its slot."""
+        index = self._next
+        self._timestamps[index] = timestamp
+        self._axes[index] = _AXIS_CODES[axis]
+        self._movement_types[index] = movement_type
+        self._start_positions[index] = start_position
+        self._end_positions[index] = end_position
+        self._durations[index] = duration
+        self._confirmed[index] = confirmed
+        self._next = (index + 1) % self._capacity
+        self._size = min(self._size + 1, self._capacity)
+        self.total += 1
+        return index
+
+    def record(self, index: int) -> MovementRecord:
+        """Return the movement held in a slot."""
+        return MovementRecord(
+            self._timestamps[index],
+            _AXES[self._axes[index]],
+            self._movement_types[index],
+            self._start_positions[index],
+            self._end_positions[index],
+            self._durations[index],
+            bool(self._confirmed[index]),
+        )
+
+    def confirm(self, index: int, end_position: float) -> MovementRecord:
+        """Replace the estimated end position with one the bed reported."""
+        self._end_positions[index] = end_position
+        self._confirmed[index] = True
+        return self.record(index)
+
+    def __iter__(self) -> Iterator[MovementRecord]:
+        """Yield the movements from oldest to newest."""
+        start = (self._next - self._size) % self._capacity
+        for offset in range(self._size):
+            yield self.record((start + offset) % self._capacity)
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the history for diagnostics."""
+        return [record._asdict() for record in self]
@@ -0,0 +1,88 @@
+"""Latency and link-health metrics for the Bed Manager integration."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+# Upper bucket bounds in milliseconds; the last bucket takes everything above.
+LATENCY_BUCKETS_MS: tuple[float, ...] = (
+    5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000,
+)
+
+
+class LatencyHistogram:
+    """Fixed-size latency histogram.
+
+    Samples are only counted into buckets, so recording is O(log buckets)
+    and memory stays constant however long the bed runs.
+    """
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        """Initialize the histogram."""
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self._total = 0.0
+        self._min = float("inf")
+        self._max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Count one sample."""
+        milliseconds = seconds * 1000
+        self._counts[bisect_left(self._bounds, milliseconds)] += 1
+        self.count += 1
+        self._total += milliseconds
+        self._min = min(self._min, milliseconds)
+        self._max = max(self._max, milliseconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the upper bound of the bucket holding a percentile, in ms."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank and count:
+                bound = self._bounds[index] if index < len(self._bounds) else self._max
+                return min(bound, self._max)
+        return self._max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for diagnostics."""
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "min_ms": round(self._min, 1),
+            "mean_ms": round(self._total / self.count, 1),
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self._max, 1),
+            "buckets": {
+                f"<={bound:g}ms": count
+                for bound, count in zip(self._bounds, self._counts)
+                if count
+            }
+            | ({f">{self._bounds[-1]:g}ms": self._counts[-1]} if self._counts[-1] else {}),
+        }
+
+
+class BedMetrics:
+    """Instrumentation of one bed's link and command path."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.connect = LatencyHistogram()
+        self.queue_to_write = LatencyHistogram()
+        self.write_to_ack = LatencyHistogram()
+        self.disconnects = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {
+            "connect": self.connect.as_dict(),
+            "queue_to_write": self.queue_to_write.as_dict(),
+            "write_to_ack": self.write_to_ack.as_dict(),
+            "disconnects": self.disconnects,
+        }
@@ -0,0 +1,108 @@
+"""MQTT transport for the Bed Manager integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from homeassistant.components import mqtt
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import MQTT_BATCH_WINDOW
+from .protocol import MOTION_FRAMES
+from .transport import BedConnectionError, BedTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MqttBedTransport(BedTransport):
+    """Link to a bed through an MQTT bridge placed next to it.
+
+    The bridge relays frames published to ``<prefix>/<bed>/command`` to the
+    bed and publishes what the bed pushes to ``<prefix>/<bed>/state`` with
+    the retain flag, so the last status arrives the moment the topic is
+    subscribed and the bed has a position right after a restart.
+
+    Frames written within ``MQTT_BATCH_WINDOW`` of each other go out in one
+    publish. A movement or stop frame replaces one still waiting in the
+    batch, since the bed would only act on the last anyway.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        address: str,
+        prefix: str,
+        batch_window: float = MQTT_BATCH_WINDOW,
+    ) -> None:
+        """Initialize the transport."""
+        self.hass = hass
+        self._address = address
+        base = f"{prefix}/{address.replace(':', '').lower()}"
+        self._command_topic = f"{base}/command"
+        self._state_topic = f"{base}/state"
+        self._batch_window = batch_window
+        self._unsubscribe: CALLBACK_TYPE | None = None
+        self._pending: list[bytes] = []
+        self._flush: asyncio.Task[None] | None = None
+        self.publishes = 0
+
+    @property
+    def is_connected(self) -> bool:
+        """Return True while the state topic is subscribed."""
+        return self._unsubscribe is not None
+
+    @property
+    def source(self) -> str:
+        """Return the bridge topic; each bridge has its own radio."""
+        return f"mqtt:{self._command_topic.rpartition('/')[0]}"
+
+    async def async_connect(self) -> None:
+        """Subscribe to the bed's state, receiving its retained status."""
+        if self._unsubscribe is not None:
+            return
+        if not await mqtt.async_wait_for_mqtt_client(self.hass):
+            raise BedConnectionError("MQTT is not connected")
+        self._unsubscribe = await mqtt.async_subscribe(
+            self.hass, self._state_topic, self._on_message, encoding=None
+        )
+
+    async def async_disconnect(self) -> None:
+        """Unsubscribe from the bed's state."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    async def async_write(self, data: bytes) -> None:
+        """Queue a frame for the next publish and wait until it is sent."""
+        if not self.is_connected:
+            raise BedConnectionError(f"Not subscribed to {self._state_topic}")
+        frame = bytes(data)
+        if frame in MOTION_FRAMES:
+            self._pending = [pending for pending in self._pending if pending not in MOTION_FRAMES]
+        if frame not in self._pending:
+            self._pending.append(frame)
+        if self._flush is None:
+            self._flush = self.hass.async_create_task(self._async_flush())
+        await asyncio.shield(self._flush)
+
+    async def _async_flush(self) -> None:
+        """Publish the frames gathered during the batch window."""
+        await asyncio.sleep(self._batch_window)
+        frames, self._pending = self._pending, []
+        self._flush = None
+        try:
+            await mqtt.async_publish(
+                self.hass, self._command_topic, b"".join(frames), qos=0, encoding=None
+            )
+        except HomeAssistantError as err:
+            raise BedConnectionError(
+                f"Publish to {self._command_topic} failed: {err}"
+            ) from err
+        self.publishes += 1
+
+    @callback
+    def _on_message(self, msg: mqtt.ReceiveMessage) -> None:
+        """Hand a state message from the bridge to the device."""
+        if self._notification_callback is not None:
+            self._notification_callback(msg.payload)
@@ -0,0 +1,84 @@
+"""Position estimation for the Bed Manager integration."""
+from __future__ import annotations
+
+
+class AxisEstimator:
+    """Dead-reckoning position model for one bed section.
+
+    Between status reports from the controller the position is integrated
+    from the time the motor has been running. Start latency is the
+    delay between writing a movement command and the motor turning; stop
+    latency is how long it keeps coasting after the stop command.
+    """
+
+    def __init__(
+        self,
+        travel_up: float,
+        travel_down: float,
+        start_latency: float,
+        stop_latency: float,
+    ) -> None:
+        """Initialize the estimator; all times are in seconds."""
+        self.travel_up = travel_up
+        self.travel_down = travel_down
+        self.start_latency = start_latency
+        self.stop_latency = stop_latency
+        self._position = 0.0
+        self._origin = 0.0
+        self._moving_up: bool | None = None
+        self._motion_start = 0.0
+
+    @property
+    def moving(self) -> bool:
+        """Return True while the motor is running."""
+        return self._moving_up is not None
+
+    @property
+    def position(self) -> float:
+        """Return the position the axis last settled at."""
+        return self._position
+
+    @position.setter
+    def position(self, position: float) -> None:
+        """Set the position of an axis that is not moving."""
+        self._position = min(max(position, 0.0), 100.0)
+
+    def _rate(self, moving_up: bool) -> float:
+        """Return the travel speed in % per second, signed by direction."""
+        return 100 / self.travel_up if moving_up else -100 / self.travel_down
+
+    def start(self, moving_up: bool, now: float) -> None:
+        """Record that a movement command was written at ``now``."""
+        self._origin = self._position
+        self._moving_up = moving_up
+        self._motion_start = now + self.start_latency
+
+    def position_at(self, now: float) -> float:
+        """Return the estimated position at a loop time."""
+        if self._moving_up is None:
+            return self._position
+        elapsed = max(now - self._motion_start, 0.0)
+        position = self._origin + elapsed * self._rate(self._moving_up)
+        return min(max(position, 0.0), 100.0)
+
+    def correct(self, position: float, now: float) -> None:
+        """Re-anchor the estimate on a position reported by the bed."""
+        if self._moving_up is None:
+            self.position = position
+        else:
+            self._origin = min(max(position, 0.0), 100.0)
+            self._motion_start = max(now, self._motion_start)
+
+    def stop_deadline(self, target: float) -> float:
+        """Return the loop time at which to write stop to settle at the target."""
+        if self._moving_up is None:
+            return self._motion_start
+        distance = (target - self._origin) / self._rate(self._moving_up)
+        return self._motion_start + max(distance, 0.0) - self.stop_latency
+
+    def stop(self, now: float) -> float:
+        """Record that stop was written at ``now`` and return the final position."""
+        if self._moving_up is not None:
+            self._position = self.position_at(now + self.stop_latency)
+            self._moving_up = None
+        return self._position
@@ -0,0 +1,55 @@
+"""Preset storage for the Bed Manager integration."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, PRESET_SAVE_DELAY, PRESET_STORAGE_VERSION
+
+
+class PresetStore:
+    """Named bed presets, kept in memory and persisted per entry.
+
+    Presets are read from disk once when the entry loads. Changes are written
+    back with a delayed save, so saving several presets in a row results in a
+    single write.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the preset store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, PRESET_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.presets"
+        )
+        self._presets: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Load presets from disk."""
+        if (data := await self._store.async_load()) is not None:
+            self._presets = data.get("presets", {})
+
+    @property
+    def names(self) -> list[str]:
+        """Return the preset names in the order they were saved."""
+        return list(self._presets)
+
+    def get(self, name: str) -> dict[str, Any]:
+        """Return a preset."""
+        try:
+            return self._presets[name]
+        except KeyError as err:
+            raise ValueError(f"Preset {name} not found") from err
+
+    def set(self, name: str, preset: dict[str, Any]) -> None:
+        """Add or replace a preset."""
+        self._presets[name] = preset
+        self._store.async_delay_save(self._data_to_save, PRESET_SAVE_DELAY)
+
+    def remove(self, name: str) -> None:
+        """Remove a preset."""
+        if self._presets.pop(name, None) is not None:
+            self._store.async_delay_save(self._data_to_save, PRESET_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"presets": self._presets}
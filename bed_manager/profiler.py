@@ -0,0 +1,178 @@
+"""Event loop profiling for the Bed Manager integration.
+
+Everything a bed does runs on Home Assistant's event loop, so any code that
+runs for long between two awaits stalls every other integration. The
+profiler times each synchronous segment of the device's coroutines (each
+step from one resume to the next suspension) and of its callbacks, and
+flags the ones over a threshold. It is off unless switched on for a bed.
+"""
+from __future__ import annotations
+
+import logging
+import time
+import types
+from collections import deque
+from collections.abc import Awaitable, Callable, Coroutine, Generator
+from dataclasses import dataclass
+from functools import partial, wraps
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LazyHex:
+    """Format bytes as hex only if a log record is actually emitted."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: bytes | bytearray | memoryview) -> None:
+        self._data = data
+
+    def __str__(self) -> str:
+        return bytes(self._data).hex()
+
+
+class SampledLogger:
+    """Debug logging for hot paths, keeping one record out of every ``every``.
+
+    The level check comes first, so with debug logging off a call costs one
+    comparison; arguments are only formatted for the records that are kept.
+    """
+
+    def __init__(self, logger: logging.Logger, every: int) -> None:
+        """Initialize the logger."""
+        self._logger = logger
+        self._every = every
+        self._count = 0
+
+    def debug(self, msg: str, *args: Any) -> None:
+        """Log one debug message out of every ``every``."""
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return
+        if not self._count % self._every:
+            self._logger.debug(f"{msg} (1 of {self._every})", *args)
+        self._count += 1
+
+
+@dataclass
+class StepStats:
+    """Timing of the synchronous segments of one operation."""
+
+    steps: int = 0
+    total: float = 0.0
+    slowest: float = 0.0
+    slow: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the stats in milliseconds."""
+        return {
+            "steps": self.steps,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.total / self.steps * 1000, 3) if self.steps else None,
+            "slowest_ms": round(self.slowest * 1000, 3),
+            "slow": self.slow,
+        }
+
+
+@types.coroutine
+def _timed_steps(
+    coro: Coroutine[Any, Any, Any], record: Callable[[float], None]
+) -> Generator[Any, Any, Any]:
+    """Drive a coroutine, timing every step it runs without suspending."""
+    value: Any = None
+    error: BaseException | None = None
+    while True:
+        start = time.perf_counter()
+        try:
+            if error is None:
+                yielded = coro.send(value)
+            else:
+                yielded = coro.throw(error)
+        except StopIteration as stop:
+            record(time.perf_counter() - start)
+            return stop.value
+        except BaseException:
+            record(time.perf_counter() - start)
+            raise
+        record(time.perf_counter() - start)
+        try:
+            value, error = (yield yielded), None
+        except GeneratorExit:
+            coro.close()
+            raise
+        except BaseException as err:
+            value, error = None, err
+
+
+class LoopProfiler:
+    """Time the event loop segments of a bed's coroutines and callbacks."""
+
+    def __init__(self, name: str, threshold: float, keep: int = 20) -> None:
+        """Initialize the profiler; ``threshold`` is in seconds."""
+        self._name = name
+        self.threshold = threshold
+        self.stats: dict[str, StepStats] = {}
+        self.slow_segments: deque[dict[str, Any]] = deque(maxlen=keep)
+
+    def record(self, operation: str, duration: float) -> None:
+        """Record one synchronous segment of an operation."""
+        stats = self.stats.get(operation)
+        if stats is None:
+            stats = self.stats[operation] = StepStats()
+        stats.steps += 1
+        stats.total += duration
+        if duration > stats.slowest:
+            stats.slowest = duration
+        if duration > self.threshold:
+            stats.slow += 1
+            self.slow_segments.append(
+                {
+                    "operation": operation,
+                    "duration_ms": round(duration * 1000, 3),
+                    "at": time.time(),
+                }
+            )
+            _LOGGER.warning(
+                "%s of bed %s blocked the event loop for %.1f ms",
+                operation,
+                self._name,
+                duration * 1000,
+            )
+
+    def wrap_coroutine_function(
+        self, operation: str, func: Callable[..., Awaitable[Any]]
+    ) -> Callable[..., Awaitable[Any]]:
+        """Return a coroutine function whose steps are timed."""
+        record = partial(self.record, operation)
+
+        @wraps(func)
+        async def profiled(*args: Any, **kwargs: Any) -> Any:
+            return await _timed_steps(func(*args, **kwargs), record)
+
+        return profiled
+
+    def wrap_function(self, operation: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Return a function whose calls are timed."""
+
+        @wraps(func)
+        def profiled(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(operation, time.perf_counter() - start)
+
+        return profiled
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the results, slowest operations first."""
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "operations": {
+                operation: stats.as_dict()
+                for operation, stats in sorted(
+                    self.stats.items(), key=lambda item: item[1].slowest, reverse=True
+                )
+            },
+            "slow_segments": list(self.slow_segments),
+        }
@@ -0,0 +1,178 @@
+"""Octo RC2 command frames for the Bed Manager integration.
+
+Frames that never change are built once at import time. Variable frames can
+be built into a caller's buffer, and notifications are decoded through
+memoryviews, so the keep-alive and status traffic does not allocate per frame.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from functools import lru_cache
+from typing import NamedTuple
+
+from .const import (
+    RC2_CMD_MOVE_DOWN,
+    RC2_CMD_MOVE_UP,
+    RC2_CMD_PIN,
+    RC2_CMD_STATUS,
+    RC2_CMD_STOP,
+    RC2_FRAME_DELIMITER,
+    RC2_MOTOR_BOTH,
+    RC2_MOTOR_FEET,
+    RC2_MOTOR_HEAD,
+)
+
+# delimiter, command (2), length (2), checksum, data..., delimiter
+FRAME_OVERHEAD = 7
+_STATUS_FRAME_SIZE = FRAME_OVERHEAD + 3
+
+# movement type -> (command, motor bits)
+_MOVEMENTS: dict[int, tuple[tuple[int, int], int]] = {
+    1: (RC2_CMD_MOVE_UP, RC2_MOTOR_HEAD),
+    2: (RC2_CMD_MOVE_DOWN, RC2_MOTOR_HEAD),
+    3: (RC2_CMD_MOVE_UP, RC2_MOTOR_FEET),
+    4: (RC2_CMD_MOVE_DOWN, RC2_MOTOR_FEET),
+    5: (RC2_CMD_MOVE_UP, RC2_MOTOR_BOTH),
+    6: (RC2_CMD_MOVE_DOWN, RC2_MOTOR_BOTH),
+}
+
+
+def checksum(payload: Sequence[int]) -> int:
+    """Return the byte that makes the payload sum to zero modulo 256."""
+    return -sum(payload) & 0xFF
+
+
+def build_frame_into(
+    buffer: bytearray, command: Sequence[int], data: Sequence[int] = ()
+) -> memoryview:
+    """Build a delimited RC2 frame at the start of a buffer and return a view of it.
+
+    The buffer must hold at least ``FRAME_OVERHEAD + len(data)`` bytes. Each
+    byte is written straight into it and the checksum is summed on the way,
+    so nothing is allocated apart from the returned view.
+    """
+    length = len(data)
+    end = FRAME_OVERHEAD + length
+    if len(buffer) < end:
+        raise ValueError(f"Buffer too small for a {end} byte frame")
+    high = length >> 8 & 0xFF
+    low = length & 0xFF
+    buffer[0] = RC2_FRAME_DELIMITER
+    buffer[1] = command[0]
+    buffer[2] = command[1]
+    buffer[3] = high
+    buffer[4] = low
+    total = command[0] + command[1] + high + low
+    offset = 6
+    for value in data:
+        buffer[offset] = value
+        total += value
+        offset += 1
+    buffer[5] = -total & 0xFF
+    buffer[end - 1] = RC2_FRAME_DELIMITER
+    return memoryview(buffer)[:end]
+
+
+def build_frame(command: Sequence[int], data: Sequence[int] = ()) -> bytes:
+    """Build a delimited RC2 frame."""
+    buffer = bytearray(FRAME_OVERHEAD + len(data))
+    build_frame_into(buffer, command, data)
+    return bytes(buffer)
+
+
+STOP_FRAME = build_frame(RC2_CMD_STOP)
+_MOVEMENT_FRAMES: dict[int, bytes] = {
+    0: STOP_FRAME,
+    **{
+        movement_type: build_frame(command, (motors,))
+        for movement_type, (command, motors) in _MOVEMENTS.items()
+    },
+}
+# Frames that set what the motors do; a later one overrides an earlier one.
+MOTION_FRAMES: frozenset[bytes] = frozenset(_MOVEMENT_FRAMES.values())
+
+
+def movement_frame(movement_type: int) -> bytes:
+    """Return the frame for one of the MOVEMENT_TYPES."""
+    try:
+        return _MOVEMENT_FRAMES[movement_type]
+    except KeyError as err:
+        raise ValueError(f"Unknown movement type {movement_type}") from err
+
+
+def stop_frame() -> bytes:
+    """Return the frame that stops all motors."""
+    return STOP_FRAME
+
+
+@lru_cache(maxsize=32)
+def pin_frame(pin: str) -> bytes:
+    """Return the PIN frame, which also serves as the keep-alive.
+
+    A bed's PIN never changes, so each frame is built once and reused for
+    every keep-alive.
+    """
+    if not pin.isdigit():
+        raise ValueError("PIN must only contain digits")
+    return build_frame(RC2_CMD_PIN, [int(digit) for digit in pin])
+
+
+class Status(NamedTuple):
+    """A status report from the bed."""
+
+    head_position: int
+    feet_position: int
+    movement_type: int
+
+
+def iter_frames(payload: bytes | bytearray) -> Iterator[tuple[tuple[int, int], memoryview]]:
+    """Yield the command and data of each valid frame in a notification.
+
+    The data are views into the payload. Bytes that do not start a valid
+    frame are skipped, so a corrupt frame does not hide the ones after it.
+    """
+    view = memoryview(payload)
+    size = len(view)
+    offset = 0
+    while size - offset >= FRAME_OVERHEAD:
+        if view[offset] == RC2_FRAME_DELIMITER:
+            end = offset + FRAME_OVERHEAD + (view[offset + 3] << 8 | view[offset + 4])
+            if (
+                end <= size
+                and view[end - 1] == RC2_FRAME_DELIMITER
+                and not sum(view[offset + 1 : end - 1]) & 0xFF
+            ):
+                yield (view[offset + 1], view[offset + 2]), view[offset + 6 : end - 1]
+                offset = end
+                continue
+        offset += 1
+
+
+def decode_frame(frame: bytes | bytearray) -> tuple[tuple[int, int], memoryview] | None:
+    """Split a frame into command and data, or return None if it is invalid."""
+    if (
+        len(frame) < FRAME_OVERHEAD
+        or frame[0] != RC2_FRAME_DELIMITER
+        or frame[-1] != RC2_FRAME_DELIMITER
+        or len(frame) != FRAME_OVERHEAD + (frame[3] << 8 | frame[4])
+    ):
+        return None
+    view = memoryview(frame)
+    if sum(view[1:-1]) & 0xFF:
+        return None
+    return (frame[1], frame[2]), view[6:-1]
+
+
+def decode_status(payload: bytes | bytearray) -> Status | None:
+    """Return the latest status report in a notification, if it carries one."""
+    if len(payload) == _STATUS_FRAME_SIZE:
+        # The common case: the notification is exactly one status frame.
+        decoded = decode_frame(payload)
+        if decoded is not None:
+            command, data = decoded
+            return Status(*data) if command == RC2_CMD_STATUS else None
+    status = None
+    for command, data in iter_frames(payload):
+        if command == RC2_CMD_STATUS and len(data) == 3:
+            status = Status(*data)
+    return status
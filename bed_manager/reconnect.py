@@ -0,0 +1,150 @@
+"""Automatic reconnects for the Bed Manager integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import random
+from collections.abc import Awaitable, Callable
+
+from homeassistant.core import HomeAssistant, callback
+
+from .transport import BedConnectionError
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BedUnavailableError(BedConnectionError):
+    """Raised without trying to connect while a bed is known to be down."""
+
+
+class ReconnectEngine:
+    """Reconnect one bed in the background, behind a circuit breaker.
+
+    After ``threshold`` failed connects in a row the breaker opens and
+    commands fail fast instead of each waiting out a connect timeout. Retries
+    back off exponentially with jitter, so beds that dropped together do not
+    all hit their proxy again at the same moment. An advertisement from the
+    bed brings the next retry forward, but never closer than ``base_delay``
+    to the last failed connect.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        connect: Callable[[], Awaitable[None]],
+        *,
+        base_delay: float,
+        max_delay: float,
+        threshold: int,
+    ) -> None:
+        """Initialize the engine."""
+        self.hass = hass
+        self._name = name
+        self._connect = connect
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._threshold = threshold
+        self._failures = 0
+        self._handle: asyncio.TimerHandle | None = None
+        self._task: asyncio.Task | None = None
+        self._retry_at: float | None = None
+        self._last_failure = -math.inf
+        self.attempts = 0
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while commands fail fast."""
+        return self._failures >= self._threshold
+
+    def check(self) -> None:
+        """Raise if the breaker is open, unless a retry is being made."""
+        if self.is_open and self._task is None:
+            retry = ""
+            if self._retry_at is not None:
+                delay = max(self._retry_at - asyncio.get_running_loop().time(), 0)
+                retry = f", retrying in {delay:.0f}s"
+            raise BedUnavailableError(f"Bed {self._name} is unreachable{retry}")
+
+    def delay(self) -> float:
+        """Return the wait before the next retry, with equal jitter."""
+        ceiling = min(self._max_delay, self._base_delay * 2 ** min(self._failures, 30))
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+    @callback
+    def record_success(self) -> None:
+        """Close the breaker after a successful connect."""
+        self._failures = 0
+        self._cancel_timer()
+
+    @callback
+    def record_failure(self) -> None:
+        """Count a failed connect and schedule a retry."""
+        self._failures += 1
+        self._last_failure = asyncio.get_running_loop().time()
+        self.async_schedule()
+
+    @callback
+    def async_schedule(self) -> None:
+        """Schedule a retry unless one is pending or running."""
+        if self._handle is not None or self._task is not None:
+            return
+        loop = asyncio.get_running_loop()
+        delay = self.delay()
+        self._retry_at = loop.time() + delay
+        self._handle = loop.call_at(self._retry_at, self._async_attempt)
+        _LOGGER.debug("Reconnecting to bed %s in %.1fs", self._name, delay)
+
+    @callback
+    def async_advertised(self) -> None:
+        """Bring the pending retry forward because the bed was heard again.
+
+        The retry runs at once, or ``base_delay`` after the last failed
+        connect if that was more recent, so a bed that advertises many times
+        a second but cannot be connected is not retried on every one.
+        """
+        if self._handle is None:
+            return
+        loop = asyncio.get_running_loop()
+        retry_at = max(loop.time(), self._last_failure + self._base_delay)
+        if retry_at >= self._retry_at:
+            return
+        self._handle.cancel()
+        self._retry_at = retry_at
+        self._handle = loop.call_at(retry_at, self._async_attempt)
+
+    @callback
+    def cancel(self) -> None:
+        """Stop reconnecting."""
+        self._cancel_timer()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _cancel_timer(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._retry_at = None
+
+    @callback
+    def _async_attempt(self) -> None:
+        self._handle = None
+        self._retry_at = None
+        self._task = self.hass.async_create_task(self._async_reconnect())
+
+    async def _async_reconnect(self) -> None:
+        self.attempts += 1
+        try:
+            await self._connect()
+        except BedConnectionError as err:
+            _LOGGER.debug("Reconnect to bed %s failed: %s", self._name, err)
+            failed = True
+        else:
+            failed = False
+            _LOGGER.info("Reconnected to bed %s", self._name)
+        finally:
+            self._task = None
+        if failed:
+            self.async_schedule()
@@ -0,0 +1,43 @@
+"""Select platform for the Bed Manager integration."""
+from __future__ import annotations
+
+from homeassistant.components.select import SelectEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DATA_COORDINATORS
+from .coordinator import BedManagerCoordinator
+from .entity import BedManagerEntity
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up the preset select of a bed."""
+    coordinator: BedManagerCoordinator = hass.data[DATA_COORDINATORS][entry.entry_id]
+    async_add_entities([BedPresetSelect(coordinator)])
+
+
+class BedPresetSelect(BedManagerEntity, SelectEntity):
+    """Recalls a saved preset."""
+
+    _attr_name = "Preset"
+    _attr_icon = "mdi:bed"
+    _state_fields = frozenset({"presets"})
+
+    def __init__(self, coordinator: BedManagerCoordinator) -> None:
+        """Initialize the select."""
+        super().__init__(coordinator, "preset")
+        self._attr_current_option = None
+
+    @property
+    def options(self) -> list[str]:
+        """Return the saved presets."""
+        return list(self.coordinator.data.presets)
+
+    async def async_select_option(self, option: str) -> None:
+        """Recall a preset, showing it once the bed has reached it."""
+        await self.device.async_load_preset(option)
+        self._attr_current_option = option
+        self.async_write_ha_state()
@@ -0,0 +1,112 @@
+"""Sensor platform for the Bed Manager integration."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+    EntityCategory,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DATA_COORDINATORS
+from .coordinator import BedManagerCoordinator
+from .entity import BedManagerEntity
+from .state import BedState
+
+
+@dataclass(frozen=True)
+class BedSensorEntityDescription(SensorEntityDescription):
+    """Describes a bed link-health sensor."""
+
+    value_fn: Callable[[BedState], float | int | None] | None = None
+
+
+# Diagnostic sensors are disabled by default; enable them to chart a slow bed.
+SENSORS: tuple[BedSensorEntityDescription, ...] = (
+    BedSensorEntityDescription(
+        key="rssi",
+        name="Signal strength",
+        device_class=SensorDeviceClass.SIGNAL_STRENGTH,
+        native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda state: state.rssi,
+    ),
+    BedSensorEntityDescription(
+        key="connect_time",
+        name="Connect time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda state: state.connect_time,
+    ),
+    BedSensorEntityDescription(
+        key="command_latency",
+        name="Command latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda state: state.command_latency,
+    ),
+    BedSensorEntityDescription(
+        key="response_latency",
+        name="Response latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda state: state.response_latency,
+    ),
+    BedSensorEntityDescription(
+        key="reconnects",
+        name="Reconnect attempts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda state: state.reconnects,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up the link-health sensors of a bed."""
+    coordinator: BedManagerCoordinator = hass.data[DATA_COORDINATORS][entry.entry_id]
+    async_add_entities(BedSensor(coordinator, description) for description in SENSORS)
+
+
+class BedSensor(BedManagerEntity, SensorEntity):
+    """A link-health measurement of a bed."""
+
+    entity_description: BedSensorEntityDescription
+
+    def __init__(
+        self, coordinator: BedManagerCoordinator, description: BedSensorEntityDescription
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, description.key)
+        self.entity_description = description
+        self._state_fields = frozenset({description.key})
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the measurement."""
+        return self.entity_description.value_fn(self.coordinator.data)
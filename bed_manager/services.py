@@ -1,65 +1,448 @@
 """Services for the Bed Manager integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any
+from collections.abc import Awaitable, Callable, Iterable
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
-from homeassistant.core import HomeAssistant, ServiceCall
+import voluptuous as vol
+
+from homeassistant.const import (
+    ATTR_AREA_ID,
+    ATTR_DEVICE_ID,
+    ATTR_ENTITY_ID,
+    ENTITY_MATCH_ALL,
+)
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
 
 from .const import (
     DOMAIN,
+    DATA_ENTITY_INDEX,
+    SERVICE_SET_HEAD_POSITION,
+    SERVICE_SET_FEET_POSITION,
+    SERVICE_SET_BED_POSITION,
+    SERVICE_SAVE_PRESET,
+    SERVICE_DELETE_PRESET,
+    SERVICE_CALIBRATE,
+    SERVICE_DIAGNOSTICS,
+    SERVICE_SAVE_GROUP,
+    SERVICE_DELETE_GROUP,
+    SERVICE_SET_GROUP_POSITION,
+    SERVICE_LOAD_GROUP_PRESET,
+    SERVICE_STOP_GROUP,
+    SERVICE_PROFILE,
     ATTR_POSITION,
+    ATTR_HEAD_POSITION,
+    ATTR_FEET_POSITION,
     ATTR_CALIBRATION_MODE,
+    ATTR_GROUP,
+    ATTR_PRESET,
+    ATTR_STAGGER,
+    ATTR_ENABLED,
+    DATA_GROUPS,
+    GROUP_MAX_STAGGER,
 )
+from .groups import BedGroupStore, async_run_group
+
+if TYPE_CHECKING:
+    from .device import BedManagerDevice
 
 _LOGGER = logging.getLogger(__name__)
 
-async def async_set_head_position(hass: HomeAssistant, call: ServiceCall) -> None:
-    """Set the head position of a bed."""
-    entity_id = call.data["entity_id"]
-    registry = er.async_get(hass)
-    entity = registry.async_get(entity_id)
-    
-    if not entity or entity.platform != DOMAIN:
-        raise ValueError(f"Entity {entity_id} not found or not a bed")
+POSITION = vol.All(vol.Coerce(float), vol.Range(min=0, max=100))
+
+SET_POSITION_SCHEMA = cv.make_entity_service_schema(
+    {vol.Required(ATTR_POSITION): POSITION}
+)
+SET_BED_POSITION_SCHEMA = vol.All(
+    cv.make_entity_service_schema(
+        {
+            vol.Optional(ATTR_HEAD_POSITION): POSITION,
+            vol.Optional(ATTR_FEET_POSITION): POSITION,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_HEAD_POSITION, ATTR_FEET_POSITION),
+)
+SAVE_PRESET_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Required(ATTR_PRESET): cv.string,
+        vol.Optional(ATTR_HEAD_POSITION): POSITION,
+        vol.Optional(ATTR_FEET_POSITION): POSITION,
+    }
+)
+DELETE_PRESET_SCHEMA = cv.make_entity_service_schema({vol.Required(ATTR_PRESET): cv.string})
+CALIBRATE_SCHEMA = cv.make_entity_service_schema(
+    {
+        vol.Optional(ATTR_CALIBRATION_MODE, default=0): vol.All(
+            vol.Coerce(int), vol.In([0, 1, 2])
+        ),
+    }
+)
+DIAGNOSTICS_SCHEMA = cv.make_entity_service_schema({})
+SAVE_GROUP_SCHEMA = cv.make_entity_service_schema({vol.Required(ATTR_GROUP): cv.string})
+DELETE_GROUP_SCHEMA = vol.Schema({vol.Required(ATTR_GROUP): cv.string})
+STAGGER = vol.All(vol.Coerce(float), vol.Range(min=0, max=GROUP_MAX_STAGGER))
+SET_GROUP_POSITION_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_GROUP): cv.string,
+            vol.Optional(ATTR_HEAD_POSITION): POSITION,
+            vol.Optional(ATTR_FEET_POSITION): POSITION,
+            vol.Optional(ATTR_STAGGER, default=0): STAGGER,
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_HEAD_POSITION, ATTR_FEET_POSITION),
+)
+LOAD_GROUP_PRESET_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_GROUP): cv.string,
+        vol.Required(ATTR_PRESET): cv.string,
+        vol.Optional(ATTR_STAGGER, default=0): STAGGER,
+    }
+)
+STOP_GROUP_SCHEMA = vol.Schema({vol.Required(ATTR_GROUP): cv.string})
+PROFILE_SCHEMA = cv.make_entity_service_schema({vol.Required(ATTR_ENABLED): cv.boolean})
+
+
+def _as_list(value: str | Iterable[str] | None) -> list[str]:
+    """Return a service target field as a list."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+class EntityDeviceIndex:
+    """Map entity and device targets to the config entry of their bed.
+
+    The index is built once from the registries and then kept current from
+    their update events, so resolving a service target is a dict lookup
+    instead of a registry query per call.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the index."""
+        self.hass = hass
+        self._entities: dict[str, str] = {}
+        self._devices: dict[str, str] = {}
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_start(self) -> None:
+        """Index the registries and start following their updates."""
+        for entity in er.async_get(self.hass).entities.values():
+            self._index_entity(entity)
+        for device in dr.async_get(self.hass).devices.values():
+            self._index_device(device)
+        self._unsubs = [
+            self.hass.bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_entity_updated
+            ),
+            self.hass.bus.async_listen(
+                dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_updated
+            ),
+        ]
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following registry updates."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    def _index_entity(self, entity: er.RegistryEntry) -> None:
+        if entity.platform == DOMAIN and entity.config_entry_id:
+            self._entities[entity.entity_id] = entity.config_entry_id
+
+    def _index_device(self, device: dr.DeviceEntry) -> None:
+        for entry_id in device.config_entries:
+            entry = self.hass.config_entries.async_get_entry(entry_id)
+            if entry is not None and entry.domain == DOMAIN:
+                self._devices[device.id] = entry_id
+                return
+
+    @callback
+    def _async_entity_updated(self, event: Event) -> None:
+        entity_id = event.data["entity_id"]
+        self._entities.pop(event.data.get("old_entity_id", entity_id), None)
+        if event.data["action"] != "remove" and (
+            entity := er.async_get(self.hass).async_get(entity_id)
+        ):
+            self._index_entity(entity)
+
+    @callback
+    def _async_device_updated(self, event: Event) -> None:
+        device_id = event.data["device_id"]
+        self._devices.pop(device_id, None)
+        if event.data["action"] != "remove" and (
+            device := dr.async_get(self.hass).async_get(device_id)
+        ):
+            self._index_device(device)
+
+    @callback
+    def async_resolve(self, call: ServiceCall) -> list[str]:
+        """Return the config entry ids targeted by a service call.
+
+        Each bed appears once, however many of its entities were targeted.
+        """
+        if call.data.get(ATTR_ENTITY_ID) == ENTITY_MATCH_ALL:
+            return list(dict.fromkeys(self._entities.values()))
+
+        entry_ids: dict[str, None] = {}
+        for entity_id in _as_list(call.data.get(ATTR_ENTITY_ID)):
+            if (entry_id := self._entities.get(entity_id)) is None:
+                raise ValueError(f"Entity {entity_id} not found or not a bed")
+            entry_ids[entry_id] = None
 
-    device = hass.data[DOMAIN][entity.config_entry_id]
-    await device.async_set_head_position(call.data[ATTR_POSITION])
+        for device_id in _as_list(call.data.get(ATTR_DEVICE_ID)):
+            if (entry_id := self._devices.get(device_id)) is None:
+                raise ValueError(f"Device {device_id} not found or not a bed")
+            entry_ids[entry_id] = None
+
+        if area_ids := _as_list(call.data.get(ATTR_AREA_ID)):
+            dev_reg = dr.async_get(self.hass)
+            ent_reg = er.async_get(self.hass)
+            for area_id in area_ids:
+                for device in dr.async_entries_for_area(dev_reg, area_id):
+                    if (entry_id := self._devices.get(device.id)) is not None:
+                        entry_ids[entry_id] = None
+                for entity in er.async_entries_for_area(ent_reg, area_id):
+                    if (entry_id := self._entities.get(entity.entity_id)) is not None:
+                        entry_ids[entry_id] = None
+
+        if not entry_ids:
+            raise ValueError("No beds found for the service target")
+        return list(entry_ids)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services and the entity index once for all beds."""
+    if DATA_ENTITY_INDEX in hass.data:
+        return
+
+    index = hass.data[DATA_ENTITY_INDEX] = EntityDeviceIndex(hass)
+    index.async_start()
+    hass.data[DATA_GROUPS] = BedGroupStore(hass)
+
+    for service, handler, schema, supports_response in (
+        (SERVICE_SET_HEAD_POSITION, async_set_head_position, SET_POSITION_SCHEMA, SupportsResponse.NONE),
+        (SERVICE_SET_FEET_POSITION, async_set_feet_position, SET_POSITION_SCHEMA, SupportsResponse.NONE),
+        (SERVICE_SET_BED_POSITION, async_set_bed_position, SET_BED_POSITION_SCHEMA, SupportsResponse.NONE),
+        (SERVICE_SAVE_PRESET, async_save_preset, SAVE_PRESET_SCHEMA, SupportsResponse.NONE),
+        (SERVICE_DELETE_PRESET, async_delete_preset, DELETE_PRESET_SCHEMA, SupportsResponse.NONE),
+        (SERVICE_CALIBRATE, async_calibrate, CALIBRATE_SCHEMA, SupportsResponse.NONE),
+        (SERVICE_DIAGNOSTICS, async_diagnostics, DIAGNOSTICS_SCHEMA, SupportsResponse.ONLY),
+        (SERVICE_SAVE_GROUP, async_save_group, SAVE_GROUP_SCHEMA, SupportsResponse.NONE),
+        (SERVICE_DELETE_GROUP, async_delete_group, DELETE_GROUP_SCHEMA, SupportsResponse.NONE),
+        (SERVICE_SET_GROUP_POSITION, async_set_group_position, SET_GROUP_POSITION_SCHEMA, SupportsResponse.OPTIONAL),
+        (SERVICE_LOAD_GROUP_PRESET, async_load_group_preset, LOAD_GROUP_PRESET_SCHEMA, SupportsResponse.OPTIONAL),
+        (SERVICE_STOP_GROUP, async_stop_group, STOP_GROUP_SCHEMA, SupportsResponse.OPTIONAL),
+        (SERVICE_PROFILE, async_profile, PROFILE_SCHEMA, SupportsResponse.NONE),
+    ):
+        hass.services.async_register(
+            DOMAIN,
+            service,
+            partial(handler, hass),
+            schema=schema,
+            supports_response=supports_response,
+        )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the services and the entity index after the last bed unloads."""
+    if (index := hass.data.pop(DATA_ENTITY_INDEX, None)) is None:
+        return
+
+    index.async_stop()
+    hass.data.pop(DATA_GROUPS, None)
+    for service in (
+        SERVICE_SET_HEAD_POSITION,
+        SERVICE_SET_FEET_POSITION,
+        SERVICE_SET_BED_POSITION,
+        SERVICE_SAVE_PRESET,
+        SERVICE_DELETE_PRESET,
+        SERVICE_CALIBRATE,
+        SERVICE_DIAGNOSTICS,
+        SERVICE_SAVE_GROUP,
+        SERVICE_DELETE_GROUP,
+        SERVICE_SET_GROUP_POSITION,
+        SERVICE_LOAD_GROUP_PRESET,
+        SERVICE_STOP_GROUP,
+        SERVICE_PROFILE,
+    ):
+        hass.services.async_remove(DOMAIN, service)
+
+
+def _async_get_devices(hass: HomeAssistant, call: ServiceCall) -> list[BedManagerDevice]:
+    """Return the loaded beds targeted by a service call."""
+    index: EntityDeviceIndex = hass.data[DATA_ENTITY_INDEX]
+    devices = hass.data[DOMAIN]
+    return [devices[entry_id] for entry_id in index.async_resolve(call) if entry_id in devices]
+
+async def async_set_head_position(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Set the head position of one or more beds."""
+    position = call.data[ATTR_POSITION]
+    await asyncio.gather(
+        *(device.async_set_head_position(position) for device in _async_get_devices(hass, call))
+    )
 
 async def async_set_feet_position(hass: HomeAssistant, call: ServiceCall) -> None:
-    """Set the feet position of a bed."""
-    entity_id = call.data["entity_id"]
-    registry = er.async_get(hass)
-    entity = registry.async_get(entity_id)
-    
-    if not entity or entity.platform != DOMAIN:
-        raise ValueError(f"Entity {entity_id} not found or not a bed")
+    """Set the feet position of one or more beds."""
+    position = call.data[ATTR_POSITION]
+    await asyncio.gather(
+        *(device.async_set_feet_position(position) for device in _async_get_devices(hass, call))
+    )
 
-    device = hass.data[DOMAIN][entity.config_entry_id]
-    await device.async_set_feet_position(call.data[ATTR_POSITION])
+async def async_set_bed_position(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Set the head and feet positions of one or more beds in one move."""
+    head_position = call.data.get(ATTR_HEAD_POSITION)
+    feet_position = call.data.get(ATTR_FEET_POSITION)
+    await asyncio.gather(
+        *(
+            device.async_set_bed_position(head_position, feet_position)
+            for device in _async_get_devices(hass, call)
+        )
+    )
+
+async def async_save_preset(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Save a preset on one or more beds.
+
+    Positions left out of the call are taken from where each bed is now.
+    """
+    name = call.data[ATTR_PRESET]
+    await asyncio.gather(
+        *(
+            device.async_save_preset(
+                name,
+                {
+                    ATTR_HEAD_POSITION: call.data.get(
+                        ATTR_HEAD_POSITION, device.state.head_position
+                    ),
+                    ATTR_FEET_POSITION: call.data.get(
+                        ATTR_FEET_POSITION, device.state.feet_position
+                    ),
+                },
+                device.state.massage_level,
+                device.state.massage_zone,
+            )
+            for device in _async_get_devices(hass, call)
+        )
+    )
+
+async def async_delete_preset(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Delete a preset from one or more beds."""
+    name = call.data[ATTR_PRESET]
+    await asyncio.gather(
+        *(device.async_delete_preset(name) for device in _async_get_devices(hass, call))
+    )
 
 async def async_calibrate(hass: HomeAssistant, call: ServiceCall) -> None:
-    """Calibrate a bed."""
-    entity_id = call.data["entity_id"]
-    registry = er.async_get(hass)
-    entity = registry.async_get(entity_id)
-    
-    if not entity or entity.platform != DOMAIN:
-        raise ValueError(f"Entity {entity_id} not found or not a bed")
-
-    device = hass.data[DOMAIN][entity.config_entry_id]
+    """Calibrate one or more beds."""
     mode = call.data.get(ATTR_CALIBRATION_MODE, 0)
-    await device.async_calibrate(mode)
+    await asyncio.gather(
+        *(device.async_calibrate(mode) for device in _async_get_devices(hass, call))
+    )
 
 async def async_diagnostics(hass: HomeAssistant, call: ServiceCall) -> dict[str, Any]:
-    """Get diagnostic information for a bed."""
-    entity_id = call.data["entity_id"]
-    registry = er.async_get(hass)
-    entity = registry.async_get(entity_id)
-    
-    if not entity or entity.platform != DOMAIN:
-        raise ValueError(f"Entity {entity_id} not found or not a bed")
-
-    device = hass.data[DOMAIN][entity.config_entry_id]
-    return await device.async_diagnostics() 
\ No newline at end of file
+    """Get diagnostic information for one or more beds.
+
+    A single bed returns its diagnostics directly; several are listed under
+    ``beds``.
+    """
+    results = await asyncio.gather(
+        *(device.async_diagnostics() for device in _async_get_devices(hass, call))
+    )
+    if len(results) == 1:
+        return results[0]
+    return {"beds": list(results)}
+
+async def async_profile(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Switch event loop profiling of one or more beds on or off."""
+    for device in _async_get_devices(hass, call):
+        device.async_set_profiling(call.data[ATTR_ENABLED])
+
+async def _async_get_group_store(hass: HomeAssistant) -> BedGroupStore:
+    """Return the bed groups, loading them on first use."""
+    groups: BedGroupStore = hass.data[DATA_GROUPS]
+    await groups.async_load()
+    return groups
+
+async def _async_run_group(
+    hass: HomeAssistant,
+    call: ServiceCall,
+    command: Callable[[BedManagerDevice], Awaitable[None]],
+    stagger: float = 0.0,
+) -> dict[str, Any]:
+    """Run a command on the beds of the group named in a service call.
+
+    Beds of the group that are not loaded are reported as failed.
+    """
+    name = call.data[ATTR_GROUP]
+    entry_ids = (await _async_get_group_store(hass)).get(name)
+    devices = hass.data[DOMAIN]
+    results = await async_run_group(
+        [devices[entry_id] for entry_id in entry_ids if entry_id in devices],
+        command,
+        stagger,
+    )
+    for entry_id in entry_ids:
+        if entry_id not in devices:
+            entry = hass.config_entries.async_get_entry(entry_id)
+            results.append(
+                {
+                    "bed": entry.title if entry is not None else entry_id,
+                    "success": False,
+                    "error": "Bed is not loaded",
+                }
+            )
+    return {"group": name, "beds": results}
+
+async def async_save_group(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Save the targeted beds as a named group."""
+    index: EntityDeviceIndex = hass.data[DATA_ENTITY_INDEX]
+    groups = await _async_get_group_store(hass)
+    groups.set(call.data[ATTR_GROUP], index.async_resolve(call))
+
+async def async_delete_group(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Delete a bed group."""
+    groups = await _async_get_group_store(hass)
+    groups.remove(call.data[ATTR_GROUP])
+
+async def async_set_group_position(hass: HomeAssistant, call: ServiceCall) -> dict[str, Any]:
+    """Move every bed of a group, optionally staggering the motor starts."""
+    head_position = call.data.get(ATTR_HEAD_POSITION)
+    feet_position = call.data.get(ATTR_FEET_POSITION)
+    return await _async_run_group(
+        hass,
+        call,
+        lambda device: device.async_set_bed_position(head_position, feet_position),
+        call.data[ATTR_STAGGER],
+    )
+
+async def async_load_group_preset(hass: HomeAssistant, call: ServiceCall) -> dict[str, Any]:
+    """Recall a preset on every bed of a group that has it saved."""
+    preset = call.data[ATTR_PRESET]
+    return await _async_run_group(
+        hass,
+        call,
+        lambda device: device.async_load_preset(preset),
+        call.data[ATTR_STAGGER],
+    )
+
+async def async_stop_group(hass: HomeAssistant, call: ServiceCall) -> dict[str, Any]:
+    """Stop every bed of a group at once."""
+    return await _async_run_group(hass, call, lambda device: device.async_stop())
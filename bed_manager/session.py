@@ -0,0 +1,123 @@
+"""PIN sessions and keep-alives for the Bed Manager integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_KEEPALIVE, KEEPALIVE_INTERVAL, KEEPALIVE_TICK
+from .protocol import pin_frame
+
+
+class PinSession:
+    """Authentication state of the current connection to one bed.
+
+    The PIN is sent once per connection. The session is then taken as valid
+    until the link drops or a write fails, so commands never pay for an
+    authentication round-trip of their own.
+    """
+
+    def __init__(self, pin: str, send: Callable[[bytes], Awaitable[None]]) -> None:
+        """Initialize the session."""
+        self._frame = pin_frame(pin)
+        self._send = send
+        self._lock = asyncio.Lock()
+        self.authenticated = False
+        self.authentications = 0
+
+    async def async_ensure_authenticated(self) -> None:
+        """Send the PIN unless this connection is already authenticated."""
+        if self.authenticated:
+            return
+        async with self._lock:
+            if self.authenticated:
+                return
+            await self._send(self._frame)
+            self.authenticated = True
+            self.authentications += 1
+
+    async def async_keep_alive(self) -> None:
+        """Resend the PIN so the controller keeps the session open."""
+        if self.authenticated:
+            await self._send(self._frame)
+
+    def invalidate(self) -> None:
+        """Forget the session after it was lost."""
+        self.authenticated = False
+
+
+class KeepAliveWheel:
+    """Run the keep-alives of every bed from a single timer.
+
+    Beds are spread over ``interval / tick`` slots and the timer visits one
+    slot per tick, so each bed is called once per interval without a sleeping
+    task of its own. The timer only runs while a bed is registered.
+    """
+
+    def __init__(self, interval: float, tick: float) -> None:
+        """Initialize the wheel."""
+        self._tick = tick
+        self._slots: list[dict[str, Callable[[], None]]] = [
+            {} for _ in range(max(1, round(interval / tick)))
+        ]
+        self._slot_of: dict[str, int] = {}
+        self._cursor = 0
+        self._handle: asyncio.TimerHandle | None = None
+        self._next_tick = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of registered beds."""
+        return len(self._slot_of)
+
+    @callback
+    def async_add(self, key: str, action: Callable[[], None]) -> None:
+        """Call an action once per interval until it is removed.
+
+        The least loaded slot is used, preferring the one that comes round
+        last, so a bed that just authenticated is not kept alive straight away.
+        """
+        self.async_remove(key)
+        count = len(self._slots)
+        index = min(
+            range(count),
+            key=lambda i: (len(self._slots[i]), -((i - self._cursor) % count)),
+        )
+        self._slots[index][key] = action
+        self._slot_of[key] = index
+        if self._handle is None:
+            loop = asyncio.get_running_loop()
+            self._next_tick = loop.time() + self._tick
+            self._handle = loop.call_at(self._next_tick, self._async_tick)
+
+    @callback
+    def async_remove(self, key: str) -> None:
+        """Stop calling the action registered under a key."""
+        if (index := self._slot_of.pop(key, None)) is None:
+            return
+        del self._slots[index][key]
+        if not self._slot_of and self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    @callback
+    def _async_tick(self) -> None:
+        slot = self._slots[self._cursor]
+        self._cursor = (self._cursor + 1) % len(self._slots)
+        for action in list(slot.values()):
+            action()
+        if self._slot_of:
+            self._next_tick += self._tick
+            self._handle = asyncio.get_running_loop().call_at(
+                self._next_tick, self._async_tick
+            )
+        else:
+            self._handle = None
+
+
+@callback
+def async_get_keepalive_wheel(hass: HomeAssistant) -> KeepAliveWheel:
+    """Return the keep-alive wheel shared by all beds."""
+    if (wheel := hass.data.get(DATA_KEEPALIVE)) is None:
+        wheel = hass.data[DATA_KEEPALIVE] = KeepAliveWheel(KEEPALIVE_INTERVAL, KEEPALIVE_TICK)
+    return wheel
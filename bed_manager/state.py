@@ -0,0 +1,49 @@
+"""Bed state snapshots for the Bed Manager integration."""
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class BedState:
+    """What the entities of a bed show, as of one update.
+
+    The device replaces its snapshot as a whole on every listener update and
+    never changes one in place, so a listener can hold on to the previous
+    snapshot and ``diff`` it against the current one to find what moved.
+    """
+
+    available: bool = False
+    head_position: float = 0.0
+    feet_position: float = 0.0
+    movement_type: int = 0
+    massage_level: int = 0
+    massage_zone: str = "none"
+    calibration_mode: int = 0
+    presets: tuple[str, ...] = ()
+    # Link health: signal in dBm, latencies in ms and reconnect attempts
+    rssi: int | None = None
+    connect_time: float | None = None
+    command_latency: float | None = None
+    response_latency: float | None = None
+    reconnects: int = 0
+
+    def diff(self, previous: BedState | None) -> frozenset[str]:
+        """Return the names of the fields that differ from a previous snapshot."""
+        if previous is None:
+            return STATE_FIELDS
+        if self == previous:
+            return _NOTHING
+        return frozenset(
+            name for name in _FIELD_NAMES if getattr(self, name) != getattr(previous, name)
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the snapshot as a dict, e.g. for the diagnostics."""
+        return {name: getattr(self, name) for name in _FIELD_NAMES}
+
+
+_FIELD_NAMES: tuple[str, ...] = tuple(field.name for field in fields(BedState))
+STATE_FIELDS: frozenset[str] = frozenset(_FIELD_NAMES)
+_NOTHING: frozenset[str] = frozenset()
@@ -0,0 +1,292 @@
+"""End-to-end benchmark from service call to simulated bed.
+
+Drives ``set_bed_head_position`` service calls through schema validation,
+``services.py`` dispatch, ``BedManagerDevice`` and the transport into
+simulated RC2 beds on a virtual-time loop. Three workloads run for 1, 10
+and 100 beds, three beds per simulated proxy:
+
+* ``sequential``: every bed gets a series of independent position calls
+* ``slider``: a slider drag sends a burst of positions 50 ms apart
+* ``fanout``: several automations target every bed at once
+
+Latencies are in virtual time, so they show what the code schedules
+(queueing, coalescing, connection slots) independent of the machine; the
+wall-clock cost per call shows the CPU spent on the hot path. Results are
+written as JSON for comparing versions.
+
+Run from the directory containing ``custom_components``:
+
+    python custom_components/bed_manager/tests/benchmarks/bench_e2e.py --output e2e.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import sys
+import time
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import ServiceCall
+
+from custom_components.bed_manager.const import (
+    DATA_ENTITY_INDEX,
+    DOMAIN,
+    SERVICE_SET_HEAD_POSITION,
+)
+from custom_components.bed_manager.protocol import pin_frame
+from custom_components.bed_manager.services import (
+    SET_POSITION_SCHEMA,
+    EntityDeviceIndex,
+    async_set_head_position,
+)
+from custom_components.bed_manager.tests.fake_bed import (
+    SimulatedBed,
+    SimulatedBedTransport,
+    VirtualClockLoop,
+    make_device,
+    make_hass,
+)
+
+BEDS_PER_PROXY = 3
+PIN = pin_frame("0000")
+
+
+class TimedTransport(SimulatedBedTransport):
+    """Simulated link that timestamps every frame it writes."""
+
+    def __init__(self, bed: SimulatedBed, **kwargs: Any) -> None:
+        super().__init__(bed, **kwargs)
+        self.timestamps: list[float] = []
+
+    async def async_write(self, data: bytes) -> None:
+        if data != PIN:
+            self.timestamps.append(asyncio.get_running_loop().time())
+        await super().async_write(data)
+
+    def first_write_after(self, since: float) -> float | None:
+        """Return when the first frame at or after a loop time was written."""
+        index = bisect_left(self.timestamps, since)
+        return self.timestamps[index] if index < len(self.timestamps) else None
+
+
+class Harness:
+    """A house of simulated beds behind the real service handlers."""
+
+    def __init__(self, beds: int, seed: int) -> None:
+        self.hass = make_hass()
+        self.hass.data[DOMAIN] = {}
+        self.index = EntityDeviceIndex(self.hass)
+        self.hass.data[DATA_ENTITY_INDEX] = self.index
+        self.rng = random.Random(seed)
+        self.transports: dict[str, TimedTransport] = {}
+        for number in range(beds):
+            entry_id = f"bed_{number}"
+            entity_id = f"cover.bed_{number}_head"
+            transport = TimedTransport(
+                SimulatedBed(), source=f"proxy_{number // BEDS_PER_PROXY}", seed=number
+            )
+            self.hass.data[DOMAIN][entry_id] = make_device(
+                self.hass,
+                transport,
+                name=f"Bed {number}",
+                address=f"00:11:22:33:{number >> 8:02X}:{number & 0xFF:02X}",
+                entry_id=entry_id,
+            )
+            self.index._entities[entity_id] = entry_id
+            self.transports[entity_id] = transport
+
+    @property
+    def entity_ids(self) -> list[str]:
+        return list(self.transports)
+
+    async def async_call(self, entity_ids: list[str], position: float) -> None:
+        """Make a service call the way the service registry would."""
+        data = SET_POSITION_SCHEMA({"entity_id": entity_ids, "position": position})
+        await async_set_head_position(
+            self.hass, ServiceCall(DOMAIN, SERVICE_SET_HEAD_POSITION, data)
+        )
+
+    async def async_setup(self) -> None:
+        await asyncio.gather(
+            *(device.async_setup() for device in self.hass.data[DOMAIN].values())
+        )
+
+    def frames(self) -> int:
+        return sum(len(transport.timestamps) for transport in self.transports.values())
+
+
+class Samples:
+    """Latency samples of one workload."""
+
+    def __init__(self) -> None:
+        self.command: list[float] = []
+        self.completion: list[float] = []
+        self.calls = 0
+
+    async def async_measure(
+        self,
+        harness: Harness,
+        entity_ids: list[str],
+        call: Callable[[], Awaitable[None]],
+    ) -> None:
+        """Time one service call to its first motor command and to completion."""
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await call()
+        self.completion.append(loop.time() - start)
+        self.calls += 1
+        for entity_id in entity_ids:
+            if (first := harness.transports[entity_id].first_write_after(start)) is not None:
+                self.command.append(first - start)
+
+
+def _percentile(values: list[float], fraction: float) -> float | None:
+    """Return a nearest-rank percentile in milliseconds."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(fraction * len(ordered)) - 1, 0)
+    return round(ordered[rank] * 1000, 2)
+
+
+async def _sequential(harness: Harness, samples: Samples, rounds: int) -> None:
+    async def one_bed(entity_id: str) -> None:
+        for _ in range(rounds):
+            position = harness.rng.uniform(0, 100)
+            await samples.async_measure(
+                harness, [entity_id], lambda: harness.async_call([entity_id], position)
+            )
+
+    await asyncio.gather(*(one_bed(entity_id) for entity_id in harness.entity_ids))
+
+
+async def _slider(harness: Harness, samples: Samples, rounds: int) -> None:
+    async def drag(entity_id: str) -> None:
+        for _ in range(rounds):
+            start = harness.rng.uniform(0, 50)
+            calls = []
+            for step in range(20):
+                position = start + step * 2.5
+                calls.append(
+                    asyncio.create_task(
+                        samples.async_measure(
+                            harness,
+                            [entity_id],
+                            lambda position=position: harness.async_call(
+                                [entity_id], position
+                            ),
+                        )
+                    )
+                )
+                await asyncio.sleep(0.05)
+            await asyncio.gather(*calls)
+
+    await asyncio.gather(*(drag(entity_id) for entity_id in harness.entity_ids))
+
+
+async def _fanout(harness: Harness, samples: Samples, rounds: int) -> None:
+    entity_ids = harness.entity_ids
+    for _ in range(rounds):
+        await asyncio.gather(
+            *(
+                samples.async_measure(
+                    harness,
+                    entity_ids,
+                    lambda position=harness.rng.uniform(0, 100): harness.async_call(
+                        entity_ids, position
+                    ),
+                )
+                for _ in range(5)
+            )
+        )
+
+
+WORKLOADS: dict[str, Callable[[Harness, Samples, int], Awaitable[None]]] = {
+    "sequential": _sequential,
+    "slider": _slider,
+    "fanout": _fanout,
+}
+
+
+def run_workload(name: str, beds: int, rounds: int, seed: int) -> dict[str, Any]:
+    """Run one workload on a fresh virtual-time loop and summarise it."""
+    loop = VirtualClockLoop()
+    try:
+        harness = Harness(beds, seed)
+        samples = Samples()
+        loop.run_until_complete(harness.async_setup())
+        frames_before = harness.frames()
+        virtual_start = loop.time()
+        wall_start = time.perf_counter()
+        loop.run_until_complete(WORKLOADS[name](harness, samples, rounds))
+        wall = time.perf_counter() - wall_start
+        virtual = loop.time() - virtual_start
+    finally:
+        loop.close()
+
+    return {
+        "workload": name,
+        "beds": beds,
+        "calls": samples.calls,
+        "frames": harness.frames() - frames_before,
+        "virtual_seconds": round(virtual, 3),
+        "calls_per_virtual_second": round(samples.calls / virtual, 3) if virtual else None,
+        "command_p50_ms": _percentile(samples.command, 0.5),
+        "command_p99_ms": _percentile(samples.command, 0.99),
+        "completion_p50_ms": _percentile(samples.completion, 0.5),
+        "completion_p99_ms": _percentile(samples.completion, 0.99),
+        "wall_seconds": round(wall, 4),
+        "wall_us_per_call": round(wall / samples.calls * 1e6, 1) if samples.calls else None,
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    manifest = Path(__file__).parents[2] / "manifest.json"
+    results = {
+        "benchmark": "bed_manager_e2e",
+        "version": json.loads(manifest.read_text())["version"],
+        "python": platform.python_version(),
+        "seed": args.seed,
+        "results": [
+            run_workload(name, beds, args.rounds, args.seed)
+            for beds in args.beds
+            for name in args.workloads
+        ],
+    }
+
+    print(
+        f"{'workload':<12}{'beds':>6}{'calls':>7}{'frames':>8}"
+        f"{'cmd p50':>10}{'cmd p99':>10}{'done p50':>11}{'done p99':>11}{'us/call':>10}",
+        file=sys.stderr,
+    )
+    for result in results["results"]:
+        print(
+            f"{result['workload']:<12}{result['beds']:>6}{result['calls']:>7}{result['frames']:>8}"
+            f"{result['command_p50_ms'] or 0:>10.1f}{result['command_p99_ms'] or 0:>10.1f}"
+            f"{result['completion_p50_ms'] or 0:>11.0f}{result['completion_p99_ms'] or 0:>11.0f}"
+            f"{result['wall_us_per_call'] or 0:>10.1f}",
+            file=sys.stderr,
+        )
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--beds", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--workloads", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON results to a file")
+    main(parser.parse_args())
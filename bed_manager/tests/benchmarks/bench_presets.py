@@ -0,0 +1,96 @@
+"""Preset recall latency benchmark.
+
+Recalls presets on a simulated bed from a spread of start positions and
+reports how long it takes until the first motor command reaches the link
+and until the bed has settled, plus how many frames each recall cost.
+
+Run from the directory containing ``custom_components``:
+
+    python custom_components/bed_manager/tests/benchmarks/bench_presets.py
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from custom_components.bed_manager.const import AXIS_FEET, AXIS_HEAD
+from custom_components.bed_manager.tests.fake_bed import make_device, make_hass
+from custom_components.bed_manager.transport import BedTransport
+
+PRESETS = {
+    "flat": {"head_position": 0.0, "feet_position": 0.0},
+    "zero_g": {"head_position": 30.0, "feet_position": 40.0},
+    "reading": {"head_position": 70.0, "feet_position": 10.0},
+}
+
+
+class TimingTransport(BedTransport):
+    """Transport that timestamps the first write after being armed."""
+
+    def __init__(self) -> None:
+        self.first_write: float | None = None
+        self.writes = 0
+
+    @property
+    def is_connected(self) -> bool:
+        return True
+
+    async def async_connect(self) -> None:
+        """Nothing to connect."""
+
+    async def async_disconnect(self) -> None:
+        """Nothing to disconnect."""
+
+    async def async_write(self, data: bytes) -> None:
+        if self.first_write is None:
+            self.first_write = time.perf_counter()
+        self.writes += 1
+
+    def arm(self) -> None:
+        self.first_write = None
+        self.writes = 0
+
+
+async def _main(args: argparse.Namespace) -> None:
+    transport = TimingTransport()
+    device = make_device(make_hass(), transport, name="Bench Bed")
+    for estimator in device._estimators.values():
+        estimator.travel_up = estimator.travel_down = args.travel
+        estimator.start_latency = estimator.stop_latency = 0.0
+    for name, position in PRESETS.items():
+        await device.async_save_preset(name, position, 0, "none")
+
+    rng = random.Random(args.seed)
+    results: dict[str, list[tuple[float | None, float, int]]] = {name: [] for name in PRESETS}
+    for _ in range(args.rounds):
+        for name in PRESETS:
+            device._set_position(AXIS_HEAD, rng.choice((0.0, 30.0, rng.uniform(0, 100))))
+            device._set_position(AXIS_FEET, rng.choice((0.0, 40.0, rng.uniform(0, 100))))
+            transport.arm()
+            start = time.perf_counter()
+            await device.async_load_preset(name)
+            total = time.perf_counter() - start
+            first = None if transport.first_write is None else transport.first_write - start
+            results[name].append((first, total, transport.writes))
+
+    print(f"{'preset':<10}{'first cmd p50 (ms)':>20}{'settled p50 (ms)':>18}{'frames':>8}{'skipped':>9}")
+    for name, samples in results.items():
+        firsts = [first * 1000 for first, _, _ in samples if first is not None]
+        print(
+            f"{name:<10}"
+            f"{statistics.median(firsts) if firsts else 0.0:>20.3f}"
+            f"{statistics.median(total for _, total, _ in samples) * 1000:>18.1f}"
+            f"{statistics.mean(writes for _, _, writes in samples):>8.2f}"
+            f"{sum(first is None for first, _, _ in samples):>9}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--travel", type=float, default=0.2, help="full travel seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    asyncio.run(_main(parser.parse_args()))
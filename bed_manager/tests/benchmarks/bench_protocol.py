@@ -0,0 +1,55 @@
+"""Octo RC2 codec throughput benchmark.
+
+Measures how many frames per second the codec encodes and decodes for the
+traffic every bed generates continuously: movement and keep-alive frames on
+the way out, status notifications on the way in. The allocating builder is
+timed next to the precomputed and buffer-based paths for comparison.
+
+Run from the directory containing ``custom_components``:
+
+    python custom_components/bed_manager/tests/benchmarks/bench_protocol.py
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from custom_components.bed_manager.const import RC2_CMD_PIN, RC2_CMD_STATUS
+from custom_components.bed_manager.protocol import (
+    FRAME_OVERHEAD,
+    build_frame,
+    build_frame_into,
+    decode_status,
+    movement_frame,
+    pin_frame,
+)
+
+STATUS = build_frame(RC2_CMD_STATUS, (35, 10, 1))
+BATCH = STATUS * 4
+
+
+def _cases() -> dict[str, object]:
+    buffer = bytearray(FRAME_OVERHEAD + 4)
+    return {
+        "encode movement (built)": lambda: build_frame((0x02, 0x70), (0x02,)),
+        "encode movement (precomputed)": lambda: movement_frame(1),
+        "encode pin (built)": lambda: build_frame(RC2_CMD_PIN, (1, 2, 3, 4)),
+        "encode pin (cached)": lambda: pin_frame("1234"),
+        "encode pin (into buffer)": lambda: build_frame_into(buffer, RC2_CMD_PIN, (1, 2, 3, 4)),
+        "decode status": lambda: decode_status(STATUS),
+        "decode status (4 batched)": lambda: decode_status(BATCH),
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    print(f"{'case':<32}{'ops/s':>14}{'ns/op':>10}")
+    for name, case in _cases().items():
+        best = min(timeit.repeat(case, number=args.number, repeat=args.repeat))
+        print(f"{name:<32}{args.number / best:>14,.0f}{best / args.number * 1e9:>10.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
@@ -0,0 +1,92 @@
+"""Startup-time benchmark for blocking versus background bed setup.
+
+Simulates N beds behind a Bluetooth proxy that serialises connection attempts
+and compares how long config entry setup holds up startup when the connect is
+awaited inline against when it runs as a background task.
+
+Run from the directory containing ``custom_components``:
+
+    python custom_components/bed_manager/tests/benchmarks/bench_setup.py --beds 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from custom_components.bed_manager.device import BedManagerDevice
+from custom_components.bed_manager.tests.fake_bed import make_device, make_hass
+from custom_components.bed_manager.transport import BedConnectionError, BedTransport
+
+
+class ProxyTransport(BedTransport):
+    """Transport whose connects queue up on a shared proxy."""
+
+    def __init__(self, proxy: asyncio.Semaphore, latency: float) -> None:
+        self._proxy = proxy
+        self._latency = latency
+        self._connected = False
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    async def async_connect(self) -> None:
+        async with self._proxy:
+            await asyncio.sleep(self._latency)
+        self._connected = True
+
+    async def async_disconnect(self) -> None:
+        self._connected = False
+
+    async def async_write(self, data: bytes) -> None:
+        if not self._connected:
+            raise BedConnectionError("Proxy link is down")
+
+
+def _make_devices(beds: int, slots: int, latency: float) -> list[BedManagerDevice]:
+    proxy = asyncio.Semaphore(slots)
+    # One hass for all beds, so they share its connection slot manager.
+    hass = make_hass()
+    return [
+        make_device(
+            hass,
+            ProxyTransport(proxy, latency),
+            name=f"Bed {index}",
+            address=f"00:11:22:33:44:{index:02X}",
+            entry_id=f"bed_{index}",
+        )
+        for index in range(beds)
+    ]
+
+
+async def _bench_blocking(beds: int, slots: int, latency: float) -> tuple[float, float]:
+    devices = _make_devices(beds, slots, latency)
+    start = time.perf_counter()
+    await asyncio.gather(*(device.async_setup() for device in devices))
+    setup = time.perf_counter() - start
+    return setup, setup
+
+
+async def _bench_background(beds: int, slots: int, latency: float) -> tuple[float, float]:
+    devices = _make_devices(beds, slots, latency)
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(device.async_setup()) for device in devices]
+    setup = time.perf_counter() - start
+    await asyncio.gather(*tasks)
+    return setup, time.perf_counter() - start
+
+
+async def _main(args: argparse.Namespace) -> None:
+    print(f"{'mode':<12}{'beds':>6}{'setup (s)':>12}{'connected (s)':>16}")
+    for name, bench in (("blocking", _bench_blocking), ("background", _bench_background)):
+        setup, connected = await bench(args.beds, args.slots, args.latency)
+        print(f"{name:<12}{args.beds:>6}{setup:>12.4f}{connected:>16.4f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--beds", type=int, default=10)
+    parser.add_argument("--slots", type=int, default=1, help="concurrent connects per proxy")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per connect")
+    asyncio.run(_main(parser.parse_args()))
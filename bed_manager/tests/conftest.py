@@ -0,0 +1,16 @@
+"""Fixtures shared by the Bed Manager tests."""
+import pytest
+
+from custom_components.bed_manager.tests.fake_bed import FakeTransport, make_hass
+
+
+@pytest.fixture
+def hass():
+    """Create a stand-in hass."""
+    return make_hass()
+
+
+@pytest.fixture
+def transport():
+    """Create a fake transport."""
+    return FakeTransport()
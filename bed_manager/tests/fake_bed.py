@@ -0,0 +1,485 @@
+"""In-process Octo RC2 bed for tests and benchmarks.
+
+``SimulatedBed`` models the two motors of an RC2 controller: travel times,
+start and stop latency, PIN authentication and the status notifications it
+pushes while moving. ``SimulatedBedTransport`` plugs it in under the device
+in place of the BLE transport, adding link latency and packet loss.
+
+``VirtualClockLoop`` is an event loop whose clock jumps straight to the next
+timer whenever nothing is ready to run, so a 30 second move finishes
+instantly and every run of a test sees the same timings.
+
+``FakeMqttBroker`` with ``SimulatedMqttBridge``, and ``FakeEsphomeNode``,
+stand in for the broker and the ESPHome API so the other transports can be
+driven against the same simulated bed.
+
+``make_hass`` and ``make_device`` build the stand-in hass and config entry
+a device needs, and ``FakeTransport`` records frames without a bed behind
+it, for the tests that only check what was sent.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import selectors
+from collections import defaultdict
+from collections.abc import Callable, Coroutine
+from typing import Any, TypeVar
+from unittest.mock import MagicMock
+
+from homeassistant.components.mqtt import ReceiveMessage
+from homeassistant.core import Event
+from homeassistant.exceptions import ServiceNotFound
+from homeassistant.util import dt as dt_util
+
+from custom_components.bed_manager.const import (
+    AXIS_FEET,
+    AXIS_HEAD,
+    ESPHOME_NOTIFICATION_EVENT,
+    ESPHOME_WRITE_SERVICE,
+    RC2_CMD_MOVE_DOWN,
+    RC2_CMD_MOVE_UP,
+    RC2_CMD_PIN,
+    RC2_CMD_STATUS,
+    RC2_CMD_STOP,
+    RC2_MOTOR_FEET,
+    RC2_MOTOR_HEAD,
+)
+from custom_components.bed_manager.device import BedManagerDevice
+from custom_components.bed_manager.protocol import build_frame, iter_frames
+from custom_components.bed_manager.transport import BedConnectionError, BedTransport
+
+_T = TypeVar("_T")
+
+_MOTOR_BITS = {AXIS_HEAD: RC2_MOTOR_HEAD, AXIS_FEET: RC2_MOTOR_FEET}
+
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """Selector that advances the loop's clock instead of blocking."""
+
+    def __init__(self, loop: VirtualClockLoop) -> None:
+        super().__init__()
+        self._loop = loop
+
+    def select(self, timeout: float | None = None) -> list[Any]:
+        if timeout is None:
+            return super().select(None)
+        events = super().select(0)
+        if not events and timeout > 0:
+            self._loop.advance(timeout)
+        return events
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """Event loop running on virtual time."""
+
+    def __init__(self) -> None:
+        self._virtual_time = 0.0
+        super().__init__(_VirtualSelector(self))
+
+    def time(self) -> float:
+        return self._virtual_time
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward."""
+        self._virtual_time += seconds
+
+
+def run_virtual(coro: Coroutine[Any, Any, _T]) -> _T:
+    """Run a coroutine to completion on a fresh virtual-time loop."""
+    loop = VirtualClockLoop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def make_hass() -> MagicMock:
+    """Return a stand-in hass with real ``data`` that runs tasks on the loop."""
+    hass = MagicMock()
+    hass.data = {}
+    hass.async_create_task = lambda target, name=None: asyncio.ensure_future(target)
+    return hass
+
+
+def make_device(
+    hass: Any,
+    transport: BedTransport,
+    *,
+    name: str = "Test Bed",
+    address: str = "00:11:22:33:44:55",
+    entry_id: str = "test_entry",
+) -> BedManagerDevice:
+    """Create a device for a stand-in config entry on a transport."""
+    entry = MagicMock()
+    entry.entry_id = entry_id
+    entry.data = {"name": name, "mac_address": address, "bed_type": "octo_bed"}
+    return BedManagerDevice(hass, entry, transport=transport)
+
+
+class FakeTransport(BedTransport):
+    """Transport that records frames instead of sending them."""
+
+    def __init__(self) -> None:
+        self.connects = 0
+        self.frames: list[bytes] = []
+        self._connected = False
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    async def async_connect(self) -> None:
+        if not self._connected:
+            self.connects += 1
+            self._connected = True
+
+    async def async_disconnect(self) -> None:
+        self._connected = False
+
+    async def async_write(self, data: bytes) -> None:
+        if not self._connected:
+            raise BedConnectionError("Fake transport is not connected")
+        self.frames.append(data)
+
+
+class _Motor:
+    """One motor; its position is integrated from when it last changed."""
+
+    def __init__(self, travel_up: float, travel_down: float) -> None:
+        self.travel_up = travel_up
+        self.travel_down = travel_down
+        self.position = 0.0
+        self.direction = 0
+        self.since = 0.0
+
+    def position_at(self, now: float) -> float:
+        if not self.direction:
+            return self.position
+        travel = self.travel_up if self.direction > 0 else self.travel_down
+        moved = (now - self.since) * 100 / travel * self.direction
+        return min(max(self.position + moved, 0.0), 100.0)
+
+    def drive(self, direction: int, now: float) -> None:
+        self.position = self.position_at(now)
+        self.direction = direction
+        self.since = now
+
+
+class SimulatedBed:
+    """A virtual RC2 controller with a head and a feet motor."""
+
+    def __init__(
+        self,
+        *,
+        travel_up: float = 30.0,
+        travel_down: float = 25.0,
+        start_latency: float = 0.15,
+        stop_latency: float = 0.1,
+        notify_interval: float = 0.2,
+        pin: str | None = "0000",
+    ) -> None:
+        """Initialize the bed flat and idle."""
+        self.motors = {
+            AXIS_HEAD: _Motor(travel_up, travel_down),
+            AXIS_FEET: _Motor(travel_up, travel_down),
+        }
+        self.start_latency = start_latency
+        self.stop_latency = stop_latency
+        self.notify_interval = notify_interval
+        self.pin = pin
+        self.authenticated = pin is None
+        self.reachable = True
+        self.frames_received = 0
+        self.frames_ignored = 0
+        self._notify = None
+        self._notify_handle: asyncio.TimerHandle | None = None
+
+    @property
+    def moving(self) -> bool:
+        """Return True while a motor runs."""
+        return any(motor.direction for motor in self.motors.values())
+
+    def position(self, axis: str) -> float:
+        """Return the true position of an axis."""
+        return self.motors[axis].position_at(asyncio.get_running_loop().time())
+
+    def attach(self, notify) -> None:
+        """Start pushing status notifications to a callback."""
+        self._notify = notify
+
+    def detach(self) -> None:
+        """Drop the connection: motors stop and the session is forgotten."""
+        self._notify = None
+        self.authenticated = self.pin is None
+        now = asyncio.get_running_loop().time()
+        for motor in self.motors.values():
+            motor.drive(0, now)
+        if self._notify_handle is not None:
+            self._notify_handle.cancel()
+            self._notify_handle = None
+
+    def receive(self, frame: bytes) -> None:
+        """Act on a frame written by the host."""
+        loop = asyncio.get_running_loop()
+        for command, data in iter_frames(frame):
+            self.frames_received += 1
+            if command == RC2_CMD_PIN:
+                self.authenticated = self.pin is None or "".join(map(str, data)) == self.pin
+            elif not self.authenticated:
+                self.frames_ignored += 1
+            elif command in (RC2_CMD_MOVE_UP, RC2_CMD_MOVE_DOWN) and len(data) == 1:
+                direction = 1 if command == RC2_CMD_MOVE_UP else -1
+                loop.call_later(self.start_latency, self._start, data[0], direction)
+            elif command == RC2_CMD_STOP:
+                loop.call_later(self.stop_latency, self._stop)
+            else:
+                self.frames_ignored += 1
+
+    def _start(self, motors: int, direction: int) -> None:
+        """Run the motors named in a movement command; the others stop."""
+        now = asyncio.get_running_loop().time()
+        for axis, bit in _MOTOR_BITS.items():
+            self.motors[axis].drive(direction if motors & bit else 0, now)
+        self._send_status()
+
+    def _stop(self) -> None:
+        now = asyncio.get_running_loop().time()
+        for motor in self.motors.values():
+            motor.drive(0, now)
+        self._send_status()
+
+    def _movement_type(self) -> int:
+        head = self.motors[AXIS_HEAD].direction
+        feet = self.motors[AXIS_FEET].direction
+        if head and head == feet:
+            return 5 if head > 0 else 6
+        if head:
+            return 1 if head > 0 else 2
+        if feet:
+            return 3 if feet > 0 else 4
+        return 0
+
+    def _send_status(self) -> None:
+        """Push the current status, and keep pushing it while moving."""
+        if self._notify_handle is not None:
+            self._notify_handle.cancel()
+            self._notify_handle = None
+        if self._notify is None:
+            return
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        self._notify(
+            build_frame(
+                RC2_CMD_STATUS,
+                (
+                    round(self.motors[AXIS_HEAD].position_at(now)),
+                    round(self.motors[AXIS_FEET].position_at(now)),
+                    self._movement_type(),
+                ),
+            )
+        )
+        if self.moving:
+            self._notify_handle = loop.call_later(self.notify_interval, self._send_status)
+
+
+class SimulatedBedTransport(BedTransport):
+    """Link to a ``SimulatedBed`` with latency and packet loss."""
+
+    def __init__(
+        self,
+        bed: SimulatedBed,
+        *,
+        connect_latency: float = 0.5,
+        latency: float = 0.02,
+        loss: float = 0.0,
+        write_loss: float = 0.0,
+        seed: int = 0,
+        source: str = "proxy",
+    ) -> None:
+        """Initialize the link.
+
+        ``loss`` is the chance a notification is dropped and ``write_loss``
+        the chance a written frame never reaches the bed.
+        """
+        self.bed = bed
+        self.connect_latency = connect_latency
+        self.latency = latency
+        self.loss = loss
+        self.write_loss = write_loss
+        self._rng = random.Random(seed)
+        self._source = source
+        self._connected = False
+        self.connects = 0
+        self.writes: list[bytes] = []
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connected
+
+    @property
+    def source(self) -> str:
+        return self._source
+
+    @property
+    def rssi(self) -> int | None:
+        return -60 if self.bed.reachable else None
+
+    async def async_connect(self) -> None:
+        if self._connected:
+            return
+        await asyncio.sleep(self.connect_latency)
+        if not self.bed.reachable:
+            raise BedConnectionError("Simulated bed is out of range")
+        self._connected = True
+        self.connects += 1
+        self.bed.attach(self._deliver_notification)
+
+    async def async_disconnect(self) -> None:
+        if self._connected:
+            self._connected = False
+            self.bed.detach()
+
+    async def async_write(self, data: bytes) -> None:
+        if not self._connected:
+            raise BedConnectionError("Simulated bed is not connected")
+        self.writes.append(bytes(data))
+        if not self._lost(self.write_loss):
+            asyncio.get_running_loop().call_later(self.latency, self.bed.receive, bytes(data))
+
+    def drop(self) -> None:
+        """Lose the link as if the bed went out of range."""
+        if self._connected:
+            self._connected = False
+            self.bed.detach()
+            if self._disconnected_callback is not None:
+                self._disconnected_callback()
+
+    def _lost(self, chance: float) -> bool:
+        return chance > 0 and self._rng.random() < chance
+
+    def _deliver_notification(self, frame: bytes) -> None:
+        if self._notification_callback is not None and not self._lost(self.loss):
+            asyncio.get_running_loop().call_later(
+                self.latency, self._notification_callback, frame
+            )
+
+
+class FakeMqttBroker:
+    """In-process broker keeping retained messages, with a fixed latency.
+
+    Its coroutines have the signatures of the ``homeassistant.components.mqtt``
+    helpers they stand in for.
+    """
+
+    def __init__(self, latency: float = 0.01) -> None:
+        """Initialize the broker."""
+        self.latency = latency
+        self.connected = True
+        self.retained: dict[str, bytes] = {}
+        self.published: list[tuple[str, bytes]] = []
+        self._subscribers: defaultdict[str, list[Callable[[ReceiveMessage], None]]] = (
+            defaultdict(list)
+        )
+
+    async def async_wait_for_mqtt_client(self, hass: Any) -> bool:
+        return self.connected
+
+    async def async_subscribe(
+        self, hass: Any, topic: str, msg_callback, qos: int = 0, encoding: str | None = "utf-8"
+    ) -> Callable[[], None]:
+        self._subscribers[topic].append(msg_callback)
+        if topic in self.retained:
+            self._deliver(msg_callback, topic, self.retained[topic], True)
+        return lambda: self._subscribers[topic].remove(msg_callback)
+
+    async def async_publish(
+        self,
+        hass: Any,
+        topic: str,
+        payload: bytes,
+        qos: int | None = 0,
+        retain: bool | None = False,
+        encoding: str | None = "utf-8",
+    ) -> None:
+        self.published.append((topic, payload))
+        if retain:
+            self.retained[topic] = payload
+        for msg_callback in list(self._subscribers[topic]):
+            self._deliver(msg_callback, topic, payload, False)
+
+    def _deliver(self, msg_callback, topic: str, payload: bytes, retain: bool) -> None:
+        message = ReceiveMessage(topic, payload, 0, retain, topic, dt_util.utcnow())
+        asyncio.get_running_loop().call_later(self.latency, msg_callback, message)
+
+
+class SimulatedMqttBridge:
+    """An MQTT bridge next to a ``SimulatedBed``, relaying frames both ways."""
+
+    def __init__(self, broker: FakeMqttBroker, bed: SimulatedBed, base_topic: str) -> None:
+        """Initialize the bridge; call ``async_start`` to go online."""
+        self.broker = broker
+        self.bed = bed
+        self.command_topic = f"{base_topic}/command"
+        self.state_topic = f"{base_topic}/state"
+
+    async def async_start(self) -> None:
+        await self.broker.async_subscribe(None, self.command_topic, self._on_command)
+        self.bed.attach(self._on_notification)
+
+    def _on_command(self, msg: ReceiveMessage) -> None:
+        self.bed.receive(msg.payload)
+
+    def _on_notification(self, frame: bytes) -> None:
+        asyncio.get_running_loop().create_task(
+            self.broker.async_publish(None, self.state_topic, frame, retain=True)
+        )
+
+
+class FakeEsphomeNode:
+    """An ESPHome node relaying frames to a ``SimulatedBed``.
+
+    It stands in for the service registry and event bus the node is reached
+    through; assign it to ``hass.services`` and ``hass.bus``.
+    """
+
+    def __init__(
+        self, bed: SimulatedBed, node: str, address: str, latency: float = 0.01
+    ) -> None:
+        """Initialize the node online."""
+        self.bed = bed
+        self.node = node
+        self.address = address
+        self.latency = latency
+        self.online = True
+        self.calls = 0
+        self._listeners: list[Callable[[Event], None]] = []
+        bed.attach(self._on_notification)
+
+    def has_service(self, domain: str, service: str) -> bool:
+        return self.online and (domain, service) == ("esphome", self._service)
+
+    async def async_call(
+        self, domain: str, service: str, service_data: dict[str, Any], blocking: bool = False
+    ) -> None:
+        if not self.has_service(domain, service):
+            raise ServiceNotFound(domain, service)
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        self.bed.receive(bytes.fromhex(service_data["frame"]))
+
+    def async_listen(self, event_type: str, listener: Callable[[Event], None]):
+        if event_type == ESPHOME_NOTIFICATION_EVENT:
+            self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    @property
+    def _service(self) -> str:
+        return f"{self.node}_{ESPHOME_WRITE_SERVICE}"
+
+    def _on_notification(self, frame: bytes) -> None:
+        event = Event(
+            ESPHOME_NOTIFICATION_EVENT, {"address": self.address, "frame": frame.hex()}
+        )
+        for listener in list(self._listeners):
+            asyncio.get_running_loop().call_later(self.latency, listener, event)
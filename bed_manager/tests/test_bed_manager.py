@@ -1,28 +1,29 @@
 """Tests for the Bed Manager integration."""
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, ServiceCall
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
 from homeassistant.components import cover
 from homeassistant.const import (
     ATTR_ENTITY_ID,
+    ENTITY_MATCH_ALL,
     SERVICE_TOGGLE,
     STATE_OPEN,
     STATE_CLOSED,
 )
 
-from custom_components.bed_manager import (
-    DOMAIN,
-    SERVICE_SET_HEAD_POSITION,
-    SERVICE_SET_FEET_POSITION,
-    SERVICE_CALIBRATE,
-    SERVICE_DIAGNOSTICS,
-)
+from custom_components.bed_manager.const import DATA_ENTITY_INDEX, DOMAIN
+from custom_components.bed_manager.services import EntityDeviceIndex
+from custom_components.bed_manager.state import BedState
 
 @pytest.fixture
 def mock_hass():
     """Create a mock hass object."""
     hass = AsyncMock(spec=HomeAssistant)
+    hass.data = {}
+    hass.config_entries = AsyncMock()
     hass.states = AsyncMock()
     hass.services = AsyncMock()
     return hass
@@ -39,6 +40,67 @@ def mock_device():
     device.async_diagnostics = AsyncMock()
     return device
 
+class FakeRegistry:
+    """Entity or device registry stand-in keyed by entity or device id."""
+
+    def __init__(self):
+        self.entities = {}
+        self.devices = {}
+
+    def async_get(self, key):
+        return self.entities.get(key) or self.devices.get(key)
+
+@pytest.fixture
+def registries(mock_hass):
+    """Patch in empty registries and capture the index's event listeners."""
+    entity_registry = FakeRegistry()
+    device_registry = FakeRegistry()
+    listeners = {}
+
+    def async_listen(event_type, listener):
+        listeners[event_type] = listener
+        return MagicMock()
+
+    def fire(event_type, **data):
+        listeners[event_type](Event(event_type, data))
+
+    mock_hass.bus = MagicMock()
+    mock_hass.bus.async_listen = async_listen
+    mock_hass.config_entries.async_get_entry = MagicMock(
+        side_effect=lambda entry_id: MagicMock(
+            domain=DOMAIN if entry_id.startswith("bed") else "other"
+        )
+    )
+    with patch.object(er, "async_get", return_value=entity_registry), patch.object(
+        dr, "async_get", return_value=device_registry
+    ):
+        yield entity_registry, device_registry, fire
+
+def _entity(entity_id, entry_id, platform=DOMAIN, area_id=None):
+    return er.RegistryEntry(
+        entity_id=entity_id,
+        unique_id=entity_id,
+        platform=platform,
+        config_entry_id=entry_id,
+        area_id=area_id,
+    )
+
+def _target(**data):
+    return ServiceCall(DOMAIN, "set_bed_head_position", data)
+
+@pytest.fixture
+def entity_index(mock_hass):
+    """Create an entity index holding one bed."""
+    index = EntityDeviceIndex(mock_hass)
+    index._entities.update(
+        {
+            "cover.test_bed_head": "test_entry",
+            "cover.test_bed_feet": "test_entry",
+        }
+    )
+    mock_hass.data[DATA_ENTITY_INDEX] = index
+    return index
+
 async def test_setup_entry(mock_hass, mock_device):
     """Test setting up the integration."""
     from custom_components.bed_manager import async_setup_entry
@@ -50,14 +112,18 @@ async def test_setup_entry(mock_hass, mock_device):
         "bed_type": "octo_bed",
     }
     
-    with patch("custom_components.bed_manager.BedManagerDevice", return_value=mock_device):
+    with patch(
+        "custom_components.bed_manager.BedManagerDevice", return_value=mock_device
+    ), patch("custom_components.bed_manager.async_setup_services"), patch(
+        "custom_components.bed_manager.bluetooth.async_register_callback"
+    ):
         result = await async_setup_entry(mock_hass, entry)
         
         assert result is True
         mock_device.async_setup.assert_called_once()
         mock_hass.data[DOMAIN][entry.entry_id] == mock_device
 
-async def test_set_head_position(mock_hass, mock_device):
+async def test_set_head_position(mock_hass, mock_device, entity_index):
     """Test setting head position."""
     from custom_components.bed_manager.services import async_set_head_position
     
@@ -67,19 +133,12 @@ async def test_set_head_position(mock_hass, mock_device):
         "position": 50.0,
     }
     
-    registry = AsyncMock()
-    entity = AsyncMock()
-    entity.platform = DOMAIN
-    entity.config_entry_id = "test_entry"
-    registry.async_get.return_value = entity
+    mock_hass.data[DOMAIN] = {"test_entry": mock_device}
+    await async_set_head_position(mock_hass, call)
     
-    with patch("homeassistant.helpers.entity_registry.async_get", return_value=registry):
-        mock_hass.data[DOMAIN] = {"test_entry": mock_device}
-        await async_set_head_position(mock_hass, call)
-        
-        mock_device.async_set_head_position.assert_called_once_with(50.0)
+    mock_device.async_set_head_position.assert_called_once_with(50.0)
 
-async def test_set_feet_position(mock_hass, mock_device):
+async def test_set_feet_position(mock_hass, mock_device, entity_index):
     """Test setting feet position."""
     from custom_components.bed_manager.services import async_set_feet_position
     
@@ -89,19 +148,28 @@ async def test_set_feet_position(mock_hass, mock_device):
         "position": 75.0,
     }
     
-    registry = AsyncMock()
-    entity = AsyncMock()
-    entity.platform = DOMAIN
-    entity.config_entry_id = "test_entry"
-    registry.async_get.return_value = entity
+    mock_hass.data[DOMAIN] = {"test_entry": mock_device}
+    await async_set_feet_position(mock_hass, call)
     
-    with patch("homeassistant.helpers.entity_registry.async_get", return_value=registry):
-        mock_hass.data[DOMAIN] = {"test_entry": mock_device}
-        await async_set_feet_position(mock_hass, call)
-        
-        mock_device.async_set_feet_position.assert_called_once_with(75.0)
+    mock_device.async_set_feet_position.assert_called_once_with(75.0)
 
-async def test_calibrate(mock_hass, mock_device):
+async def test_set_bed_position(mock_hass, mock_device, entity_index):
+    """Test setting head and feet position together."""
+    from custom_components.bed_manager.services import async_set_bed_position
+    
+    call = AsyncMock()
+    call.data = {
+        "entity_id": "cover.test_bed_head",
+        "head_position": 0.0,
+        "feet_position": 30.0,
+    }
+    
+    mock_hass.data[DOMAIN] = {"test_entry": mock_device}
+    await async_set_bed_position(mock_hass, call)
+    
+    mock_device.async_set_bed_position.assert_called_once_with(0.0, 30.0)
+
+async def test_calibrate(mock_hass, mock_device, entity_index):
     """Test calibration."""
     from custom_components.bed_manager.services import async_calibrate
     
@@ -111,19 +179,46 @@ async def test_calibrate(mock_hass, mock_device):
         "calibration_mode": 1,
     }
     
-    registry = AsyncMock()
-    entity = AsyncMock()
-    entity.platform = DOMAIN
-    entity.config_entry_id = "test_entry"
-    registry.async_get.return_value = entity
+    mock_hass.data[DOMAIN] = {"test_entry": mock_device}
+    await async_calibrate(mock_hass, call)
     
-    with patch("homeassistant.helpers.entity_registry.async_get", return_value=registry):
-        mock_hass.data[DOMAIN] = {"test_entry": mock_device}
-        await async_calibrate(mock_hass, call)
-        
-        mock_device.async_calibrate.assert_called_once_with(1)
+    mock_device.async_calibrate.assert_called_once_with(1)
+
+async def test_save_preset(mock_hass, mock_device, entity_index):
+    """Test saving a preset from the current and the given positions."""
+    from custom_components.bed_manager.services import async_save_preset
+    
+    call = AsyncMock()
+    call.data = {
+        "entity_id": "cover.test_bed_head",
+        "preset": "Reading",
+        "head_position": 60.0,
+    }
+    
+    mock_device.state = BedState(head_position=20.0, feet_position=10.0)
+    mock_hass.data[DOMAIN] = {"test_entry": mock_device}
+    await async_save_preset(mock_hass, call)
+    
+    mock_device.async_save_preset.assert_called_once_with(
+        "Reading", {"head_position": 60.0, "feet_position": 10.0}, 0, "none"
+    )
+
+async def test_delete_preset(mock_hass, mock_device, entity_index):
+    """Test deleting a preset."""
+    from custom_components.bed_manager.services import async_delete_preset
+    
+    call = AsyncMock()
+    call.data = {
+        "entity_id": "cover.test_bed_head",
+        "preset": "Reading",
+    }
+    
+    mock_hass.data[DOMAIN] = {"test_entry": mock_device}
+    await async_delete_preset(mock_hass, call)
+    
+    mock_device.async_delete_preset.assert_called_once_with("Reading")
 
-async def test_diagnostics(mock_hass, mock_device):
+async def test_diagnostics(mock_hass, mock_device, entity_index):
     """Test diagnostics."""
     from custom_components.bed_manager.services import async_diagnostics
     
@@ -132,24 +227,176 @@ async def test_diagnostics(mock_hass, mock_device):
         "entity_id": "cover.test_bed_head",
     }
     
-    registry = AsyncMock()
-    entity = AsyncMock()
-    entity.platform = DOMAIN
-    entity.config_entry_id = "test_entry"
-    registry.async_get.return_value = entity
-    
     mock_device.async_diagnostics.return_value = {
         "name": "Test Bed",
         "type": "octo_bed",
         "connected": True,
     }
     
-    with patch("homeassistant.helpers.entity_registry.async_get", return_value=registry):
-        mock_hass.data[DOMAIN] = {"test_entry": mock_device}
-        result = await async_diagnostics(mock_hass, call)
-        
-        assert result == {
-            "name": "Test Bed",
-            "type": "octo_bed",
-            "connected": True,
-        } 
\ No newline at end of file
+    mock_hass.data[DOMAIN] = {"test_entry": mock_device}
+    result = await async_diagnostics(mock_hass, call)
+    
+    assert result == {
+        "name": "Test Bed",
+        "type": "octo_bed",
+        "connected": True,
+    } 
+
+async def test_fan_out_to_several_beds(mock_hass, mock_device, entity_index):
+    """Test that an entity list reaches each targeted bed once."""
+    from custom_components.bed_manager.services import async_set_head_position
+    
+    other_device = AsyncMock()
+    entity_index._entities["cover.other_bed_head"] = "other_entry"
+    
+    call = AsyncMock()
+    call.data = {
+        "entity_id": [
+            "cover.test_bed_head",
+            "cover.test_bed_feet",
+            "cover.other_bed_head",
+        ],
+        "position": 20.0,
+    }
+    
+    mock_hass.data[DOMAIN] = {"test_entry": mock_device, "other_entry": other_device}
+    await async_set_head_position(mock_hass, call)
+    
+    mock_device.async_set_head_position.assert_called_once_with(20.0)
+    other_device.async_set_head_position.assert_called_once_with(20.0)
+
+def test_service_schemas_validate_input():
+    """Test that service arguments are coerced and range checked."""
+    import voluptuous as vol
+    from custom_components.bed_manager.services import (
+        CALIBRATE_SCHEMA,
+        SET_BED_POSITION_SCHEMA,
+        SET_POSITION_SCHEMA,
+    )
+    
+    data = SET_POSITION_SCHEMA({"entity_id": "cover.test_bed_head", "position": "50"})
+    assert data["position"] == 50.0
+    assert data["entity_id"] == ["cover.test_bed_head"]
+    
+    with pytest.raises(vol.Invalid):
+        SET_POSITION_SCHEMA({"entity_id": "cover.test_bed_head", "position": 150})
+    with pytest.raises(vol.Invalid):
+        SET_BED_POSITION_SCHEMA({"entity_id": "cover.test_bed_head"})
+    with pytest.raises(vol.Invalid):
+        CALIBRATE_SCHEMA({"entity_id": "cover.test_bed_head", "calibration_mode": 3})
+
+async def test_services_registered_once(mock_hass):
+    """Test that services are registered once and removed with the last bed."""
+    from custom_components.bed_manager.services import (
+        async_setup_services,
+        async_unload_services,
+    )
+    
+    mock_hass.services = MagicMock()
+    with patch.object(EntityDeviceIndex, "async_start"):
+        async_setup_services(mock_hass)
+        async_setup_services(mock_hass)
+    
+    assert mock_hass.services.async_register.call_count == 13
+    
+    async_unload_services(mock_hass)
+    
+    assert mock_hass.services.async_remove.call_count == 13
+    assert DATA_ENTITY_INDEX not in mock_hass.data
+
+async def test_index_follows_entity_registry(mock_hass, registries):
+    """Test that entity create, rename and remove events keep the index current."""
+    entity_registry, _, fire = registries
+    entity_registry.entities["cover.bed_head"] = _entity("cover.bed_head", "bed_1")
+    entity_registry.entities["light.lamp"] = _entity("light.lamp", "lamp", "hue")
+    index = EntityDeviceIndex(mock_hass)
+    index.async_start()
+    
+    assert index.async_resolve(_target(entity_id=["cover.bed_head"])) == ["bed_1"]
+    with pytest.raises(ValueError):
+        index.async_resolve(_target(entity_id=["light.lamp"]))
+    
+    entity_registry.entities["cover.bed_feet"] = _entity("cover.bed_feet", "bed_2")
+    fire(er.EVENT_ENTITY_REGISTRY_UPDATED, action="create", entity_id="cover.bed_feet")
+    assert index.async_resolve(_target(entity_id=["cover.bed_feet"])) == ["bed_2"]
+    
+    entity_registry.entities["cover.guest_bed_head"] = _entity(
+        "cover.guest_bed_head", "bed_1"
+    )
+    del entity_registry.entities["cover.bed_head"]
+    fire(
+        er.EVENT_ENTITY_REGISTRY_UPDATED,
+        action="update",
+        entity_id="cover.guest_bed_head",
+        old_entity_id="cover.bed_head",
+        changes={"entity_id": "cover.bed_head"},
+    )
+    assert index.async_resolve(_target(entity_id=["cover.guest_bed_head"])) == ["bed_1"]
+    with pytest.raises(ValueError):
+        index.async_resolve(_target(entity_id=["cover.bed_head"]))
+    
+    del entity_registry.entities["cover.bed_feet"]
+    fire(er.EVENT_ENTITY_REGISTRY_UPDATED, action="remove", entity_id="cover.bed_feet")
+    with pytest.raises(ValueError):
+        index.async_resolve(_target(entity_id=["cover.bed_feet"]))
+    assert index.async_resolve(_target(entity_id=ENTITY_MATCH_ALL)) == ["bed_1"]
+
+async def test_index_follows_device_registry(mock_hass, registries):
+    """Test that device create, update and remove events keep the index current."""
+    _, device_registry, fire = registries
+    index = EntityDeviceIndex(mock_hass)
+    index.async_start()
+    
+    device_registry.devices["device_1"] = dr.DeviceEntry(
+        id="device_1", config_entries={"lamp", "bed_1"}
+    )
+    fire(dr.EVENT_DEVICE_REGISTRY_UPDATED, action="create", device_id="device_1")
+    assert index.async_resolve(_target(device_id="device_1")) == ["bed_1"]
+    
+    device_registry.devices["device_1"] = dr.DeviceEntry(
+        id="device_1", config_entries={"lamp"}
+    )
+    fire(
+        dr.EVENT_DEVICE_REGISTRY_UPDATED,
+        action="update",
+        device_id="device_1",
+        changes={"config_entries": {"lamp", "bed_1"}},
+    )
+    with pytest.raises(ValueError):
+        index.async_resolve(_target(device_id="device_1"))
+    
+    device_registry.devices["device_2"] = dr.DeviceEntry(
+        id="device_2", config_entries={"bed_2"}
+    )
+    fire(dr.EVENT_DEVICE_REGISTRY_UPDATED, action="create", device_id="device_2")
+    assert index.async_resolve(_target(device_id=["device_2"])) == ["bed_2"]
+    del device_registry.devices["device_2"]
+    fire(dr.EVENT_DEVICE_REGISTRY_UPDATED, action="remove", device_id="device_2")
+    with pytest.raises(ValueError):
+        index.async_resolve(_target(device_id=["device_2"]))
+
+async def test_resolve_area_targets(mock_hass, registries):
+    """Test that an area targets beds by device and by entity area, once each."""
+    entity_registry, device_registry, _ = registries
+    device_registry.devices["device_1"] = dr.DeviceEntry(
+        id="device_1", config_entries={"bed_1"}, area_id="bedroom"
+    )
+    device_registry.devices["device_3"] = dr.DeviceEntry(
+        id="device_3", config_entries={"bed_3"}, area_id="guest_room"
+    )
+    entity_registry.entities.update(
+        {
+            "cover.bed_1_head": _entity("cover.bed_1_head", "bed_1", area_id="bedroom"),
+            "cover.bed_2_head": _entity("cover.bed_2_head", "bed_2", area_id="bedroom"),
+            "light.lamp": _entity("light.lamp", "lamp", "hue", area_id="bedroom"),
+        }
+    )
+    index = EntityDeviceIndex(mock_hass)
+    index.async_start()
+    
+    assert index.async_resolve(_target(area_id="bedroom")) == ["bed_1", "bed_2"]
+    assert index.async_resolve(
+        _target(area_id=["guest_room"], entity_id=["cover.bed_2_head"])
+    ) == ["bed_2", "bed_3"]
+    with pytest.raises(ValueError):
+        index.async_resolve(_target(area_id="kitchen"))
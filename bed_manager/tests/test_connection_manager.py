@@ -0,0 +1,67 @@
+"""Tests for the Bed Manager connection slot manager."""
+import asyncio
+
+import pytest
+
+from custom_components.bed_manager.connection_manager import (
+    ConnectionSlotManager,
+    SlotHolder,
+)
+
+
+class FakeBed:
+    """A slot holder whose idleness the test controls."""
+
+    def __init__(self, key: str) -> None:
+        self.idle = True
+        self.evicted = 0
+        self.holder = SlotHolder(key, lambda: self.idle, self._async_evict)
+
+    async def _async_evict(self) -> None:
+        self.evicted += 1
+
+
+@pytest.fixture
+def manager(hass):
+    """Create a manager for proxies with two slots."""
+    return ConnectionSlotManager(hass, 2)
+
+
+async def test_hot_bed_evicts_least_recently_used_idle_bed(manager):
+    """Test that a new bed takes the slot of the least recently used idle bed."""
+    a, b, c = (FakeBed(key) for key in "abc")
+    await manager.async_acquire("proxy", a.holder)
+    await manager.async_acquire("proxy", b.holder)
+    manager.touch("a")
+
+    await asyncio.wait_for(manager.async_acquire("proxy", c.holder), 1)
+
+    assert (a.evicted, b.evicted) == (0, 1)
+    assert manager.in_use("proxy") == 2
+    assert manager.evictions == 1
+
+    await manager.async_acquire("other_proxy", b.holder)
+    assert manager.in_use("other_proxy") == 1
+
+
+async def test_busy_beds_keep_slots_until_idle(manager):
+    """Test that waiting beds are served in order once a busy bed goes idle."""
+    a, b, c, d = (FakeBed(key) for key in "abcd")
+    a.idle = b.idle = False
+    await manager.async_acquire("proxy", a.holder)
+    await manager.async_acquire("proxy", b.holder)
+
+    waiting_c = asyncio.create_task(manager.async_acquire("proxy", c.holder))
+    waiting_d = asyncio.create_task(manager.async_acquire("proxy", d.holder))
+    await asyncio.sleep(0.01)
+    assert not waiting_c.done() and not waiting_d.done()
+
+    b.idle = True
+    manager.async_idle("b")
+    await asyncio.wait_for(waiting_c, 1)
+    assert b.evicted == 1
+    assert not waiting_d.done()
+
+    manager.release("a")
+    await asyncio.wait_for(waiting_d, 1)
+    assert manager.in_use("proxy") == 2
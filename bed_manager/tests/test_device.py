@@ -0,0 +1,344 @@
+"""Tests for the Bed Manager device."""
+import asyncio
+
+import pytest
+
+from custom_components.bed_manager.connection_manager import async_get_connection_manager
+from custom_components.bed_manager.const import AXIS_FEET, AXIS_HEAD
+from custom_components.bed_manager.const import RC2_CMD_STATUS
+from custom_components.bed_manager.protocol import (
+    build_frame,
+    movement_frame,
+    pin_frame,
+    stop_frame,
+)
+from custom_components.bed_manager.session import async_get_keepalive_wheel
+from custom_components.bed_manager.tests.fake_bed import make_device
+from custom_components.bed_manager.transport import BedConnectionError
+
+PIN = pin_frame("0000")
+
+
+@pytest.fixture
+def device(hass, transport):
+    """Create a device wired to the fake transport."""
+    device = make_device(hass, transport)
+    for estimator in device._estimators.values():
+        estimator.travel_up = estimator.travel_down = 0.5
+    return device
+
+
+async def test_commands_reuse_session(device, transport):
+    """Test that every command goes over one session."""
+    await device.async_setup()
+    await device.async_set_head_position(40.0)
+    await device.async_set_feet_position(20.0)
+    await device.async_stop()
+
+    assert transport.connects == 1
+    assert transport.frames == [
+        PIN,
+        movement_frame(1),
+        stop_frame(),
+        movement_frame(3),
+        stop_frame(),
+        stop_frame(),
+    ]
+    assert device._get_position(AXIS_FEET) == pytest.approx(20.0, abs=1)
+
+
+async def test_first_command_connects_lazily(device, transport):
+    """Test that a command connects when background setup has not run."""
+    assert not device.available
+
+    await device.async_set_head_position(10.0)
+
+    assert device.available
+    assert transport.connects == 1
+
+
+async def test_slider_burst_becomes_one_move(device, transport):
+    """Test that a burst of targets is coalesced into a single move."""
+    await asyncio.gather(
+        *(device.async_set_head_position(position) for position in (10, 20, 30, 40))
+    )
+
+    assert transport.frames == [PIN, movement_frame(1), stop_frame()]
+    assert device._get_position(AXIS_HEAD) == pytest.approx(40.0, abs=1)
+
+
+async def test_in_flight_move_is_retargeted(device, transport):
+    """Test that a move in the same direction is extended, not restarted."""
+    first = asyncio.create_task(device.async_set_head_position(20.0))
+    await asyncio.sleep(0.2)
+    await device.async_set_head_position(60.0)
+    await first
+
+    assert transport.frames == [PIN, movement_frame(1), stop_frame()]
+    assert device._get_position(AXIS_HEAD) == pytest.approx(60.0, abs=1)
+
+
+async def test_stop_ends_retargeted_move_quietly(device, transport):
+    """Test that a caller retargeted into a move sees a stop as an end, not an error."""
+    first = asyncio.create_task(device.async_set_head_position(50.0))
+    await asyncio.sleep(0.2)
+    retargeted = asyncio.create_task(device.async_set_head_position(80.0))
+    await asyncio.sleep(0.05)
+
+    await device.async_stop()
+    await asyncio.gather(first, retargeted)
+
+    assert device._retargeted_commands == 1
+    assert transport.frames[-1] == stop_frame()
+    assert device._get_position(AXIS_HEAD) < 50
+
+
+async def test_stop_preempts_running_move(device, transport):
+    """Test that stop aborts the running move and drops queued ones."""
+    head = asyncio.create_task(device.async_set_head_position(100.0))
+    feet = asyncio.create_task(device.async_set_feet_position(100.0))
+    await asyncio.sleep(0.25)
+
+    await device.async_stop()
+    await asyncio.gather(head, feet)
+
+    assert transport.frames[-1] == stop_frame()
+    assert movement_frame(3) not in transport.frames
+    assert not device._movement_in_progress
+    assert device._current_movement_type == 0
+    assert 0 < device._get_position(AXIS_HEAD) < 100
+
+
+async def test_unload_mid_move_stays_disconnected(device, transport):
+    """Test that a move cancelled by unload stops the bed and never reconnects."""
+    move = asyncio.create_task(device.async_set_head_position(100.0))
+    await asyncio.sleep(0.25)
+
+    await device.async_unload()
+    await asyncio.gather(move, return_exceptions=True)
+
+    assert transport.frames == [PIN, movement_frame(1), stop_frame()]
+    assert not transport.is_connected
+    assert transport.connects == 1
+    assert not async_get_keepalive_wheel(device.hass)
+    assert async_get_connection_manager(device.hass).in_use(transport.source) == 0
+
+
+async def test_move_ending_after_link_drop_does_not_reconnect(device, transport):
+    """Test that the final stop of a move is skipped once the link is gone."""
+    move = asyncio.create_task(device.async_set_head_position(60.0))
+    await asyncio.sleep(0.25)
+    await transport.async_disconnect()
+    device._handle_disconnected()
+    await move
+
+    assert transport.frames == [PIN, movement_frame(1)]
+    assert transport.connects == 1
+    device._reconnect.cancel()
+
+
+async def test_bed_position_uses_dual_axis_move(device, transport):
+    """Test that a shared direction becomes one dual move plus a remainder."""
+    await device.async_set_bed_position(80.0, 20.0)
+
+    assert transport.frames == [PIN, movement_frame(5), movement_frame(1), stop_frame()]
+    assert device._get_position(AXIS_HEAD) == pytest.approx(80.0, abs=1)
+    assert device._get_position(AXIS_FEET) == pytest.approx(20.0, abs=1)
+
+
+async def test_estimator_stops_on_target_with_latency(device, transport):
+    """Test that the scheduled stop compensates for start and stop latency."""
+    estimator = device._estimators[AXIS_FEET]
+    estimator.travel_up = estimator.travel_down = 2.0
+    estimator.start_latency = 0.1
+    estimator.stop_latency = 0.05
+
+    await device.async_set_feet_position(50.0)
+
+    assert device._get_position(AXIS_FEET) == pytest.approx(50.0, abs=2)
+
+
+async def _wait_for_marker(device, previous=None):
+    while device._calibration_marker in (None, previous):
+        await asyncio.sleep(0.01)
+    return device._calibration_marker
+
+
+async def test_calibration_measures_travel_times(device, transport):
+    """Test that calibration times both directions between marks."""
+    await device.async_calibrate(1)
+    assert device._calibration_mode == 1
+
+    marker = await _wait_for_marker(device)
+    await asyncio.sleep(0.4)
+    await device.async_calibrate(0)
+    await _wait_for_marker(device, marker)
+    await asyncio.sleep(0.3)
+    await device.async_calibrate(0)
+    await device._calibration_task
+
+    start_latency = device._estimators[AXIS_HEAD].start_latency
+    assert device._calibration.travel_time(AXIS_HEAD, True) == pytest.approx(
+        0.4 - start_latency, abs=0.05
+    )
+    assert device._calibration.travel_time(AXIS_HEAD, False) == pytest.approx(
+        0.3 - start_latency, abs=0.05
+    )
+    assert device._estimators[AXIS_HEAD].travel_up == pytest.approx(0.25, abs=0.05)
+    assert device._calibration_mode == 0
+    assert device._get_position(AXIS_HEAD) == 0.0
+
+
+async def test_calibration_dropped_by_stop_can_restart(device, transport):
+    """Test that a calibration a stop drops before it runs is not left pending."""
+    move = asyncio.create_task(device.async_set_head_position(100.0))
+    await asyncio.sleep(0.25)
+    await device.async_calibrate(2)
+    await asyncio.sleep(0.05)
+    assert device._calibration_mode == 2
+    await device.async_stop()
+    await asyncio.gather(move, device._calibration_task)
+
+    assert device._calibration_mode == 0
+    assert device._is_idle()
+    await device.async_calibrate(2)
+    await _wait_for_marker(device)
+    await device.async_stop()
+    await device._calibration_task
+    assert device._calibration_mode == 0
+
+
+async def test_calibration_failure_is_reported(device, transport, caplog):
+    """Test that a calibration run that fails is logged and cleared."""
+    await device.async_connect()
+
+    async def broken_write(data):
+        raise BedConnectionError("write failed")
+
+    transport.async_write = broken_write
+    await device.async_calibrate(1)
+    await device._calibration_task
+
+    assert device._calibration_mode == 0
+    assert "Calibration of head on bed Test Bed failed: write failed" in caplog.text
+
+
+async def test_calibration_is_not_superseded_by_a_move(device, transport):
+    """Test that a move queued behind a calibration waits for it."""
+    move = asyncio.create_task(device.async_set_head_position(100.0))
+    await asyncio.sleep(0.25)
+    await device.async_calibrate(2)
+    feet = asyncio.create_task(device.async_set_feet_position(50.0))
+    marker = await _wait_for_marker(device)
+    await asyncio.sleep(0.4)
+    await device.async_calibrate(0)
+    await _wait_for_marker(device, marker)
+    await asyncio.sleep(0.4)
+    await device.async_calibrate(0)
+    await asyncio.gather(move, feet, device._calibration_task)
+
+    assert device._calibration_mode == 0
+    assert device._get_position(AXIS_FEET) == pytest.approx(50.0, abs=1)
+
+
+async def test_preset_recall_skips_axes_on_target(device, transport):
+    """Test that recalling a preset only moves axes that are off target."""
+    await device.async_save_preset(
+        "reading", {"head_position": 60.0, "feet_position": 0.0}, 0, "none"
+    )
+
+    await device.async_load_preset("reading")
+
+    assert device.presets == ["reading"]
+    assert transport.frames == [PIN, movement_frame(1), stop_frame()]
+    assert device._get_position(AXIS_HEAD) == pytest.approx(60.0, abs=1)
+
+
+async def test_deleted_preset_leaves_the_state(device, transport):
+    """Test that deleting a preset removes it from the snapshot, once."""
+    await device.async_save_preset("reading", {"head_position": 60.0}, 0, "none")
+
+    await device.async_delete_preset("reading")
+    await device.async_delete_preset("reading")
+
+    assert device.state.presets == ()
+    with pytest.raises(ValueError):
+        await device.async_load_preset("reading")
+
+
+async def test_status_notification_updates_state(device, transport):
+    """Test that a pushed status report corrects the position and notifies."""
+    updates = []
+    remove = device.async_add_listener(lambda: updates.append(device._get_position(AXIS_HEAD)))
+
+    transport._notification_callback(build_frame(RC2_CMD_STATUS, (35, 10, 0)))
+    transport._notification_callback(b"\x40\x00\x40")
+    remove()
+    transport._notification_callback(build_frame(RC2_CMD_STATUS, (50, 10, 0)))
+
+    assert updates == [35.0]
+    assert device._get_position(AXIS_FEET) == 10.0
+
+
+async def test_listener_writes_are_throttled_while_moving(device, transport):
+    """Test that a move refreshes listeners at a bounded rate and ends exact."""
+    updates = []
+    device.async_add_listener(lambda: updates.append(device._movement_in_progress))
+    await device.async_setup()
+    updates.clear()
+
+    move = asyncio.create_task(device.async_set_head_position(100.0))
+    await asyncio.sleep(0.3)
+    for position in range(20, 40):
+        transport._notification_callback(build_frame(RC2_CMD_STATUS, (position, 0, 1)))
+    await move
+
+    assert 2 <= len(updates) <= 5
+    assert updates[-1] is False
+    assert device._get_position(AXIS_HEAD) == 100.0
+
+
+async def test_pin_sent_once_per_connection(device, transport):
+    """Test that commands reuse the session and a dropped link re-authenticates."""
+    await device.async_setup()
+    await device.async_set_head_position(30.0)
+    assert transport.frames.count(PIN) == 1
+    assert len(device.hass.data["bed_manager_keepalive"]) == 1
+
+    transport._connected = False
+    transport._disconnected_callback()
+    assert len(device.hass.data["bed_manager_keepalive"]) == 0
+
+    await device.async_set_head_position(10.0)
+    assert transport.frames.count(PIN) == 2
+    assert transport.frames[-3:] == [PIN, movement_frame(2), stop_frame()]
+
+
+async def test_diagnostics_include_latency_metrics(device, transport):
+    """Test that connect, queue and acknowledgement latency are recorded."""
+    await device.async_set_head_position(20.0)
+    transport._notification_callback(build_frame(RC2_CMD_STATUS, (20, 0, 0)))
+
+    metrics = (await device.async_diagnostics())["metrics"]
+
+    assert metrics["connect"]["count"] == 1
+    assert metrics["queue_to_write"]["count"] == 1
+    assert metrics["write_to_ack"]["count"] == 1
+    assert metrics["queue_to_write"]["p95_ms"] < 100
+
+
+async def test_confirmed_move_feeds_calibration(device, transport):
+    """Test that a move the bed confirms is learned from via the history."""
+    await device.async_set_head_position(50.0)
+    slot = device._unconfirmed_moves[AXIS_HEAD]
+    assert not device.history.record(slot).confirmed
+
+    transport._notification_callback(build_frame(RC2_CMD_STATUS, (40, 0, 0)))
+
+    assert AXIS_HEAD not in device._unconfirmed_moves
+    record = device.history.record(slot)
+    assert record.confirmed
+    assert record.end_position == 40.0
+    assert device._calibration.travel_time(AXIS_HEAD, True) == pytest.approx(
+        record.duration * 100 / 40, rel=0.01
+    )
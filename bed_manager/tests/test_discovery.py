@@ -0,0 +1,75 @@
+"""Tests for the Bed Manager bluetooth discovery."""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bleak.exc import BleakError
+
+from custom_components.bed_manager.connection_manager import async_get_connection_manager
+from custom_components.bed_manager.const import RC2_SERVICE_UUID
+from custom_components.bed_manager.discovery import (
+    async_confirm_candidates,
+    rank_candidates,
+)
+
+
+def _service_info(address, name, rssi, service_uuids=(RC2_SERVICE_UUID,), source="proxy"):
+    info = MagicMock()
+    info.address = address
+    info.name = name
+    info.rssi = rssi
+    info.service_uuids = list(service_uuids)
+    info.source = source
+    return info
+
+
+def test_rank_candidates_filters_and_sorts_by_signal():
+    """Test that only RC2 devices are offered, strongest first, once each."""
+    infos = [
+        _service_info("AA", "RC2", -80),
+        _service_info("BB", "Kettle", -40, service_uuids=()),
+        _service_info("CC", "RC2 bedroom", -50, service_uuids=()),
+        _service_info("AA", "RC2", -60, source="other_proxy"),
+        _service_info("DD", "RC2", -30),
+    ]
+
+    ranked = rank_candidates(infos, exclude=["DD"])
+
+    assert list(ranked) == ["CC", "AA"]
+    assert ranked["AA"].source == "other_proxy"
+
+
+async def test_only_name_matches_are_probed():
+    """Test that devices not advertising the RC2 service are probed."""
+    candidates = rank_candidates(
+        [
+            _service_info("AA", "RC2", -60),
+            _service_info("BB", "RC2", -70, service_uuids=()),
+            _service_info("CC", "RC2", -80, service_uuids=()),
+        ]
+    )
+    probe = AsyncMock(side_effect=lambda hass, info, timeout: info.address == "BB")
+
+    with patch("custom_components.bed_manager.discovery.async_probe", probe):
+        confirmed = await async_confirm_candidates(MagicMock(), candidates, 5)
+
+    assert list(confirmed) == ["AA", "BB"]
+    assert sorted(call.args[1].address for call in probe.await_args_list) == ["BB", "CC"]
+
+
+async def test_probe_that_fails_to_connect_rejects_the_candidate(hass):
+    """Test that a Bleak error while probing rejects the device, not the flow."""
+    candidates = rank_candidates(
+        [
+            _service_info("AA", "RC2", -60),
+            _service_info("BB", "RC2", -70, service_uuids=()),
+        ]
+    )
+
+    with patch.multiple(
+        "custom_components.bed_manager.transport",
+        establish_connection=AsyncMock(side_effect=BleakError("out of slots")),
+        bluetooth=MagicMock(),
+    ):
+        confirmed = await async_confirm_candidates(hass, candidates, 5)
+
+    assert list(confirmed) == ["AA"]
+    assert async_get_connection_manager(hass).in_use("proxy") == 0
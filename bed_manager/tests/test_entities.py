@@ -0,0 +1,89 @@
+"""Tests for the Bed Manager entities."""
+import pytest
+from unittest.mock import AsyncMock
+
+from custom_components.bed_manager.button import BUTTONS, BedButton
+from custom_components.bed_manager.const import (
+    AXIS_FEET,
+    AXIS_HEAD,
+    ATTR_FEET_POSITION,
+    ATTR_HEAD_POSITION,
+    RC2_CMD_STATUS,
+)
+from custom_components.bed_manager.coordinator import BedManagerCoordinator
+from custom_components.bed_manager.cover import BedSectionCover
+from custom_components.bed_manager.protocol import build_frame
+from custom_components.bed_manager.select import BedPresetSelect
+from custom_components.bed_manager.tests.fake_bed import make_device
+
+
+@pytest.fixture
+def coordinator(hass, transport):
+    """Create a coordinator for a bed on the fake transport."""
+    return BedManagerCoordinator(hass, make_device(hass, transport))
+
+
+async def test_entities_share_one_subscription(coordinator, transport):
+    """Test that all entities of a bed follow one device listener."""
+    await coordinator.async_refresh()
+    coordinator.async_start()
+    head = BedSectionCover(coordinator, AXIS_HEAD, "Head", ATTR_HEAD_POSITION)
+    entities = [
+        head,
+        BedPresetSelect(coordinator),
+        *(BedButton(coordinator, description) for description in BUTTONS),
+    ]
+    updates = []
+    for _ in entities:
+        coordinator.async_add_listener(lambda: updates.append(None))
+
+    transport._notification_callback(build_frame(RC2_CMD_STATUS, (35, 0, 1)))
+
+    assert len(coordinator.device._listeners) == 1
+    assert len(updates) == len(entities)
+    assert head.current_cover_position == 35
+    assert head.is_opening and not head.is_closing
+    assert len({entity.unique_id for entity in entities}) == len(entities)
+
+
+async def test_entities_write_only_when_their_field_changes(coordinator, transport):
+    """Test that an update only writes the entities showing a changed field."""
+    await coordinator.async_refresh()
+    coordinator.async_start()
+    head = BedSectionCover(coordinator, AXIS_HEAD, "Head", ATTR_HEAD_POSITION)
+    feet = BedSectionCover(coordinator, AXIS_FEET, "Feet", ATTR_FEET_POSITION)
+    preset = BedPresetSelect(coordinator)
+    button = BedButton(coordinator, BUTTONS[0])
+    writes = {}
+    for entity in (head, feet, preset, button):
+        writes[entity] = 0
+        entity.async_write_ha_state = lambda entity=entity: writes.__setitem__(
+            entity, writes[entity] + 1
+        )
+        coordinator.async_add_listener(entity._handle_coordinator_update)
+
+    transport._notification_callback(build_frame(RC2_CMD_STATUS, (35, 0, 0)))
+    # Nothing the entities show changed.
+    transport._notification_callback(build_frame(RC2_CMD_STATUS, (35, 0, 0)))
+    await coordinator.device.async_save_preset(
+        "reading", {ATTR_HEAD_POSITION: 60.0}, 0, "none"
+    )
+
+    assert writes == {head: 1, feet: 0, preset: 1, button: 0}
+    assert coordinator.data.head_position == 35.0
+    assert coordinator.changes == {"presets"}
+    assert preset.options == ["reading"]
+
+
+async def test_preset_select_shows_only_reached_presets(coordinator):
+    """Test that a recall that fails leaves the select on the previous preset."""
+    preset = BedPresetSelect(coordinator)
+    preset.async_write_ha_state = lambda: None
+    coordinator.device.async_load_preset = AsyncMock()
+    await preset.async_select_option("reading")
+    coordinator.device.async_load_preset.side_effect = ValueError("Preset gone")
+
+    with pytest.raises(ValueError):
+        await preset.async_select_option("flat")
+
+    assert preset.current_option == "reading"
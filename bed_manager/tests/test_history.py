@@ -0,0 +1,41 @@
+"""Tests for the Bed Manager movement history."""
+from custom_components.bed_manager.const import AXIS_FEET, AXIS_HEAD
+from custom_components.bed_manager.history import MovementHistory
+
+
+def test_history_wraps_in_place():
+    """Test that the ring buffer keeps the newest movements in order."""
+    history = MovementHistory(3)
+    columns = history._timestamps
+    slots = [
+        history.append(float(index), AXIS_HEAD if index % 2 else AXIS_FEET, 1, 0.0, 10.0 * index, 1.5)
+        for index in range(5)
+    ]
+
+    assert history._timestamps is columns
+    assert len(history) == 3
+    assert history.total == 5
+    assert slots == [0, 1, 2, 0, 1]
+    assert [record.timestamp for record in history] == [2.0, 3.0, 4.0]
+    assert history.record(slots[3]) == (3.0, AXIS_HEAD, 1, 0.0, 30.0, 1.5, False)
+
+
+def test_confirmed_movement_is_exported():
+    """Test that a reported end position replaces the estimate."""
+    history = MovementHistory(4)
+    index = history.append(1.0, AXIS_FEET, 4, 60.0, 20.0, 2.0)
+
+    record = history.confirm(index, 22.0)
+
+    assert record.confirmed and not record.moving_up
+    assert history.as_list() == [
+        {
+            "timestamp": 1.0,
+            "axis": AXIS_FEET,
+            "movement_type": 4,
+            "start_position": 60.0,
+            "end_position": 22.0,
+            "duration": 2.0,
+            "confirmed": True,
+        }
+    ]
@@ -0,0 +1,19 @@
+"""Tests for the Bed Manager metrics."""
+from custom_components.bed_manager.metrics import LatencyHistogram
+
+
+def test_histogram_percentiles_use_bucket_bounds():
+    """Test that percentiles come from fixed buckets, capped at the maximum."""
+    histogram = LatencyHistogram((10, 100, 1000))
+    assert histogram.percentile(0.5) is None
+    assert histogram.as_dict() == {"count": 0}
+
+    for seconds in (0.004, 0.006, 0.008, 0.05, 2.0):
+        histogram.record(seconds)
+
+    assert histogram.percentile(0.5) == 10
+    assert histogram.percentile(0.8) == 100
+    assert histogram.percentile(1.0) == 2000
+    summary = histogram.as_dict()
+    assert summary["count"] == 5
+    assert summary["buckets"] == {"<=10ms": 3, "<=100ms": 1, ">1000ms": 1}
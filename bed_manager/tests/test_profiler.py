@@ -0,0 +1,110 @@
+"""Tests for the Bed Manager event loop profiler."""
+import asyncio
+import logging
+import time
+
+import pytest
+
+from custom_components.bed_manager.profiler import LazyHex, LoopProfiler, SampledLogger
+from custom_components.bed_manager.tests.fake_bed import (
+    SimulatedBed,
+    SimulatedBedTransport,
+    make_device,
+    make_hass,
+    run_virtual,
+)
+
+
+async def test_blocking_step_is_flagged():
+    """Test that only the segment between two awaits that blocks is flagged."""
+    profiler = LoopProfiler("Test Bed", threshold=0.01)
+
+    async def operation(value):
+        await asyncio.sleep(0)
+        time.sleep(0.02)
+        await asyncio.sleep(0)
+        return value * 2
+
+    profiled = profiler.wrap_coroutine_function("operation", operation)
+
+    assert await profiled(21) == 42
+    stats = profiler.stats["operation"]
+    assert stats.steps == 3
+    assert stats.slow == 1
+    assert profiler.slow_segments[0]["duration_ms"] >= 20
+
+
+async def test_profiled_coroutine_passes_errors_and_cancellation():
+    """Test that exceptions and cancellation reach the wrapped coroutine."""
+    profiler = LoopProfiler("Test Bed", threshold=1)
+    cancelled = asyncio.Event()
+
+    async def waits_forever():
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def fails():
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    task = asyncio.ensure_future(profiler.wrap_coroutine_function("wait", waits_forever)())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    with pytest.raises(ValueError):
+        await profiler.wrap_coroutine_function("fail", fails)()
+
+    assert cancelled.is_set()
+    assert profiler.stats["fail"].steps == 2
+
+
+def test_sampled_logger_formats_lazily(caplog):
+    """Test that one record in N is kept and arguments are formatted only then."""
+    logger = logging.getLogger("custom_components.bed_manager.test_sampling")
+    sampled = SampledLogger(logger, 10)
+
+    class Counting(LazyHex):
+        formatted = 0
+
+        def __str__(self):
+            Counting.formatted += 1
+            return super().__str__()
+
+    with caplog.at_level(logging.DEBUG, logger=logger.name):
+        for _ in range(25):
+            sampled.debug("Frame %s", Counting(b"\x40\x02"))
+    messages = [record.getMessage() for record in caplog.records]
+    formatted = Counting.formatted
+    logger.setLevel(logging.INFO)
+    sampled.debug("Frame %s", Counting(b"\x40"))
+
+    assert messages == ["Frame 4002 (1 of 10)"] * 3
+    assert Counting.formatted == formatted
+
+
+def test_device_profiling_reports_through_diagnostics():
+    """Test that profiling a device times its steps and can be switched off."""
+    bed = SimulatedBed()
+    device = make_device(make_hass(), SimulatedBedTransport(bed))
+
+    async def scenario():
+        device.async_set_profiling(True)
+        await device.async_set_head_position(30.0)
+        await asyncio.sleep(1)
+        device.async_set_profiling(False)
+        return (await device.async_diagnostics())["profile"], bed.position("head")
+
+    profile, position = run_virtual(scenario())
+
+    operations = profile["operations"]
+    assert operations["async_set_head_position"]["steps"] > 1
+    # Reached through the coalescer, which was built before profiling began.
+    assert operations["_async_dispatch_move"]["steps"] > 0
+    assert operations["_handle_notification"]["steps"] > 0
+    assert operations["_async_send"]["steps"] > 0
+    assert "_handle_notification" not in vars(device)
+    assert position == pytest.approx(30.0, abs=1.5)
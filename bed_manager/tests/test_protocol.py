@@ -0,0 +1,64 @@
+"""Tests for the Octo RC2 protocol codec."""
+import pytest
+
+from custom_components.bed_manager.const import RC2_CMD_PIN, RC2_CMD_STATUS
+from custom_components.bed_manager.protocol import (
+    FRAME_OVERHEAD,
+    Status,
+    build_frame,
+    build_frame_into,
+    decode_frame,
+    decode_status,
+    iter_frames,
+    movement_frame,
+    pin_frame,
+    stop_frame,
+)
+
+
+def test_constant_frames_are_precomputed():
+    """Test that constant frames are shared objects, not rebuilt per call."""
+    assert movement_frame(0) is stop_frame()
+    assert movement_frame(5) is movement_frame(5)
+    assert pin_frame("1234") is pin_frame("1234")
+    assert movement_frame(1) == bytes.fromhex("40027000018b0240")
+    with pytest.raises(ValueError):
+        movement_frame(7)
+
+
+def test_build_frame_into_reuses_buffer():
+    """Test that a frame built into a buffer matches the allocating builder."""
+    buffer = bytearray(16)
+    frame = build_frame_into(buffer, RC2_CMD_PIN, (1, 2, 3, 4))
+
+    assert frame.obj is buffer
+    assert bytes(frame) == pin_frame("1234")
+    assert len(frame) == FRAME_OVERHEAD + 4
+    with pytest.raises(ValueError):
+        build_frame_into(bytearray(8), RC2_CMD_PIN, (1, 2, 3, 4))
+
+
+def test_decode_rejects_corrupt_frames():
+    """Test that bad checksums and lengths are rejected."""
+    frame = bytearray(build_frame(RC2_CMD_STATUS, (35, 10, 0)))
+    command, data = decode_frame(frame)
+    assert command == RC2_CMD_STATUS
+    assert bytes(data) == bytes((35, 10, 0))
+
+    frame[6] ^= 0xFF
+    assert decode_frame(frame) is None
+    assert decode_status(frame) is None
+    assert decode_frame(frame[:-2]) is None
+
+
+def test_decode_status_from_batched_notification():
+    """Test that the latest status wins when frames arrive back to back."""
+    payload = (
+        b"\x40\x00"
+        + build_frame(RC2_CMD_STATUS, (10, 20, 1))
+        + stop_frame()
+        + build_frame(RC2_CMD_STATUS, (64, 20, 0))
+    )
+
+    assert len(list(iter_frames(payload))) == 3
+    assert decode_status(payload) == Status(64, 20, 0)
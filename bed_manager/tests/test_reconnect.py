@@ -0,0 +1,103 @@
+"""Tests for the Bed Manager reconnect engine."""
+import asyncio
+
+import pytest
+
+from custom_components.bed_manager.reconnect import BedUnavailableError, ReconnectEngine
+from custom_components.bed_manager.tests.fake_bed import make_hass, run_virtual
+from custom_components.bed_manager.transport import BedConnectionError
+
+
+class FlakyBed:
+    """Connect target that fails a number of times before it comes back."""
+
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.calls = 0
+        self.engine: ReconnectEngine | None = None
+
+    async def async_connect(self) -> None:
+        self.calls += 1
+        self.engine.check()
+        if self.calls <= self.failures:
+            self.engine.record_failure()
+            raise BedConnectionError("out of range")
+        self.engine.record_success()
+
+
+def _engine(bed: FlakyBed, base_delay: float = 0.01) -> ReconnectEngine:
+    bed.engine = ReconnectEngine(
+        make_hass(), "Test Bed", bed.async_connect, base_delay=base_delay, max_delay=0.2, threshold=2
+    )
+    return bed.engine
+
+
+def test_backoff_grows_with_jitter():
+    """Test that delays double per failure, stay jittered and are capped."""
+    engine = _engine(FlakyBed(0), base_delay=1.0)
+    engine._max_delay = 60.0
+    for failures, ceiling in ((0, 1.0), (3, 8.0), (10, 60.0)):
+        engine._failures = failures
+        delays = {engine.delay() for _ in range(20)}
+        assert all(ceiling / 2 <= delay <= ceiling for delay in delays)
+        assert len(delays) > 1
+
+
+async def test_breaker_fails_fast_then_recovers():
+    """Test that commands fail fast while down and the bed is retried until back."""
+    bed = FlakyBed(3)
+    engine = _engine(bed)
+
+    for _ in range(2):
+        with pytest.raises(BedConnectionError):
+            await bed.async_connect()
+    assert engine.is_open
+    with pytest.raises(BedUnavailableError):
+        engine.check()
+
+    for _ in range(100):
+        if not engine.is_open:
+            break
+        await asyncio.sleep(0.01)
+    assert not engine.is_open
+    assert bed.calls == 4
+    assert engine.attempts == 2
+
+
+def test_advertisement_brings_retry_forward():
+    """Test that hearing the bed again cuts the backoff down to the base delay."""
+    bed = FlakyBed(1)
+    engine = _engine(bed, base_delay=1.0)
+    engine._max_delay = 600.0
+
+    async def scenario():
+        with pytest.raises(BedConnectionError):
+            await bed.async_connect()
+        await asyncio.sleep(0.5)
+        engine.async_advertised()
+        retry_at = engine._retry_at
+        await asyncio.sleep(0.51)
+        return retry_at
+
+    assert run_virtual(scenario()) == pytest.approx(1.0)
+    assert bed.calls == 2
+    assert engine._handle is None
+    assert not engine.is_open
+
+
+def test_advertisements_are_rate_limited():
+    """Test that a bed advertising constantly is retried once per base delay."""
+    bed = FlakyBed(1000)
+    engine = _engine(bed, base_delay=2.0)
+    engine._max_delay = 600.0
+
+    async def scenario():
+        with pytest.raises(BedConnectionError):
+            await bed.async_connect()
+        for _ in range(100):
+            engine.async_advertised()
+            await asyncio.sleep(0.1)
+
+    run_virtual(scenario())
+
+    assert 4 <= engine.attempts <= 5
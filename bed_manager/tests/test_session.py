@@ -0,0 +1,42 @@
+"""Tests for the Bed Manager PIN session and keep-alive wheel."""
+import asyncio
+
+from custom_components.bed_manager.session import KeepAliveWheel, PinSession
+
+
+async def test_wheel_calls_each_bed_once_per_interval():
+    """Test that one timer spreads the keep-alives of many beds."""
+    wheel = KeepAliveWheel(0.1, 0.02)
+    calls = {key: 0 for key in ("a", "b", "c")}
+    for key in calls:
+        wheel.async_add(key, lambda key=key: calls.__setitem__(key, calls[key] + 1))
+
+    assert len({wheel._slot_of[key] for key in calls}) == 3
+    await asyncio.sleep(0.25)
+    wheel.async_remove("a")
+    removed = calls["a"]
+    await asyncio.sleep(0.12)
+
+    assert all(2 <= count <= 4 for count in calls.values())
+    assert calls["a"] == removed
+    for key in ("b", "c"):
+        wheel.async_remove(key)
+    assert wheel._handle is None
+
+
+async def test_session_authenticates_once():
+    """Test that concurrent commands share one PIN write."""
+    sent = []
+
+    async def send(frame):
+        await asyncio.sleep(0.01)
+        sent.append(frame)
+
+    session = PinSession("1234", send)
+    await asyncio.gather(*(session.async_ensure_authenticated() for _ in range(5)))
+    assert len(sent) == 1
+    assert session.authentications == 1
+
+    session.invalidate()
+    await session.async_keep_alive()
+    assert len(sent) == 1
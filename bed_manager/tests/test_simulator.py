@@ -0,0 +1,256 @@
+"""Device tests against the simulated RC2 bed on virtual time."""
+import asyncio
+
+import pytest
+from unittest.mock import MagicMock
+
+from custom_components.bed_manager.const import (
+    AXIS_FEET,
+    AXIS_HEAD,
+    DATA_ENTITY_INDEX,
+    DATA_GROUPS,
+    DOMAIN,
+    RECONNECT_BASE_DELAY,
+)
+from custom_components.bed_manager.coordinator import BedManagerCoordinator
+from custom_components.bed_manager.groups import BedGroupStore, async_run_group
+from custom_components.bed_manager.reconnect import BedUnavailableError
+from custom_components.bed_manager.sensor import SENSORS, BedSensor
+from custom_components.bed_manager.services import (
+    SET_GROUP_POSITION_SCHEMA,
+    EntityDeviceIndex,
+    async_set_bed_position,
+    async_set_group_position,
+)
+from custom_components.bed_manager.tests.fake_bed import (
+    SimulatedBed,
+    SimulatedBedTransport,
+    make_device,
+    make_hass,
+    run_virtual,
+)
+
+
+def test_virtual_clock_skips_waiting():
+    """Test that sleeps cost no wall time on the virtual loop."""
+
+    async def sleep_long():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.sleep(3600)
+        return loop.time() - start
+
+    assert run_virtual(sleep_long()) == pytest.approx(3600)
+
+
+def test_moves_land_on_target():
+    """Test that planned moves stop where the real motors end up."""
+    bed = SimulatedBed(travel_up=30.0, travel_down=25.0)
+    transport = SimulatedBedTransport(bed)
+    device = make_device(make_hass(), transport)
+
+    async def scenario():
+        await device.async_set_bed_position(60.0, 30.0)
+        await asyncio.sleep(1)
+        moved_up = bed.position(AXIS_HEAD), bed.position(AXIS_FEET)
+        # The device assumes 30 s down as well; status reports correct it.
+        await device.async_set_head_position(20.0)
+        await asyncio.sleep(1)
+        return moved_up, bed.position(AXIS_HEAD), device._get_position(AXIS_HEAD)
+
+    (head_up, feet_up), head_down, estimate = run_virtual(scenario())
+
+    assert head_up == pytest.approx(60.0, abs=1.5)
+    assert feet_up == pytest.approx(30.0, abs=1.5)
+    assert head_down == pytest.approx(20.0, abs=2.0)
+    assert estimate == pytest.approx(head_down, abs=1.0)
+    assert bed.frames_ignored == 0
+    assert transport.connects == 1
+
+
+def test_lossy_notifications_still_converge():
+    """Test that losing most status reports only costs estimate accuracy."""
+    bed = SimulatedBed()
+    transport = SimulatedBedTransport(bed, loss=0.5, seed=3)
+    device = make_device(make_hass(), transport)
+
+    async def scenario():
+        for target in (80.0, 10.0, 45.0):
+            await device.async_set_feet_position(target)
+        await asyncio.sleep(1)
+        return bed.position(AXIS_FEET)
+
+    assert run_virtual(scenario()) == pytest.approx(45.0, abs=3.0)
+
+
+def test_reconnects_after_the_bed_returns():
+    """Test fail-fast while the bed is gone and recovery when it is heard again."""
+    bed = SimulatedBed()
+    transport = SimulatedBedTransport(bed)
+    device = make_device(make_hass(), transport)
+
+    async def scenario():
+        await device.async_setup()
+        bed.reachable = False
+        transport.drop()
+        await asyncio.sleep(60)
+        with pytest.raises(BedUnavailableError):
+            await device.async_set_head_position(50.0)
+
+        bed.reachable = True
+        device.async_handle_advertisement(MagicMock(), MagicMock())
+        # The retry is brought forward, but no closer than the base delay
+        # to the last failure.
+        await asyncio.sleep(RECONNECT_BASE_DELAY)
+        await device.async_set_head_position(50.0)
+        return device.available, bed.position(AXIS_HEAD)
+
+    available, position = run_virtual(scenario())
+
+    assert available
+    assert position == pytest.approx(50.0, abs=1.5)
+    assert transport.connects == 2
+    assert device._reconnect.attempts >= 2
+
+
+def test_calibration_homes_a_bed_slower_than_the_defaults():
+    """Test that homing waits for the end stop so both passes measure full travel."""
+    bed = SimulatedBed(travel_up=36.0, travel_down=36.0)
+    bed.motors[AXIS_HEAD].position = 100.0
+    device = make_device(make_hass(), SimulatedBedTransport(bed))
+
+    async def mark_at(position):
+        previous = device._calibration_marker
+        while device._calibration_marker in (None, previous):
+            await asyncio.sleep(0.01)
+        start = bed.position(AXIS_HEAD)
+        while bed.position(AXIS_HEAD) != position:
+            await asyncio.sleep(0.01)
+        await device.async_calibrate(0)
+        return start
+
+    async def scenario():
+        await device.async_setup()
+        await device.async_calibrate(1)
+        homed = await mark_at(100.0)
+        await mark_at(0.0)
+        await device._calibration_task
+        return homed
+
+    assert run_virtual(scenario()) == 0.0
+    assert device._calibration.travel_time(AXIS_HEAD, True) == pytest.approx(36.0, abs=0.1)
+    assert device._calibration.travel_time(AXIS_HEAD, False) == pytest.approx(36.0, abs=0.1)
+
+
+def test_link_health_sensors_follow_the_link():
+    """Test that the link-health sensors update while nothing else changes."""
+    bed = SimulatedBed()
+    transport = SimulatedBedTransport(bed)
+    device = make_device(make_hass(), transport)
+    coordinator = BedManagerCoordinator(device.hass, device)
+    sensors = {
+        description.key: BedSensor(coordinator, description) for description in SENSORS
+    }
+    writes = {key: 0 for key in sensors}
+    for key, sensor in sensors.items():
+        sensor.async_write_ha_state = lambda key=key: writes.__setitem__(
+            key, writes[key] + 1
+        )
+        coordinator.async_add_listener(sensor._handle_coordinator_update)
+
+    async def scenario():
+        await coordinator.async_refresh()
+        coordinator.async_start()
+        await device.async_setup()
+        heard = sensors["rssi"].native_value
+        bed.reachable = False
+        transport.drop()
+        await asyncio.sleep(60)
+        # Only the reconnect attempts changed since the bed went unavailable.
+        unavailable_writes = dict(writes)
+        await asyncio.sleep(60)
+        return heard, unavailable_writes
+
+    heard, unavailable_writes = run_virtual(scenario())
+
+    assert heard == -60
+    assert sensors["rssi"].native_value is None
+    assert sensors["connect_time"].native_value == 500
+    assert sensors["reconnects"].native_value == device._reconnect.attempts >= 2
+    assert writes["reconnects"] > unavailable_writes["reconnects"]
+    assert writes["rssi"] == unavailable_writes["rssi"]
+
+
+def test_service_call_drives_simulated_bed():
+    """Test a service call end to end through the index, queue and transport."""
+    bed = SimulatedBed()
+    device = make_device(make_hass(), SimulatedBedTransport(bed))
+    index = EntityDeviceIndex(device.hass)
+    index._entities["cover.simulated_bed_head"] = "sim_entry"
+    device.hass.data.update({DOMAIN: {"sim_entry": device}, DATA_ENTITY_INDEX: index})
+    call = MagicMock()
+    call.data = {"entity_id": "cover.simulated_bed_head", "head_position": 35.0}
+
+    async def scenario():
+        await async_set_bed_position(device.hass, call)
+        await asyncio.sleep(1)
+        return bed.position(AXIS_HEAD), bed.position(AXIS_FEET)
+
+    head, feet = run_virtual(scenario())
+
+    assert head == pytest.approx(35.0, abs=1.5)
+    assert feet == 0.0
+
+
+def test_group_moves_beds_concurrently_with_staggered_starts():
+    """Test a group fan-out: beds start in turn and a missing bed is reported."""
+    beds = [SimulatedBed() for _ in range(4)]
+    beds[3].reachable = False
+    devices = [
+        make_device(make_hass(), SimulatedBedTransport(bed, source=f"proxy_{number}"))
+        for number, bed in enumerate(beds)
+    ]
+
+    async def scenario():
+        results = await async_run_group(
+            devices, lambda device: device.async_set_head_position(40.0), stagger=2.0
+        )
+        await asyncio.sleep(1)
+        return results, [bed.position(AXIS_HEAD) for bed in beds[:3]]
+
+    results, positions = run_virtual(scenario())
+
+    assert positions == pytest.approx([40.0] * 3, abs=1.5)
+    starts = sorted(result["started"] for result in results if result["success"])
+    assert [later - earlier for earlier, later in zip(starts, starts[1:])] == pytest.approx(
+        [2.0, 2.0]
+    )
+    # The beds connected at the same time instead of one after another.
+    assert starts[0] == pytest.approx(0.5)
+    assert not results[3]["success"] and "out of range" in results[3]["error"]
+    # Each bed's duration runs from its own start, not from the group call.
+    durations = [result["duration"] for result in results[:3]]
+    assert max(durations) - min(durations) == pytest.approx(0.0, abs=0.5)
+    assert max(result["duration"] for result in results) < 20
+
+
+def test_group_service_reports_beds_that_are_not_loaded():
+    """Test that a group member without a loaded bed is reported as failed."""
+    bed = SimulatedBed()
+    device = make_device(make_hass(), SimulatedBedTransport(bed), entry_id="bed_0")
+    hass = device.hass
+    groups = BedGroupStore(hass)
+    groups._groups = {"bedroom": ["bed_0", "removed_bed"]}
+    hass.data.update({DOMAIN: {"bed_0": device}, DATA_GROUPS: groups})
+    hass.config_entries.async_get_entry = lambda entry_id: None
+    call = MagicMock()
+    call.data = SET_GROUP_POSITION_SCHEMA({"group": "bedroom", "head_position": 30.0})
+
+    response = run_virtual(async_set_group_position(hass, call))
+
+    assert [result["success"] for result in response["beds"]] == [True, False]
+    assert response["beds"][1] == {
+        "bed": "removed_bed",
+        "success": False,
+        "error": "Bed is not loaded",
+    }
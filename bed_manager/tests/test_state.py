@@ -0,0 +1,27 @@
+"""Tests for the Bed Manager state snapshots."""
+import dataclasses
+
+import pytest
+
+from custom_components.bed_manager.state import STATE_FIELDS, BedState
+
+
+def test_diff_names_changed_fields():
+    """Test that diffing reports exactly the fields that moved."""
+    before = BedState(available=True, head_position=10.0)
+    after = dataclasses.replace(before, head_position=12.5, movement_type=1)
+
+    assert after.diff(before) == {"head_position", "movement_type"}
+    assert after.diff(dataclasses.replace(after)) == frozenset()
+    assert after.diff(None) == STATE_FIELDS
+
+
+def test_snapshot_is_immutable_and_compact():
+    """Test that a snapshot cannot be changed in place and has no instance dict."""
+    state = BedState(presets=("reading",))
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        state.head_position = 50.0
+    assert not hasattr(state, "__dict__")
+    assert state.as_dict()["presets"] == ("reading",)
+    assert list(state.as_dict()) == [field.name for field in dataclasses.fields(BedState)]
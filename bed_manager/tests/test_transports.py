@@ -0,0 +1,130 @@
+"""Tests for the ESPHome and MQTT transports against local stand-ins."""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.bed_manager.const import AXIS_HEAD
+from custom_components.bed_manager.esphome_transport import EsphomeBedTransport
+from custom_components.bed_manager.mqtt_transport import MqttBedTransport
+from custom_components.bed_manager.protocol import movement_frame, pin_frame, stop_frame
+from custom_components.bed_manager.tests.fake_bed import (
+    FakeEsphomeNode,
+    FakeMqttBroker,
+    SimulatedBed,
+    SimulatedMqttBridge,
+    make_device,
+    make_hass,
+    run_virtual,
+)
+from custom_components.bed_manager.transport import BedConnectionError
+
+ADDRESS = "00:11:22:33:44:55"
+
+
+def _patch_broker(broker):
+    return patch.multiple(
+        "custom_components.bed_manager.mqtt_transport.mqtt",
+        async_wait_for_mqtt_client=broker.async_wait_for_mqtt_client,
+        async_subscribe=broker.async_subscribe,
+        async_publish=broker.async_publish,
+    )
+
+
+def test_mqtt_batches_and_coalesces_frames():
+    """Test that frames written together go out in one publish, last motion winning."""
+    broker = FakeMqttBroker()
+    transport = MqttBedTransport(make_hass(), ADDRESS, "beds")
+
+    async def scenario():
+        await transport.async_connect()
+        await asyncio.gather(
+            transport.async_write(pin_frame("0000")),
+            transport.async_write(movement_frame(1)),
+            transport.async_write(pin_frame("0000")),
+            transport.async_write(stop_frame()),
+        )
+
+    with _patch_broker(broker):
+        run_virtual(scenario())
+
+    assert broker.published == [
+        ("beds/001122334455/command", pin_frame("0000") + stop_frame())
+    ]
+    assert transport.publishes == 1
+
+
+def test_mqtt_drives_bed_and_restores_retained_state():
+    """Test a move through the bridge, and the position after a restart."""
+    broker = FakeMqttBroker()
+    bed = SimulatedBed()
+    bridge = SimulatedMqttBridge(broker, bed, "beds/001122334455")
+    hass = make_hass()
+
+    async def scenario():
+        await bridge.async_start()
+        device = make_device(hass, MqttBedTransport(hass, ADDRESS, "beds"))
+        await device.async_set_head_position(40.0)
+        await asyncio.sleep(1)
+        await device.async_unload()
+
+        restarted = make_device(make_hass(), MqttBedTransport(hass, ADDRESS, "beds"))
+        await restarted.async_connect()
+        await asyncio.sleep(0.1)
+        return bed.position(AXIS_HEAD), restarted._get_position(AXIS_HEAD)
+
+    with _patch_broker(broker):
+        position, restored = run_virtual(scenario())
+
+    assert position == pytest.approx(40.0, abs=1.5)
+    assert restored == pytest.approx(position, abs=1.0)
+
+
+def test_esphome_relays_through_the_node():
+    """Test a move over the node's API service and its notification events."""
+    bed = SimulatedBed()
+    node = FakeEsphomeNode(bed, "bedroom_node", ADDRESS)
+    hass = make_hass()
+    hass.services = hass.bus = node
+    transport = EsphomeBedTransport(hass, ADDRESS, "bedroom-node")
+    device = make_device(hass, transport)
+
+    async def scenario():
+        await device.async_set_head_position(25.0)
+        await asyncio.sleep(1)
+        return bed.position(AXIS_HEAD), device._get_position(AXIS_HEAD)
+
+    position, estimate = run_virtual(scenario())
+
+    assert position == pytest.approx(25.0, abs=1.5)
+    assert estimate == pytest.approx(position, abs=1.0)
+    assert transport.source == "esphome:bedroom-node"
+    assert bed.frames_ignored == 0
+
+
+def test_esphome_node_offline():
+    """Test that an offline node surfaces as a connection error."""
+    node = FakeEsphomeNode(SimulatedBed(), "bedroom_node", ADDRESS)
+    node.online = False
+    hass = make_hass()
+    hass.services = hass.bus = node
+    transport = EsphomeBedTransport(hass, ADDRESS, "bedroom_node")
+
+    with pytest.raises(BedConnectionError):
+        run_virtual(transport.async_write(stop_frame()))
+
+
+def test_writes_on_a_closed_link_do_not_reconnect():
+    """Test that a late write fails instead of opening the link behind the device."""
+    broker = FakeMqttBroker()
+    mqtt_transport = MqttBedTransport(make_hass(), ADDRESS, "beds")
+    node = FakeEsphomeNode(SimulatedBed(), "bedroom_node", ADDRESS)
+    hass = make_hass()
+    hass.services = hass.bus = node
+    esphome_transport = EsphomeBedTransport(hass, ADDRESS, "bedroom_node")
+
+    for transport in (mqtt_transport, esphome_transport):
+        with _patch_broker(broker), pytest.raises(BedConnectionError):
+            run_virtual(transport.async_write(stop_frame()))
+        assert not transport.is_connected
+    assert broker.published == []
@@ -0,0 +1,194 @@
+"""Transport layer for the Bed Manager integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+from bleak.backends.characteristic import BleakGATTCharacteristic
+from bleak.exc import BleakError
+from bleak_retry_connector import (
+    BleakClientWithServiceCache,
+    establish_connection,
+)
+
+from homeassistant.components import bluetooth
+from homeassistant.core import HomeAssistant
+
+from .const import RC2_CHARACTERISTIC_UUID, RC2_SERVICE_UUID
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BedConnectionError(RuntimeError):
+    """Raised when the link to a bed cannot be used."""
+
+
+class BedTransport(ABC):
+    """A long-lived link to a single bed controller."""
+
+    _notification_callback: Callable[[bytes], None] | None = None
+    _disconnected_callback: Callable[[], None] | None = None
+
+    def set_notification_callback(self, callback: Callable[[bytes], None]) -> None:
+        """Set the callback that receives frames pushed by the bed."""
+        self._notification_callback = callback
+
+    def set_disconnected_callback(self, callback: Callable[[], None]) -> None:
+        """Set the callback run when the link drops."""
+        self._disconnected_callback = callback
+
+    @property
+    @abstractmethod
+    def is_connected(self) -> bool:
+        """Return True if the link is up."""
+
+    @property
+    def source(self) -> str:
+        """Return the adapter or proxy the bed is reached through."""
+        return "local"
+
+    @property
+    def rssi(self) -> int | None:
+        """Return the last signal strength heard from the bed, if known."""
+        return None
+
+    @abstractmethod
+    async def async_connect(self) -> None:
+        """Open the link, reusing an existing session if there is one."""
+
+    @abstractmethod
+    async def async_disconnect(self) -> None:
+        """Close the link."""
+
+    @abstractmethod
+    async def async_write(self, data: bytes) -> None:
+        """Write a raw command frame to the bed.
+
+        Raises ``BedConnectionError`` if the link is down. A transport never
+        reconnects by itself: the device does that, so the connection slot,
+        the backoff and the PIN session stay in step with the link.
+        """
+
+
+class BleakBedTransport(BedTransport):
+    """BLE transport holding one GATT session per bed.
+
+    The client and the RC2 write characteristic are resolved once on connect
+    and reused for every write until the bed disconnects, so commands routed
+    through a Bluetooth proxy never pay the connection setup cost twice.
+    """
+
+    def __init__(self, hass: HomeAssistant, address: str, name: str) -> None:
+        """Initialize the transport."""
+        self.hass = hass
+        self._address = address
+        self._name = name
+        self._client: BleakClientWithServiceCache | None = None
+        self._write_char: BleakGATTCharacteristic | None = None
+        self._connect_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+
+    @property
+    def is_connected(self) -> bool:
+        """Return True if the GATT session is up."""
+        return self._client is not None and self._client.is_connected
+
+    @property
+    def source(self) -> str:
+        """Return the adapter or proxy that last heard the bed."""
+        service_info = bluetooth.async_last_service_info(
+            self.hass, self._address, connectable=True
+        )
+        return service_info.source if service_info is not None else "unknown"
+
+    @property
+    def rssi(self) -> int | None:
+        """Return the signal strength of the last advertisement."""
+        service_info = bluetooth.async_last_service_info(self.hass, self._address)
+        return service_info.rssi if service_info is not None else None
+
+    async def async_connect(self) -> None:
+        """Connect to the bed and resolve the RC2 characteristic."""
+        async with self._connect_lock:
+            if self.is_connected:
+                return
+
+            ble_device = bluetooth.async_ble_device_from_address(
+                self.hass, self._address, connectable=True
+            )
+            if ble_device is None:
+                raise BedConnectionError(
+                    f"No connectable Bluetooth adapter or proxy can reach {self._address}"
+                )
+
+            try:
+                client = await establish_connection(
+                    BleakClientWithServiceCache,
+                    ble_device,
+                    self._name,
+                    disconnected_callback=self._on_disconnected,
+                    ble_device_callback=lambda: bluetooth.async_ble_device_from_address(
+                        self.hass, self._address, connectable=True
+                    )
+                    or ble_device,
+                )
+            except BleakError as err:
+                raise BedConnectionError(
+                    f"Could not connect to {self._address}: {err}"
+                ) from err
+
+            write_char = client.services.get_characteristic(RC2_CHARACTERISTIC_UUID)
+            if write_char is None:
+                await client.disconnect()
+                raise BedConnectionError(
+                    f"{self._address} does not expose the RC2 service {RC2_SERVICE_UUID}"
+                )
+
+            try:
+                await client.start_notify(write_char, self._on_notification)
+            except BleakError as err:
+                await client.disconnect()
+                raise BedConnectionError(
+                    f"Could not subscribe to {self._address}: {err}"
+                ) from err
+
+            self._client = client
+            self._write_char = write_char
+            _LOGGER.debug("GATT session to %s established", self._address)
+
+    async def async_disconnect(self) -> None:
+        """Disconnect from the bed."""
+        async with self._connect_lock:
+            client = self._client
+            self._client = None
+            self._write_char = None
+            if client is not None and client.is_connected:
+                await client.disconnect()
+
+    async def async_write(self, data: bytes) -> None:
+        """Write a frame over the cached GATT session."""
+        async with self._write_lock:
+            if not self.is_connected or self._write_char is None:
+                raise BedConnectionError(f"Lost connection to {self._address}")
+            try:
+                await self._client.write_gatt_char(self._write_char, data, response=False)
+            except BleakError as err:
+                raise BedConnectionError(
+                    f"Write to {self._address} failed: {err}"
+                ) from err
+
+    def _on_disconnected(self, client: BleakClientWithServiceCache) -> None:
+        """Drop the cached session when the bed goes away."""
+        if client is self._client:
+            _LOGGER.debug("GATT session to %s dropped", self._address)
+            self._client = None
+            self._write_char = None
+            if self._disconnected_callback is not None:
+                self._disconnected_callback()
+
+    def _on_notification(self, char: BleakGATTCharacteristic, data: bytearray) -> None:
+        """Hand a notification to the device."""
+        if self._notification_callback is not None:
+            self._notification_callback(data)